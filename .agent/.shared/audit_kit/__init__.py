@@ -0,0 +1,15 @@
+"""
+Audit Kit - shared building blocks for the .agent checker scripts.
+
+Modules:
+    rule_engine  Compiled, prefiltered regex rules with per-rule statistics
+    batch        Parallel, cached per-file audits merged in input order
+    profiler     Opt-in per-rule timing, hot-rule report and Chrome trace output
+    regex_guard  Static backtracking check, line-length cap and per-rule time budget
+    file_index   One cached git ls-files / scandir listing of the project, by extension and role
+    plugin       In-process run(project_path, context) entry points for verify_all and checklist
+    check_cache  Skip-if-unchanged check results keyed by checker and input-file hashes
+    history      verify_all run history: per-check durations, p50/p95 trend, regressions
+    ts_tokenizer Forgiving JS/TS/JSX lexer with JSX text, attribute and position tokens
+    page_model   One cached parse per page (meta, headings, images, links, JSON-LD) for the page checkers
+"""
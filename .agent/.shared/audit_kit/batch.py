@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Batch - parallel, incremental file audits for the auditor classes.
+
+An auditor is any class with `audit_file(path)` that accumulates
+`issues`, `warnings`, `passed_count` and `files_checked`. Each file is
+audited by a fresh instance, so per-file results are independent:
+
+    results = audit_files(UXAuditor, paths, jobs=0, cache=ResultCache("ux_audit", version))
+    merge_results(auditor, results)
+
+    - jobs=1 audits in-process, jobs>1 shards files over a process pool,
+      jobs=0 picks a pool size automatically from the amount of work.
+    - Results are merged in input order, so the report is identical to a
+      serial run regardless of which worker finished first.
+    - ResultCache persists each file's result keyed by content hash and
+      auditor version; unchanged files are not audited again. Saving merges
+      with the file on disk under a lock, so checkers sharing a cache can
+      save concurrently without dropping each other's entries.
+
+map_files(func, paths, ...) does the same for any module-level function
+returning a JSON-serialisable dict per file, for checkers that collect
+statistics rather than issues.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Below this many files to audit, process start-up costs more than it saves
+MIN_FILES_PER_WORKER = 16
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache"
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def auditor_version(*source_files) -> str:
+    """Version stamp derived from the source of the auditor and its rules."""
+    digest = hashlib.sha256()
+    for source in source_files:
+        try:
+            digest.update(Path(source).read_bytes())
+        except OSError:
+            digest.update(str(source).encode())
+    return digest.hexdigest()[:16]
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive lock on path (created if needed) for the with-block, across processes."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ResultCache:
+    """Per-file audit results persisted as JSON under .agent/.cache."""
+
+    def __init__(self, name: str, version: str, cache_dir: Path = CACHE_DIR):
+        self.path = Path(cache_dir) / f"{name}.json"
+        self.version = version
+        self.entries: Dict[str, dict] = self._read()
+        self.updated: Dict[str, dict] = {}  # put() since load, written over the disk state on save
+        self.dirty = False
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == self.version:
+                return data.get("files", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def get(self, key: str, digest: str) -> Optional[dict]:
+        entry = self.entries.get(key)
+        if entry and entry.get("hash") == digest:
+            return entry["result"]
+        return None
+
+    def put(self, key: str, digest: str, result: dict) -> None:
+        self.entries[key] = self.updated[key] = {"hash": digest, "result": result}
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Checkers sharing a cache (page_model) may save concurrently: re-read
+            # under the lock and add our entries to whatever the others wrote
+            with file_lock(self.path.with_suffix(".lock")):
+                entries = self._read()
+                entries.update(self.updated)
+                # Forget files that no longer exist
+                self.entries = {k: v for k, v in entries.items() if os.path.exists(k)}
+                tmp = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps({"version": self.version, "files": self.entries}), encoding="utf-8")
+                os.replace(tmp, self.path)
+            self.updated = {}
+            self.dirty = False
+        except OSError:
+            pass  # A read-only checkout just runs uncached
+
+
+def _audit_one(auditor_cls, path) -> dict:
+    auditor = auditor_cls()
+    auditor.audit_file(path)
+    return {
+        "files_checked": auditor.files_checked,
+        "issues": auditor.issues,
+        "warnings": auditor.warnings,
+        "passed_checks": auditor.passed_count,
+    }
+
+
+def resolve_jobs(jobs: int, pending: int) -> int:
+    if jobs > 0:
+        return min(jobs, max(pending, 1))
+    return max(1, min(os.cpu_count() or 1, pending // MIN_FILES_PER_WORKER))
+
+
+def audit_files(auditor_cls, paths: List[str], jobs: int = 0,
+                cache: Optional[ResultCache] = None) -> List[dict]:
+    """Audit paths and return one result dict per path, in input order."""
+    return map_files(functools.partial(_audit_one, auditor_cls), paths, jobs, cache)
+
+
+def map_files(func, paths: List[str], jobs: int = 0,
+              cache: Optional[ResultCache] = None) -> List[dict]:
+    """Apply func(path) -> dict to every path and return the results in input order."""
+    results: List[Optional[dict]] = [None] * len(paths)
+    pending = []  # (index, key, digest)
+
+    for index, path in enumerate(paths):
+        key = os.path.abspath(path)
+        digest = None
+        if cache is not None:
+            try:
+                with open(path, "rb") as f:
+                    digest = file_digest(f.read())
+            except OSError:
+                digest = None
+            cached = cache.get(key, digest) if digest else None
+            if cached is not None:
+                results[index] = cached
+                continue
+        pending.append((index, key, digest))
+
+    workers = resolve_jobs(jobs, len(pending))
+    tasks = [paths[index] for index, _, _ in pending]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(pool.map(func, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        fresh = [func(task) for task in tasks]
+
+    for (index, key, digest), result in zip(pending, fresh):
+        results[index] = result
+        if cache is not None and digest:
+            cache.put(key, digest, result)
+
+    if cache is not None:
+        cache.save()
+    return results
+
+
+def merge_results(auditor, results: List[dict]) -> None:
+    """Fold per-file results into an auditor, preserving their order."""
+    for result in results:
+        auditor.files_checked += result["files_checked"]
+        auditor.issues.extend(result["issues"])
+        auditor.warnings.extend(result["warnings"])
+        auditor.passed_count += result["passed_checks"]
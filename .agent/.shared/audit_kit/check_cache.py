@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Check Cache - skip-if-unchanged results for whole checks in checklist.py.
+
+Each cacheable check declares the project files it reads as `**`-aware
+globs. Its last result is reused while the cache key is unchanged: the
+check name, a hash of the checker script and the audit_kit sources, and a
+digest over the paths and contents of its input files.
+
+    cache = CheckCache("checklist", project_index(project_path))
+    key = cache.key("UX Audit", script, ("**/*.tsx", "**/*.css"))
+    result = cache.get("UX Audit", key)
+    if result is None:
+        result = run_script(...)
+        cache.put("UX Audit", key, result)
+    cache.save()
+
+File contents are hashed once and memoised by (size, mtime_ns), so an
+unchanged tree costs one stat per input file.
+
+Checks that also depend on something outside the project (e.g. npm audit's
+advisory database) pass `max_age` to get(), so their results expire after
+that many seconds even while the inputs are unchanged.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .batch import CACHE_DIR, auditor_version, file_digest
+from .file_index import _glob_regex
+
+CACHE_VERSION = 1
+
+# A check's result depends on the shared helpers as much as on its own script
+KIT_SOURCES = sorted(str(p) for p in Path(__file__).resolve().parent.glob("*.py"))
+
+# Files the kit itself rewrites on every run; hashing them would change every `**` key
+EXCLUDE_INPUTS = ("**/.agent/.cache/**", "**/.agent/preview.pid", "**/.agent/preview.log",
+                  "**/.agent/preview.tmp")
+
+
+class CheckCache:
+    """Per-project check results and input-file digests, persisted under .agent/.cache."""
+
+    def __init__(self, name: str, index, cache_dir: Path = CACHE_DIR):
+        self.index = index
+        self.root = root = str(index.base.resolve())
+        self.path = Path(cache_dir) / f"{name}-{hashlib.sha1(root.encode()).hexdigest()[:12]}.json"
+        self.files: Dict[str, list] = {}  # rel -> [size, mtime_ns, digest]
+        self.checks: Dict[str, dict] = {}
+        self.dirty = False
+        self.exclude = [_glob_regex(p) for p in EXCLUDE_INPUTS]
+        try:
+            # A cache dir inside the project (not under .agent) is excluded as well
+            cache_rel = self.path.parent.resolve().relative_to(root).as_posix()
+            self.exclude.append(_glob_regex(f"{cache_rel}/**"))
+        except ValueError:
+            pass
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION and data.get("root") == root:
+                self.files = data.get("files", {})
+                self.checks = data.get("checks", {})
+        except (OSError, ValueError):
+            pass
+
+    def _digest(self, rel: str) -> str:
+        path = self.index.base / rel
+        try:
+            st = os.stat(path)
+        except OSError:
+            return "missing"
+        memo = self.files.get(rel)
+        if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+            return memo[2]
+        try:
+            with open(path, "rb") as f:
+                digest = file_digest(f.read())
+        except OSError:
+            return "unreadable"
+        self.files[rel] = [st.st_size, st.st_mtime_ns, digest]
+        self.dirty = True
+        return digest
+
+    def inputs_digest(self, patterns: Iterable[str]) -> str:
+        """
+        Digest over the relative paths and contents of the files matching patterns.
+        Literal paths (no wildcards) count even when the index skips them, e.g.
+        node_modules/.package-lock.json, and also when they are absent. The kit's
+        own cache and runtime files (EXCLUDE_INPUTS) never count.
+        """
+        patterns = list(patterns)
+        base = self.index.base
+        rels = {path.relative_to(base).as_posix() for path in self.index.glob(*patterns)}
+        rels.update(p for p in patterns if not any(c in p for c in "*?["))
+        rels = {rel for rel in rels if not any(r.match(rel) for r in self.exclude)}
+        digest = hashlib.sha256()
+        for rel in sorted(rels):
+            digest.update(f"{rel}\0{self._digest(rel)}\n".encode())
+        return digest.hexdigest()
+
+    def key(self, check: str, script_path, patterns: Iterable[str]) -> str:
+        digest = hashlib.sha256()
+        digest.update(check.encode())
+        digest.update(auditor_version(script_path, *KIT_SOURCES).encode())
+        digest.update(self.inputs_digest(patterns).encode())
+        return digest.hexdigest()
+
+    def get(self, check: str, key: str, max_age: Optional[float] = None) -> Optional[dict]:
+        entry = self.checks.get(check)
+        if not entry or entry.get("key") != key:
+            return None
+        if max_age is not None and time.time() - entry.get("at", 0) > max_age:
+            return None
+        return dict(entry["result"], cached=True)
+
+    def put(self, check: str, key: str, result: dict) -> None:
+        self.checks[check] = {"key": key, "result": result, "at": time.time()}
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        # Forget digests of files that have left the project
+        listed = set(self.index.files)
+        self.files = {rel: memo for rel, memo in self.files.items()
+                      if rel in listed or (self.index.base / rel).exists()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "root": self.root,
+                                       "files": self.files, "checks": self.checks}), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError:
+            pass  # A read-only checkout just runs uncached
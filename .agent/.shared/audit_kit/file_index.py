@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+File Index - one enumeration of the project tree shared by every checker.
+
+    index = project_index(project_path)
+    pages = index.paths(exts={'.html', '.tsx'}, skip_dirs=SKIP_DIRS)
+    specs = index.glob('**/openapi.json', '**/routes/*.ts')
+    tests = index.paths(roles={'test'})
+
+Files come from `git ls-files` (tracked plus untracked, minus ignored and
+deleted) when the project is a git work tree, otherwise from an os.scandir
+walk that prunes PRUNE_DIRS. Paths are kept relative and sorted, so every
+checker sees the same files in the same order.
+
+The listing is cached in .agent/.cache together with an invalidation stamp:
+the mtimes of every indexed directory (which change when entries are added,
+removed or renamed) plus the git index and .gitignore. A later run, including
+the other checkers of the same verify run, reuses the listing while the stamp
+still matches.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional
+
+from .batch import CACHE_DIR
+
+INDEX_VERSION = 1
+
+# Never indexed, whatever the source
+PRUNE_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+CODE_EXTENSIONS = {'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs', '.py', '.go', '.java', '.rb', '.php',
+                   '.rs', '.dart', '.kt', '.swift', '.prisma'}
+MARKUP_EXTENSIONS = {'.html', '.htm', '.vue', '.svelte'}
+STYLE_EXTENSIONS = {'.css', '.scss', '.sass', '.less'}
+CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.ini', '.env'}
+DOC_EXTENSIONS = {'.md', '.mdx', '.rst', '.txt'}
+
+TEST_DIRS = {'test', 'tests', '__tests__', 'spec', 'e2e'}
+LOCALE_DIRS = {'locales', 'translations', 'lang', 'i18n', 'messages'}
+
+ROLES = ('test', 'locale', 'config', 'source', 'markup', 'style', 'doc', 'asset')
+
+_INDEXES: Dict[str, "FileIndex"] = {}
+
+
+def classify(rel: str) -> str:
+    """Role of a project-relative posix path: one of ROLES."""
+    path = PurePosixPath(rel)
+    name = path.name.lower()
+    ext = path.suffix.lower()
+    dirs = {part.lower() for part in path.parts[:-1]}
+
+    if dirs & TEST_DIRS or re.search(r'[._](test|spec)\.[^.]+$', name) or name.startswith('test_'):
+        return 'test'
+    if ext == '.po' or (ext == '.json' and dirs & LOCALE_DIRS):
+        return 'locale'
+    if ext in CONFIG_EXTENSIONS or name.startswith('.env') or '.config.' in name or name.startswith('.'):
+        return 'config'
+    if ext in CODE_EXTENSIONS:
+        return 'source'
+    if ext in MARKUP_EXTENSIONS:
+        return 'markup'
+    if ext in STYLE_EXTENSIONS:
+        return 'style'
+    if ext in DOC_EXTENSIONS:
+        return 'doc'
+    return 'asset'
+
+
+def _glob_regex(pattern: str):
+    """Compile a `**`-aware glob into a regex over relative posix paths."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:[^/]+/)*')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(out) + r'\Z')
+
+
+class FileIndex:
+    """Sorted project-relative file list with extension and role lookups."""
+
+    def __init__(self, base: Path, files: List[str], source: str):
+        self.base = Path(base)
+        self.files = files
+        self.source = source
+        self.by_ext: Dict[str, List[str]] = {}
+        self._roles: Dict[str, str] = {}
+        for rel in files:
+            self.by_ext.setdefault(PurePosixPath(rel).suffix.lower(), []).append(rel)
+
+    def role(self, rel: str) -> str:
+        if rel not in self._roles:
+            self._roles[rel] = classify(rel)
+        return self._roles[rel]
+
+    def paths(self, exts: Optional[Iterable[str]] = None, skip_dirs: Iterable[str] = (),
+              roles: Optional[Iterable[str]] = None) -> List[Path]:
+        """Files filtered by extension, skipped directory names and role."""
+        if exts is None:
+            candidates = self.files
+        else:
+            candidates = sorted(rel for ext in set(exts) for rel in self.by_ext.get(ext.lower(), ()))
+        skip = set(skip_dirs)
+        roles = set(roles) if roles is not None else None
+        out = []
+        for rel in candidates:
+            if skip and not skip.isdisjoint(rel.split('/')[:-1]):
+                continue
+            if roles is not None and self.role(rel) not in roles:
+                continue
+            out.append(self.base / rel)
+        return out
+
+    def glob(self, *patterns: str) -> List[Path]:
+        """Files matching any of the `**`-aware glob patterns."""
+        regexes = [_glob_regex(p) for p in patterns]
+        return [self.base / rel for rel in self.files if any(r.match(rel) for r in regexes)]
+
+
+# ============================================================================
+#  ENUMERATION
+# ============================================================================
+
+def _git_files(root: Path) -> Optional[List[str]]:
+    def ls(*args) -> Optional[List[str]]:
+        try:
+            result = subprocess.run(['git', 'ls-files', '-z', *args], cwd=root,
+                                    capture_output=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        return [p for p in result.stdout.decode('utf-8', 'surrogateescape').split('\0') if p]
+
+    listed = ls('--cached', '--others', '--exclude-standard')
+    if listed is None:
+        return None
+    deleted = set(ls('--deleted') or ())
+    return sorted({p for p in listed if p not in deleted and PRUNE_DIRS.isdisjoint(p.split('/')[:-1])})
+
+
+def _scandir_files(root: Path) -> List[str]:
+    files = []
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(root / rel_dir if rel_dir else root) as entries:
+                for entry in entries:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in PRUNE_DIRS:
+                                stack.append(rel)
+                        elif entry.is_file():
+                            files.append(rel)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return sorted(files)
+
+
+def _stamp(root: Path, files: List[str]) -> Dict[str, int]:
+    """mtime_ns of every directory holding indexed files, plus git metadata."""
+    dirs = {''}
+    for rel in files:
+        parts = rel.split('/')[:-1]
+        for depth in range(1, len(parts) + 1):
+            dirs.add('/'.join(parts[:depth]))
+    stamp = {}
+    for rel in sorted(dirs) + ['.git/index', '.gitignore']:
+        try:
+            stamp[rel] = os.stat(root / rel if rel else root).st_mtime_ns
+        except OSError:
+            stamp[rel] = 0
+    return stamp
+
+
+def _stamp_matches(root: Path, stamp: Dict[str, int]) -> bool:
+    for rel, mtime in stamp.items():
+        try:
+            current = os.stat(root / rel if rel else root).st_mtime_ns
+        except OSError:
+            current = 0
+        if current != mtime:
+            return False
+    return True
+
+
+def _cache_path(root: Path) -> Path:
+    return CACHE_DIR / f"file_index-{hashlib.sha1(str(root).encode()).hexdigest()[:12]}.json"
+
+
+def project_index(project_path, refresh: bool = False) -> FileIndex:
+    """The shared FileIndex for a project, from memory, disk cache or a fresh scan."""
+    base = Path(project_path)
+    root = base.resolve()
+    key = str(root)
+    if not refresh and key in _INDEXES:
+        cached = _INDEXES[key]
+        return cached if cached.base == base else FileIndex(base, cached.files, cached.source)
+
+    cache_file = _cache_path(root)
+    data = None
+    if not refresh:
+        try:
+            data = json.loads(cache_file.read_text(encoding='utf-8'))
+            if data.get('version') != INDEX_VERSION or data.get('root') != key \
+                    or not _stamp_matches(root, data.get('stamp', {})):
+                data = None
+        except (OSError, ValueError):
+            data = None
+
+    if data is None:
+        files = _git_files(root)
+        source = 'git'
+        if files is None:
+            files, source = _scandir_files(root), 'scandir'
+        data = {'version': INDEX_VERSION, 'root': key, 'source': source,
+                'stamp': _stamp(root, files), 'files': files}
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+
+    index = FileIndex(base, data['files'], data['source'])
+    _INDEXES[key] = index
+    return index
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+History - per-check timing records for verify_all runs.
+
+Every run appends one JSON line to .agent/.cache/verify_history.jsonl:
+
+    {"started": "...", "project": "/abs/path", "workers": 4, "total": 81.2,
+     "checks": [{"name": "Lint Check", "passed": false, "skipped": false,
+                 "duration": 74.1, "peak_rss": 52428800, "output_bytes": 1830,
+                 "isolated": false}, ...]}
+
+History(project) reads the runs of one project back for the `--trend`
+report (p50/p95 per check over the last N runs), regression flags (latest
+duration more than `threshold` above the median of the runs before it), the
+duration estimates used to predict a run's total time, and adaptive
+per-check timeouts.
+"""
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .batch import CACHE_DIR
+
+HISTORY_FILE = CACHE_DIR / "verify_history.jsonl"
+
+# Runs kept in the file (all projects together); older lines are dropped
+MAX_RUNS = 500
+
+# Durations below this are too noisy to call a regression
+MIN_REGRESSION_SECONDS = 1.0
+
+# Adaptive timeout: ADAPTIVE_FACTOR x the recent p95, at least ADAPTIVE_FLOOR
+# seconds, once a check has ADAPTIVE_MIN_RUNS recorded runs
+ADAPTIVE_FACTOR = 3.0
+ADAPTIVE_FLOOR = 60.0
+ADAPTIVE_MIN_RUNS = 3
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class History:
+    """The recorded runs of one project, oldest first."""
+
+    def __init__(self, project, path: Path = HISTORY_FILE):
+        self.project = str(Path(project).resolve())
+        self.path = Path(path)
+        self.runs: List[dict] = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        run = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write from an interrupted run
+                    if run.get("project") == self.project:
+                        self.runs.append(run)
+        except OSError:
+            pass
+
+    def record(self, run: dict) -> None:
+        """Append a run (adding its project) and trim the file to MAX_RUNS lines."""
+        run = dict(run, project=self.project)
+        self.runs.append(run)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(run) + "\n")
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+            if len(lines) > MAX_RUNS:
+                tmp = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text("".join(lines[-MAX_RUNS:]), encoding="utf-8")
+                os.replace(tmp, self.path)
+        except OSError:
+            pass  # A read-only checkout just runs without history
+
+    def durations(self, last: Optional[int] = None) -> Dict[str, List[float]]:
+        """Durations of checks that actually ran, per check name, oldest first."""
+        runs = self.runs[-last:] if last else self.runs
+        out: Dict[str, List[float]] = {}
+        for run in runs:
+            for check in run.get("checks", []):
+                if not check.get("skipped"):
+                    out.setdefault(check["name"], []).append(check.get("duration", 0.0))
+        return out
+
+    def estimates(self, last: int = 20) -> Dict[str, float]:
+        """Median recent duration per check, used to predict run time."""
+        return {name: percentile(values, 50) for name, values in self.durations(last).items()}
+
+    def timeouts(self, default: float, last: int = 20) -> Dict[str, float]:
+        """Per-check timeout derived from recent durations, never above default."""
+        out = {}
+        for name, values in self.durations(last).items():
+            if len(values) >= ADAPTIVE_MIN_RUNS:
+                out[name] = min(default, max(ADAPTIVE_FLOOR, percentile(values, 95) * ADAPTIVE_FACTOR))
+        return out
+
+    def trend(self, last: int = 20, threshold: float = 0.25) -> List[dict]:
+        """
+        One row per check over the last runs: p50, p95, latest duration,
+        pass rate, peak RSS and whether the latest run regressed.
+        """
+        runs = self.runs[-last:]
+        rows = []
+        for name, values in sorted(self.durations(last).items()):
+            checks = [c for run in runs for c in run.get("checks", [])
+                      if c["name"] == name and not c.get("skipped")]
+            previous = values[:-1]
+            baseline = percentile(previous, 50) if previous else None
+            latest = values[-1]
+            regressed = (baseline is not None and latest >= MIN_REGRESSION_SECONDS
+                         and latest > baseline * (1 + threshold))
+            rss = [c["peak_rss"] for c in checks if c.get("peak_rss")]
+            rows.append({
+                "name": name,
+                "runs": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "latest": latest,
+                "baseline": baseline,
+                "regressed": regressed,
+                "pass_rate": sum(1 for c in checks if c.get("passed")) / len(checks),
+                "peak_rss": max(rss) if rss else None,
+                "output_bytes": checks[-1].get("output_bytes", 0),
+            })
+        return rows
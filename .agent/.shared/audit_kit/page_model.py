@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Page Model - one parse of an HTML/JSX/TSX page shared by the page checkers.
+
+    docs = load_pages(pages)                    # one dict per path, input order
+    for doc in docs:
+        h1 = [text for level, text, line in doc["headings"] if level == 1]
+        missing_alt = [img for img in doc["images"] if img["alt"] is None]
+
+seo_checker, geo_checker and accessibility_checker all look at the same
+pages. Instead of each re-reading and regex-scanning them, a page is parsed
+once into a JSON-serialisable model. Within a run the models are kept in
+memory (plugin.shared_state), and a checker asking for a page that another
+checker is parsing right now waits for that parse, so concurrent checks in
+verify_all parse each page once. Models are also cached in .agent/.cache by
+content hash (batch.ResultCache) for the next run.
+
+HTML goes through html.parser; JSX/TSX through ts_tokenizer, so attribute
+expressions (`alt={t('logo')}`, `onClick={() => go()}`) do not confuse the
+tag scanner. Keys of a model:
+
+    elements      [tag, attrs, line] for every start tag, in source order.
+                  Tags and attribute names are lowercased; an attribute
+                  value is its string, True when bare, or the `{...}` source
+                  of a JSX expression
+    head, title   a <head>/<Head> element exists; <title> text or None
+    meta          attrs of every <meta>
+    headings      [level, text, line]
+    images        {"src", "alt", "line"}; alt None when the attribute is absent
+    links         {"href", "rel", "text", "line"}
+    buttons       {"attrs", "text", "children", "line"}; children counts
+                  nested elements and JSX expressions
+    json_ld       the text (or __html expression) of ld+json script blocks
+    schema_types  every "@type" value in the page, JSON-LD or JS object
+    text          visible text, whitespace-joined
+"""
+
+import os
+import re
+import threading
+from html.parser import HTMLParser
+from typing import Dict, List
+
+from . import ts_tokenizer
+from .batch import ResultCache, auditor_version, map_files
+from .plugin import shared_state
+from .ts_tokenizer import Positions, match_brackets, tokenize
+
+MODEL_VERSION = auditor_version(__file__, ts_tokenizer.__file__)
+
+# Elements whose text content is collected
+_CAPTURE = {"title", "h1", "h2", "h3", "h4", "h5", "h6", "a", "button", "script", "style"}
+
+_SCHEMA_TYPE = re.compile(r"""["']?@type["']?\s*:\s*["']([\w:/.-]+)["']""")
+
+
+class _Builder:
+    """Accumulates a page model from start/end/text events."""
+
+    def __init__(self):
+        self.doc = {"elements": [], "head": False, "title": None, "meta": [], "headings": [],
+                    "images": [], "links": [], "buttons": [], "json_ld": [], "schema_types": [],
+                    "text": ""}
+        self.open: List[list] = []  # [tag, attrs, line, text parts, children] of open captures
+        self.text: List[str] = []
+
+    def start(self, tag: str, attrs: dict, line: int) -> None:
+        tag = tag.lower()
+        attrs = {name.lower(): value for name, value in attrs.items()}
+        doc = self.doc
+        doc["elements"].append([tag, attrs, line])
+        for capture in self.open:
+            capture[4] += 1
+        if tag == "head":
+            doc["head"] = True
+        elif tag == "meta":
+            doc["meta"].append(attrs)
+        elif tag == "img":
+            alt = attrs.get("alt")
+            doc["images"].append({"src": attrs.get("src"), "alt": None if alt is None else alt, "line": line})
+        if tag in _CAPTURE:
+            self.open.append([tag, attrs, line, [], 0])
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower()
+        for depth in range(len(self.open) - 1, -1, -1):
+            if self.open[depth][0] == tag:
+                capture = self.open.pop(depth)
+                self._finish(*capture)
+                return
+
+    def data(self, text: str) -> None:
+        for capture in self.open:
+            capture[3].append(text)
+        if not any(capture[0] in ("script", "style") for capture in self.open):
+            self.text.append(text)
+
+    def expression(self, source: str) -> None:
+        """A JSX `{...}` child: counts as content of the open captures."""
+        for capture in self.open:
+            capture[4] += 1
+        if self.open and self.open[-1][0] == "script":
+            self.open[-1][3].append(source)
+
+    def _finish(self, tag: str, attrs: dict, line: int, parts: list, children: int) -> None:
+        doc = self.doc
+        text = " ".join(" ".join(parts).split())
+        if tag == "title":
+            doc["title"] = text
+        elif tag[0] == "h" and tag[1:].isdigit():
+            doc["headings"].append([int(tag[1:]), text, line])
+        elif tag == "a":
+            doc["links"].append({"href": attrs.get("href"), "rel": attrs.get("rel"), "text": text, "line": line})
+        elif tag == "button":
+            doc["buttons"].append({"attrs": attrs, "text": text, "children": children, "line": line})
+        elif tag == "script" and "ld+json" in str(attrs.get("type", "")):
+            inner = attrs.get("dangerouslysetinnerhtml")
+            doc["json_ld"].append(text if text or not isinstance(inner, str) else inner)
+
+    def finish(self, source: str) -> dict:
+        while self.open:
+            self._finish(*self.open.pop())
+        doc = self.doc
+        doc["headings"].sort(key=lambda heading: heading[2])
+        doc["schema_types"] = _SCHEMA_TYPE.findall(source)
+        doc["text"] = " ".join(" ".join(self.text).split())
+        return doc
+
+
+class _HTMLPageParser(HTMLParser):
+    def __init__(self, builder: _Builder):
+        super().__init__(convert_charrefs=True)
+        self.builder = builder
+
+    def handle_starttag(self, tag, attrs):
+        self.builder.start(tag, {name: True if value is None else value for name, value in attrs},
+                           self.getpos()[0])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag):
+        self.builder.end(tag)
+
+    def handle_data(self, data):
+        self.builder.data(data)
+
+
+def _jsx_attrs(source: str, tokens, pairs, j: int):
+    """Attributes of the JSX tag whose name token precedes j; returns (attrs, next index)."""
+    attrs = {}
+    n = len(tokens)
+    while j < n:
+        kind, value, offset = tokens[j]
+        if kind == "jsx_attr":
+            name, j = value, j + 1
+            assigned = j < n and source[offset + len(name):tokens[j][2]].strip() == "="
+            if assigned and tokens[j][0] == "string":
+                attrs[name] = tokens[j][1]
+                j += 1
+            elif assigned and tokens[j][1] == "{" and j in pairs:
+                close = pairs[j]
+                attrs[name] = source[tokens[j][2]:tokens[close][2] + 1]
+                j = close + 1
+            else:
+                attrs[name] = True
+        elif kind == "punct" and value == "{" and j + 1 < n and tokens[j + 1][1] == "..." and j in pairs:
+            j = pairs[j] + 1  # {...props}
+        else:
+            break
+    return attrs, j
+
+
+def parse_page(source: str, jsx: bool) -> dict:
+    """Model of one page source (jsx for .jsx/.tsx, else HTML)."""
+    builder = _Builder()
+    if not jsx:
+        parser = _HTMLPageParser(builder)
+        parser.feed(source)
+        parser.close()
+        return builder.finish(source)
+
+    tokens = tokenize(source, jsx=True)
+    pairs = match_brackets(tokens)
+    positions = Positions(source)
+    i, n = 0, len(tokens)
+    while i < n:
+        kind, value, offset = tokens[i]
+        if kind == "jsx_open":
+            attrs, i = _jsx_attrs(source, tokens, pairs, i + 1)
+            builder.start(value or "fragment", attrs, positions.at(offset)[0])
+            continue
+        if kind == "jsx_close":
+            builder.end(value or "fragment")
+        elif kind == "jsx_text":
+            builder.data(value)
+        elif kind == "punct" and value == "{" and i in pairs and builder.open:
+            builder.expression(source[offset:tokens[pairs[i]][2] + 1])
+        i += 1
+    return builder.finish(source)
+
+
+def parse_file(path: str) -> dict:
+    """Model of one page file, or {"error": ...}; runs in worker processes."""
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            source = f.read()
+    except OSError as e:
+        return {"error": str(e)}
+    try:
+        return parse_page(source, jsx=path.lower().endswith((".jsx", ".tsx")))
+    except RecursionError:
+        return {"error": "elements nested too deeply to parse"}
+
+
+class _PageMemo:
+    """Models parsed during this run, keyed by (path, size, mtime_ns)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.models: Dict[tuple, dict] = {}
+        self.parsing: Dict[tuple, threading.Event] = {}  # claimed by the checker parsing them
+
+
+def _memo_key(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def load_pages(paths, jobs: int = 1, use_cache: bool = True) -> List[dict]:
+    """Models of the given pages in input order, parsed at most once per run and content hash."""
+    paths = [str(p) for p in paths]
+    memo = shared_state("page_model", _PageMemo)
+    keys = [_memo_key(path) for path in paths]
+    results: List[dict] = [None] * len(paths)
+    mine, waiting = [], []
+    with memo.lock:
+        for index, key in enumerate(keys):
+            if key is not None and key in memo.models:
+                results[index] = memo.models[key]
+            elif key is not None and key in memo.parsing:
+                waiting.append(index)
+            else:
+                if key is not None:
+                    memo.parsing[key] = threading.Event()
+                mine.append(index)
+
+    try:
+        cache = ResultCache("page_model", MODEL_VERSION) if use_cache else None
+        fresh = map_files(parse_file, [paths[i] for i in mine], jobs=jobs, cache=cache)
+        for index, model in zip(mine, fresh):
+            results[index] = model
+            if keys[index] is not None:
+                with memo.lock:
+                    memo.models[keys[index]] = model
+    finally:
+        with memo.lock:
+            for index in mine:
+                event = memo.parsing.pop(keys[index], None) if keys[index] is not None else None
+                if event:
+                    event.set()
+
+    for index in waiting:
+        with memo.lock:
+            event = memo.parsing.get(keys[index])
+        if event:
+            event.wait()
+        with memo.lock:
+            model = memo.models.get(keys[index])
+        # The other checker failed before storing it: parse here
+        results[index] = model if model is not None else parse_file(paths[index])
+    return results
+
+
+def elements(doc: dict, *tags: str) -> List[list]:
+    """[tag, attrs, line] of the elements with one of the given (lowercase) tags."""
+    wanted = set(tags)
+    return [element for element in doc.get("elements", []) if element[0] in wanted]
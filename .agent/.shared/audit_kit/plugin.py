@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Plugin - in-process execution of checker scripts for verify_all and checklist.
+
+A checker opts in by exposing a plugin entry point next to its CLI:
+
+    def run(project_path: str, context: dict) -> dict:
+        return run_main(main, [__file__, project_path])
+
+run() returns a Result dict {"passed", "output", "error", "returncode"};
+run_check() adds "isolated" and "peak_rss" (bytes: the child's own peak
+for isolated checks, this process's high-water mark for in-process ones).
+run_main() calls the script's own main(argv) with stdout and stderr
+captured for the calling thread only, and turns sys.exit() into the
+return code, so the in-process result matches a subprocess run.
+
+The runner imports each checker once (load_checker) and calls run() in its
+own interpreter: start-up and imports are paid once, and module-level
+caches - the project FileIndex, rule sets, parsed files - are shared by
+every check of the run. The context dict carries the run's options:
+
+    "url"         URL for performance and E2E checkers (or None)
+    "file_index"  the project's FileIndex, built once before checks start
+    "shared"      a dict checkers may use for their own cross-check state;
+                  library code reaches it through shared_state(), which
+                  creates each entry once under a lock (checks may run
+                  concurrently)
+
+Scripts without run(), scripts that fail to import, and any check the
+runner marks as isolated still execute in a subprocess (run_isolated),
+which also gives them a hard timeout and crash isolation.
+
+Output is captured line by line into an OutputBuffer, which keeps only the
+most recent MAX_OUTPUT_CHARS of each stream and can hand every line to an
+on_line callback as it arrives (live, prefixed output in verify_all).
+Isolated checks run in their own session; on timeout, or once the
+context's "cancel" event is set, their whole process tree is terminated.
+In-process checks cannot be interrupted and always run to completion.
+"""
+
+import codecs
+import hashlib
+import importlib.util
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import selectors
+except ImportError:
+    selectors = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Hard timeout for isolated (subprocess) checks, in seconds
+ISOLATED_TIMEOUT = 600
+
+# Checkers that receive the run's URL instead of the project path
+URL_CHECKERS = ("lighthouse", "playwright")
+
+# Most recent output kept per stream of one check; older lines are dropped
+MAX_OUTPUT_CHARS = 1_000_000
+
+# Seconds a terminated process group gets before it is killed
+KILL_GRACE = 3.0
+
+_CHECKERS: Dict[str, object] = {}
+_LOAD_LOCK = threading.Lock()
+_CAPTURE = threading.local()
+
+# shared_state() outside a runner (a checker run from its own CLI)
+_SHARED_LOCK = threading.Lock()
+_PROCESS_SHARED: Dict[str, object] = {}
+
+
+def rss_bytes(maxrss: int) -> int:
+    """ru_maxrss is in KiB on Linux and bytes on macOS."""
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def peak_rss() -> Optional[int]:
+    """High-water resident set size of this process, in bytes (None where unsupported)."""
+    if resource is None:
+        return None
+    return rss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def make_result(returncode: int, output: str = "", error: str = "") -> dict:
+    return {"passed": returncode == 0, "output": output, "error": error, "returncode": returncode}
+
+
+# ============================================================================
+#  OUTPUT CAPTURE
+# ============================================================================
+
+class OutputBuffer:
+    """Text sink that splits output into lines and keeps only the most recent ones."""
+
+    def __init__(self, on_line: Optional[Callable[[str], None]] = None,
+                 max_chars: int = MAX_OUTPUT_CHARS):
+        self.on_line = on_line
+        self.max_chars = max_chars
+        self.lines: deque = deque()
+        self.size = 0
+        self.dropped = 0
+        self.partial = ""
+
+    def write(self, text: str) -> int:
+        self.partial += text
+        if "\n" in self.partial:
+            *complete, self.partial = self.partial.split("\n")
+            for line in complete:
+                self._add(line)
+        elif len(self.partial) > self.max_chars:
+            self.partial = self.partial[-self.max_chars:]  # One huge unterminated line
+        return len(text)
+
+    def _add(self, line: str) -> None:
+        if self.on_line:
+            self.on_line(line)
+        self.lines.append(line)
+        self.size += len(line) + 1
+        while self.size > self.max_chars and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft()) + 1
+            self.dropped += 1
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def getvalue(self) -> str:
+        head = f"[... {self.dropped} earlier lines dropped ...]\n" if self.dropped else ""
+        return head + "".join(line + "\n" for line in self.lines) + self.partial
+
+class _ThreadStream:
+    """sys.stdout/sys.stderr stand-in that writes to the calling thread's capture buffer, if any."""
+
+    def __init__(self, stream, slot: str):
+        self._stream = stream
+        self._slot = slot
+
+    def _target(self):
+        buffers = getattr(_CAPTURE, "buffers", None)
+        return buffers[self._slot] if buffers else self._stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def writelines(self, lines):
+        self._target().writelines(lines)
+
+    def flush(self):
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self._target().isatty()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _install_streams() -> None:
+    with _LOAD_LOCK:
+        if not isinstance(sys.stdout, _ThreadStream):
+            sys.stdout = _ThreadStream(sys.stdout, "out")
+        if not isinstance(sys.stderr, _ThreadStream):
+            sys.stderr = _ThreadStream(sys.stderr, "err")
+
+
+def run_main(main: Callable, argv: List[str]) -> dict:
+    """Call a checker's main(argv) in-process and turn its exit into a Result."""
+    _install_streams()
+    on_line = getattr(_CAPTURE, "on_line", None)
+    emit = None
+    if on_line:
+        def emit(line):
+            # The callback prints; send that to the real streams, not back here
+            saved, _CAPTURE.buffers = _CAPTURE.buffers, None
+            try:
+                on_line(line)
+            finally:
+                _CAPTURE.buffers = saved
+    out, err = OutputBuffer(emit), OutputBuffer(emit)
+    previous = getattr(_CAPTURE, "buffers", None)
+    _CAPTURE.buffers = {"out": out, "err": err}
+    returncode = 0
+    try:
+        main(argv)
+    except SystemExit as e:
+        if e.code is None:
+            returncode = 0
+        elif isinstance(e.code, int):
+            returncode = e.code
+        else:
+            err.write(f"{e.code}\n")
+            returncode = 1
+    except Exception:
+        err.write(traceback.format_exc())
+        returncode = 1
+    finally:
+        _CAPTURE.buffers = previous
+    return make_result(returncode, out.getvalue(), err.getvalue())
+
+
+def shared_state(name: str, factory: Callable[[], object]) -> object:
+    """
+    The run-wide object stored under name in the calling check's
+    context["shared"] (per process when no runner is driving the check),
+    created by factory() on first use.
+    """
+    context = getattr(_CAPTURE, "context", None)
+    shared = context.get("shared") if isinstance(context, dict) else None
+    if shared is None:
+        shared = _PROCESS_SHARED
+    with _SHARED_LOCK:
+        if name not in shared:
+            shared[name] = factory()
+        return shared[name]
+
+
+# ============================================================================
+#  LOADING AND DISPATCH
+# ============================================================================
+
+def load_checker(script_path):
+    """Import a checker script once per process; None if it cannot be imported."""
+    key = str(Path(script_path).resolve())
+    with _LOAD_LOCK:
+        if key not in _CHECKERS:
+            name = f"_checker_{Path(key).stem}_{hashlib.sha1(key.encode()).hexdigest()[:8]}"
+            module = None
+            try:
+                spec = importlib.util.spec_from_file_location(name, key)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[name] = module  # so worker processes can unpickle its classes
+                spec.loader.exec_module(module)
+            except (Exception, SystemExit):
+                sys.modules.pop(name, None)
+                module = None
+            _CHECKERS[key] = module
+        return _CHECKERS[key]
+
+
+def _popen_tree(cmd: List[str]) -> subprocess.Popen:
+    """Start a command as the leader of its own process group / session."""
+    if os.name == "nt":
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+
+
+def kill_tree(proc: subprocess.Popen) -> None:
+    """Terminate a process started by _popen_tree and everything it spawned."""
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)], capture_output=True)
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    # Give the leader a grace period, without reaping it (the caller wants its rusage)
+    deadline = time.monotonic() + KILL_GRACE
+    while time.monotonic() < deadline:
+        if os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None:
+            break
+        time.sleep(0.05)
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)  # Whatever ignored SIGTERM or outlived the leader
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _pump(proc: subprocess.Popen, out: OutputBuffer, err: OutputBuffer, deadline: float, cancel) -> str:
+    """
+    Feed the child's pipes into the buffers until both close.
+    Returns "" on EOF, or "timeout" / "cancelled" after killing the process tree.
+    """
+    if selectors is None or os.name == "nt":
+        # No select() on Windows pipes: drain with threads, poll for the deadline
+        def drain(pipe, buffer):
+            for chunk in iter(lambda: pipe.read1(65536), b""):
+                buffer.write(chunk.decode("utf-8", "replace"))
+        readers = [threading.Thread(target=drain, args=args, daemon=True)
+                   for args in ((proc.stdout, out), (proc.stderr, err))]
+        for reader in readers:
+            reader.start()
+        while any(reader.is_alive() for reader in readers):
+            if cancel is not None and cancel.is_set():
+                kill_tree(proc)
+                return "cancelled"
+            if time.monotonic() > deadline:
+                kill_tree(proc)
+                return "timeout"
+            readers[0].join(0.1)
+        return ""
+
+    sel = selectors.DefaultSelector()
+    decoders = {}
+    for pipe, buffer in ((proc.stdout, out), (proc.stderr, err)):
+        sel.register(pipe, selectors.EVENT_READ, buffer)
+        decoders[pipe] = codecs.getincrementaldecoder("utf-8")("replace")
+    try:
+        while sel.get_map():
+            if cancel is not None and cancel.is_set():
+                kill_tree(proc)
+                return "cancelled"
+            if time.monotonic() > deadline:
+                kill_tree(proc)
+                return "timeout"
+            for key, _ in sel.select(timeout=0.1):
+                chunk = os.read(key.fd, 65536)
+                if chunk:
+                    key.data.write(decoders[key.fileobj].decode(chunk))
+                else:
+                    key.data.write(decoders[key.fileobj].decode(b"", final=True))
+                    sel.unregister(key.fileobj)
+        return ""
+    finally:
+        sel.close()
+
+
+def run_isolated(script_path, project_path: str, context: dict, timeout: float = ISOLATED_TIMEOUT,
+                 on_line: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Run a checker in its own interpreter, streaming its output.
+    Raises subprocess.TimeoutExpired after killing the process tree; a set
+    context["cancel"] event kills it too and returns a "cancelled" Result.
+    """
+    script_path = Path(script_path)
+    cmd = ["python", str(script_path), str(project_path)]
+    if context.get("url") and any(name in script_path.name.lower() for name in URL_CHECKERS):
+        cmd.append(context["url"])
+
+    out, err = OutputBuffer(on_line), OutputBuffer(on_line)
+    proc = _popen_tree(cmd)
+    try:
+        stopped = _pump(proc, out, err, time.monotonic() + timeout, context.get("cancel"))
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+
+    # Reap the child with wait4 ourselves, where available, to get its own peak RSS
+    usage = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    else:
+        proc.wait()
+
+    if stopped == "timeout":
+        raise subprocess.TimeoutExpired(cmd, timeout, output=out.getvalue(), stderr=err.getvalue())
+    result = make_result(proc.returncode, out.getvalue(), err.getvalue())
+    result["peak_rss"] = rss_bytes(usage.ru_maxrss) if usage else None
+    if stopped == "cancelled":
+        result["cancelled"] = True
+    return result
+
+
+def run_check(script_path, project_path: str, context: dict, isolated: bool = False,
+              timeout: float = ISOLATED_TIMEOUT, on_line: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Run one checker: in-process through its run() entry point, or in a
+    subprocess when isolated, when it has no run() or when it fails to
+    import. The Result's "isolated" key records which path was taken.
+    on_line receives each output line as it is produced.
+    """
+    module = None if isolated else load_checker(script_path)
+    entry = getattr(module, "run", None)
+    if not callable(entry):
+        result = run_isolated(script_path, project_path, context, timeout, on_line)
+        result["isolated"] = True
+        return result
+    _CAPTURE.on_line = on_line
+    _CAPTURE.context = context
+    try:
+        result = entry(str(project_path), context)
+    except Exception:
+        result = make_result(1, error=traceback.format_exc())
+    finally:
+        _CAPTURE.on_line = None
+        _CAPTURE.context = None
+    result["isolated"] = False
+    result["peak_rss"] = peak_rss()
+    return result
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Profiler - opt-in per-rule instrumentation for the audit scripts.
+
+Enabled with `--profile` (or `--profile=<trace.json>`) on a checker:
+
+    profiler = profiler_from_argv("seo_checker")
+    if profiler:
+        module = sys.modules[__name__]
+        profiler.install(module, module, "check_page")
+
+install() routes the module's re.* calls through the profiler, records
+one span per call of the per-file function and reports at exit.
+
+Checkers whose time goes into shared helpers rather than their own regexes
+(the page checkers parse through page_model) also time those helpers as
+stages:
+
+        profiler.time_stage(module, "load_pages", "parse (page_model)")
+        profiler.time_stage(module, "check_page", "check")
+
+For each rule (a regex pattern, or a RuleSet rule id) it records calls,
+time, matches and bytes scanned; for each file the time and size. At exit
+it prints a hot-rule report to stderr, so JSON on stdout stays parseable,
+and writes a Chrome trace (chrome://tracing, Perfetto) whose extra
+"hotRules" and "files" keys hold the same numbers as plain JSON.
+"""
+
+import atexit
+import functools
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .batch import CACHE_DIR
+
+# Rule calls shorter than this are aggregated but not written as trace events
+TRACE_MIN_SECONDS = 0.00002
+
+_MATCHERS = ("search", "match", "fullmatch", "findall", "finditer", "sub", "subn", "split")
+
+
+def _rule_key(pattern, flags: int = 0) -> str:
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags & ~re.UNICODE
+    key = str(pattern)
+    return f"{key} [flags={flags}]" if flags else key
+
+
+def _match_count(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple):  # subn
+        return result[1]
+    return 1
+
+
+class _TimedRe:
+    """Stand-in for the `re` module that reports every match call to a Profiler."""
+
+    def __init__(self, profiler: "Profiler"):
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attr = getattr(re, name)
+        if name not in _MATCHERS:
+            return attr
+
+        @functools.wraps(attr)
+        def timed(pattern, *args, **kwargs):
+            flags = kwargs.get("flags", 0)
+            if name in ("search", "match", "fullmatch", "findall", "finditer", "split"):
+                string = args[0] if args else kwargs.get("string", "")
+                if len(args) > 1 and name != "split":
+                    flags = args[1]
+            else:  # sub/subn(pattern, repl, string, count, flags)
+                string = args[1] if len(args) > 1 else kwargs.get("string", "")
+            start = time.perf_counter()
+            result = attr(pattern, *args, **kwargs)
+            if name == "finditer":
+                result = list(result)
+                count, result = len(result), iter(result)
+            else:
+                count = _match_count(result)
+            self._profiler.record_rule(_rule_key(pattern, flags), start, time.perf_counter() - start,
+                                       len(string), count)
+            return result
+
+        return timed
+
+
+class Profiler:
+    """Aggregates per-rule and per-file timings and Chrome trace events."""
+
+    def __init__(self, name: str, trace_path: Optional[Path] = None):
+        self.name = name
+        self.trace_path = Path(trace_path) if trace_path else CACHE_DIR / f"{name}.profile.json"
+        self.rules: Dict[str, dict] = {}
+        self.files: Dict[str, dict] = {}
+        self.stages: Dict[str, dict] = {}
+        self.events: List[dict] = []
+        self.current_file: Optional[str] = None
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _us(self, seconds: float) -> float:
+        return round(seconds * 1e6, 3)
+
+    # -- recording ----------------------------------------------------------
+
+    def record_rule(self, key: str, start: float, elapsed: float, nbytes: int, matches: int) -> None:
+        stat = self.rules.setdefault(key, {"calls": 0, "time": 0.0, "matches": 0, "bytes": 0})
+        stat["calls"] += 1
+        stat["time"] += elapsed
+        stat["matches"] += matches
+        stat["bytes"] += nbytes
+        if elapsed >= TRACE_MIN_SECONDS:
+            self.events.append({
+                "name": key[:80], "cat": "rule", "ph": "X", "pid": self._pid, "tid": 1,
+                "ts": self._us(start - self._origin), "dur": self._us(elapsed),
+                "args": {"file": self.current_file, "bytes": nbytes, "matches": matches},
+            })
+
+    def record_file(self, path: str, start: float, elapsed: float) -> None:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        stat = self.files.setdefault(path, {"time": 0.0, "bytes": size})
+        stat["time"] += elapsed
+        self.events.append({
+            "name": os.path.basename(path), "cat": "file", "ph": "X", "pid": self._pid, "tid": 1,
+            "ts": self._us(start - self._origin), "dur": self._us(elapsed),
+            "args": {"path": path, "bytes": size},
+        })
+
+    def record_stage(self, name: str, start: float, elapsed: float, items: int) -> None:
+        stat = self.stages.setdefault(name, {"calls": 0, "time": 0.0, "items": 0})
+        stat["calls"] += 1
+        stat["time"] += elapsed
+        stat["items"] += items
+        self.events.append({
+            "name": name, "cat": "stage", "ph": "X", "pid": self._pid, "tid": 1,
+            "ts": self._us(start - self._origin), "dur": self._us(elapsed),
+            "args": {"items": items},
+        })
+
+    # -- hooks --------------------------------------------------------------
+
+    def instrument(self, module) -> None:
+        """Route a checker module's `re.*` calls through the profiler."""
+        module.re = _TimedRe(self)
+
+    def wrap(self, owner, func_name: str) -> None:
+        """Record a file span around owner.func_name(path, ...) (function or method)."""
+        func = getattr(owner, func_name)
+        is_method = isinstance(owner, type)
+
+        @functools.wraps(func)
+        def spanned(*args, **kwargs):
+            path = str(args[1] if is_method else args[0])
+            previous, self.current_file = self.current_file, path
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record_file(path, start, time.perf_counter() - start)
+                self.current_file = previous
+
+        setattr(owner, func_name, spanned)
+
+    def time_stage(self, owner, func_name: str, stage: Optional[str] = None) -> None:
+        """Record every call of owner.func_name as a stage; a list result counts its items."""
+        func = getattr(owner, func_name)
+        name = stage or func_name
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                self.record_stage(name, start, time.perf_counter() - start,
+                                  len(result) if isinstance(result, list) else 1)
+
+        setattr(owner, func_name, timed)
+
+    def install(self, module, owner, func_name: str) -> None:
+        """Instrument a checker module, span its per-file function, report at exit."""
+        self.instrument(module)
+        self.wrap(owner, func_name)
+        atexit.register(self.finish)
+
+    # -- output -------------------------------------------------------------
+
+    def hot_rules(self, limit: int = 15) -> List[Tuple[str, dict]]:
+        ranked = sorted(self.rules.items(), key=lambda item: -item[1]["time"])
+        return ranked[:limit] if limit else ranked
+
+    def report(self, limit: int = 15, stream=None) -> None:
+        stream = stream or sys.stderr
+        total = sum(stat["time"] for stat in self.rules.values()) or 1e-9
+        scanned = sum(stat["bytes"] for stat in self.files.values())
+        print(f"\n[PROFILE] {self.name}: {len(self.rules)} rules, {len(self.files)} files, "
+              f"{scanned / 1024:.0f} KiB", file=stream)
+        if self.rules:
+            print(f"{'ms':>9} {'share':>6} {'calls':>7} {'matches':>8} {'MiB':>7}  rule", file=stream)
+        for key, stat in self.hot_rules(limit):
+            print(f"{stat['time'] * 1000:9.1f} {stat['time'] / total:6.1%} {stat['calls']:7} "
+                  f"{stat['matches']:8} {stat['bytes'] / 1048576:7.2f}  {key[:70]}", file=stream)
+        if self.stages:
+            print(f"{'ms':>9} {'calls':>7} {'items':>8}  stage", file=stream)
+            for name, stat in sorted(self.stages.items(), key=lambda item: -item[1]["time"]):
+                print(f"{stat['time'] * 1000:9.1f} {stat['calls']:7} {stat['items']:8}  {name}", file=stream)
+        print(f"Trace: {self.trace_path}", file=stream)
+
+    def write_trace(self) -> None:
+        data = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"script": self.name},
+            "hotRules": [dict(stat, rule=key) for key, stat in self.hot_rules(0)],
+            "stages": [dict(stat, stage=name) for name, stat in self.stages.items()],
+            "files": [dict(stat, file=path) for path, stat in
+                      sorted(self.files.items(), key=lambda item: -item[1]["time"])],
+        }
+        try:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            self.trace_path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            print(f"[PROFILE] Could not write trace: {e}", file=sys.stderr)
+
+    def finish(self, limit: int = 15) -> None:
+        self.write_trace()
+        self.report(limit)
+
+
+def profiler_from_argv(name: str, argv: Optional[List[str]] = None) -> Optional[Profiler]:
+    """Profiler for `--profile[=path]`, or None when profiling is off."""
+    for arg in (sys.argv if argv is None else argv)[1:]:
+        if arg == "--profile":
+            return Profiler(name)
+        if arg.startswith("--profile="):
+            return Profiler(name, Path(arg.split("=", 1)[1]))
+    return None
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Regex Guard - catastrophic-backtracking protection for audit rules.
+
+Python's `re` cannot be interrupted mid-match, so protection is layered:
+
+    1. Static check at load time: backtracking_risks() walks the parsed
+       pattern and flags nested unbounded quantifiers (exponential) and
+       sequences of several unbounded wildcards such as `.*x.*y`
+       (polynomial). Rules with nested quantifiers are reported on stderr.
+    2. Line-length cap: risky rules only see each line's first
+       MAX_LINE_LENGTH characters, which bounds their cost on minified
+       bundles and generated files.
+    3. Time budget: a risky rule whose single evaluation exceeds its budget
+       is tripped and skipped for the rest of the run, so one pathological
+       rule cannot multiply its cost across hundreds of files.
+
+Layers 2 and 3 mean a risky rule may not see all of its input. Scanners
+record that with a ScanCoverage and put its report() in their output, so
+a scan that skipped input says so instead of passing silently.
+
+    DANGEROUS = [GuardedRegex(p, re.IGNORECASE, name=n) for p, n in PATTERNS]
+    if DANGEROUS[0].search(line): ...
+"""
+
+import re
+import sys
+import time
+from typing import List, Optional
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:
+    import sre_parse, sre_constants
+
+_ANY = sre_constants.ANY
+_IN = sre_constants.IN
+_NEGATE = sre_constants.NEGATE
+_NOT_LITERAL = sre_constants.NOT_LITERAL
+_BRANCH = sre_constants.BRANCH
+_SUBPATTERN = sre_constants.SUBPATTERN
+_ASSERTS = (sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+_REPEATS = tuple(getattr(sre_constants, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+                 if hasattr(sre_constants, name))
+_MAXREPEAT = sre_constants.MAXREPEAT
+
+# Longest line a risky rule is allowed to scan
+MAX_LINE_LENGTH = 4000
+
+# Seconds a risky rule may spend on one input before it is tripped
+RULE_BUDGET = 1.0
+
+NESTED = "nested unbounded quantifier"
+WILDCARDS = "multiple unbounded wildcards"
+
+
+# ============================================================================
+#  STATIC CHECK
+# ============================================================================
+
+def _is_wide(sub) -> bool:
+    """A single-character item that matches almost anything: ., [^...], [^x]."""
+    if len(sub) != 1:
+        return False
+    op, av = sub[0]
+    if op is _ANY or op is _NOT_LITERAL:
+        return True
+    return op is _IN and bool(av) and av[0][0] is _NEGATE
+
+
+def _has_unbounded_repeat(items) -> bool:
+    for op, av in items:
+        if op in _REPEATS:
+            if av[1] == _MAXREPEAT or _has_unbounded_repeat(av[2]):
+                return True
+        elif op is _SUBPATTERN:
+            if _has_unbounded_repeat(av[-1]):
+                return True
+        elif op is _BRANCH:
+            if any(_has_unbounded_repeat(branch) for branch in av[1]):
+                return True
+    return False
+
+
+def _scan(items, risks: set) -> int:
+    """Collect risks in `items`; return the number of unbounded wildcards in sequence."""
+    wildcards = 0
+    for op, av in items:
+        if op in _REPEATS:
+            _low, high, sub = av
+            if high == _MAXREPEAT:
+                if _has_unbounded_repeat(sub):
+                    risks.add(NESTED)
+                if _is_wide(sub):
+                    wildcards += 1
+            wildcards += _scan(sub, risks) if not _is_wide(sub) else 0
+        elif op is _SUBPATTERN:
+            wildcards += _scan(av[-1], risks)
+        elif op is _BRANCH:
+            wildcards += max(_scan(branch, risks) for branch in av[1])
+        elif op in _ASSERTS:
+            _scan(av[1], risks)  # lookarounds are matched independently
+    return wildcards
+
+
+def backtracking_risks(pattern: str, flags: int = 0) -> List[str]:
+    """Sorted list of backtracking hazards found in a pattern (empty when safe)."""
+    risks: set = set()
+    if _scan(sre_parse.parse(pattern, flags), risks) >= 2:
+        risks.add(WILDCARDS)
+    return sorted(risks)
+
+
+def warn_nested(name: str, pattern: str, risks: List[str]) -> None:
+    """Load-time warning for rules that can backtrack exponentially."""
+    if NESTED in risks:
+        print(f"[regex-guard] {name}: {NESTED} in {pattern!r}; evaluated with line cap and time budget",
+              file=sys.stderr)
+
+
+# ============================================================================
+#  RUNTIME GUARD
+# ============================================================================
+
+def cap_lines(text: str, limit: int = MAX_LINE_LENGTH) -> str:
+    """Truncate every line longer than `limit`, keeping line structure intact."""
+    if len(text) <= limit:
+        return text
+    lines = text.split("\n")
+    if all(len(line) <= limit for line in lines):
+        return text
+    return "\n".join(line[:limit] for line in lines)
+
+
+def long_lines(text: str, limit: int = MAX_LINE_LENGTH) -> List[int]:
+    """1-based numbers of the lines cap_lines() would truncate."""
+    if len(text) <= limit:
+        return []
+    return [number for number, line in enumerate(text.split("\n"), 1) if len(line) > limit]
+
+
+class GuardedRegex:
+    """A compiled pattern that is capped and time-budgeted when statically risky."""
+
+    def __init__(self, pattern: str, flags: int = 0, name: Optional[str] = None,
+                 budget: float = RULE_BUDGET, max_line: int = MAX_LINE_LENGTH):
+        self.pattern = pattern
+        self.name = name or pattern
+        self.regex = re.compile(pattern, flags)
+        self.risks = backtracking_risks(pattern, flags)
+        self.risky = bool(self.risks)
+        self.budget = budget
+        self.max_line = max_line
+        self.tripped = False
+        self.skipped = 0
+        warn_nested(self.name, pattern, self.risks)
+
+    def reset(self) -> None:
+        """Re-enable a tripped rule, e.g. at the start of a new scan in the same process."""
+        self.tripped = False
+        self.skipped = 0
+
+    def _run(self, method: str, text: str):
+        if not self.risky:
+            return getattr(self.regex, method)(text)
+        if self.tripped:
+            self.skipped += 1
+            return [] if method == "findall" else None
+        start = time.perf_counter()
+        result = getattr(self.regex, method)(cap_lines(text, self.max_line))
+        elapsed = time.perf_counter() - start
+        if elapsed > self.budget:
+            self.trip(elapsed)
+        return result
+
+    def trip(self, elapsed: float) -> None:
+        self.tripped = True
+        print(f"[regex-guard] {self.name}: took {elapsed:.2f}s (budget {self.budget:.2f}s); "
+              f"rule disabled for the rest of this run", file=sys.stderr)
+
+    def search(self, text: str):
+        return self._run("search", text)
+
+    def findall(self, text: str) -> list:
+        return self._run("findall", text)
+
+
+# ============================================================================
+#  COVERAGE REPORT
+# ============================================================================
+
+class ScanCoverage:
+    """
+    Input the risky rules of one scan did not fully evaluate.
+
+        coverage = ScanCoverage(rule for rule, *_ in RULES)   # resets the rules
+        for path in files:
+            coverage.add_file(path, text)
+            ... rule.search(...) ...
+            coverage.after_file(path)
+        results["coverage"] = coverage.report()
+    """
+
+    MAX_LISTED = 20
+
+    def __init__(self, rules):
+        self.rules = [rule for rule in rules if rule.risky]
+        for rule in self.rules:
+            rule.reset()
+        self.capped: List[dict] = []
+        self.capped_lines = 0
+        self.tripped: dict = {}
+
+    def add_file(self, path: str, text: str) -> None:
+        """Record the lines of `path` that the risky rules only see in part."""
+        limits = {rule.max_line for rule in self.rules}
+        if not limits:
+            return
+        numbers = long_lines(text, min(limits))
+        if numbers:
+            self.capped_lines += len(numbers)
+            if len(self.capped) < self.MAX_LISTED:
+                self.capped.append({"file": path, "lines": numbers[:10], "count": len(numbers)})
+
+    def after_file(self, path: str) -> None:
+        """Note rules that tripped while `path` was scanned, and files later skipped."""
+        for rule in self.rules:
+            if not rule.tripped:
+                continue
+            entry = self.tripped.get(rule.name)
+            if entry is None:
+                self.tripped[rule.name] = {"rule": rule.name, "tripped_on": path, "budget": rule.budget,
+                                           "files_skipped": 0}
+            else:
+                entry["files_skipped"] += 1
+
+    @property
+    def complete(self) -> bool:
+        return not self.tripped and not self.capped_lines
+
+    def report(self) -> dict:
+        return {
+            "complete": self.complete,
+            "tripped_rules": list(self.tripped.values()),
+            "capped_lines": self.capped_lines,
+            "capped_files": self.capped,
+        }
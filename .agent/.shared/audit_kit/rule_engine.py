@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Rule Engine - compiled regex rules shared by the audit scripts.
+
+Rules are declared as data and compiled once per process:
+
+    RULES = [
+        # (id, pattern[, flags[, severity, message]])
+        ("form.present", r'<form|<input|password', re.IGNORECASE),
+        ("a11y.img_alt", r'<img(?![^>]*alt=)[^>]*>', 0, "issue", "[Accessibility] {filename}: Missing img alt text"),
+    ]
+
+Rules without a severity are probes: they only feed a check's decision.
+
+Per file, a RuleSet.scan() evaluates rules lazily and memoizes the result:
+
+    - Identical (pattern, flags) pairs share one compiled program.
+    - Every program gets a literal prefilter derived from the regex AST:
+      a set of substrings one of which must occur for the regex to match.
+      Programs with the same prefilter are grouped, so each literal group
+      is looked up once per file and a miss rejects the whole group.
+    - Case-insensitive programs run as case-sensitive ones over an ASCII
+      lowercased copy of the file when that is provably equivalent, which
+      avoids the slow IGNORECASE path of the `re` module.
+
+Rules flagged by regex_guard.backtracking_risks() at load time only see
+capped lines and are tripped (skipped from then on) when one evaluation
+exceeds the time budget.
+
+Per-rule evaluations, prefilter skips, matches, findings and time are
+recorded in RuleSet.stats; assigning a Profiler to RuleSet.profiler also
+records every evaluation as a trace event.
+"""
+
+import re
+import sys
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .regex_guard import RULE_BUDGET, backtracking_risks, cap_lines, warn_nested
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:
+    import sre_parse, sre_constants
+
+_LITERAL = sre_constants.LITERAL
+_BRANCH = sre_constants.BRANCH
+_SUBPATTERN = sre_constants.SUBPATTERN
+_IN = sre_constants.IN
+_RANGE = sre_constants.RANGE
+_REPEATS = tuple(getattr(sre_constants, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+                 if hasattr(sre_constants, name))
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+# Lowercases ASCII letters only, so offsets in the folded copy match the original
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+# (dotted/dotless i, long s, Kelvin sign). Their presence disables folding.
+_FOLD_HAZARDS = ("\u0130", "\u0131", "\u017f", "\u212a")
+
+SEVERITIES = ("issue", "warning")
+
+
+class Rule:
+    """A single declarative rule."""
+
+    __slots__ = ("id", "pattern", "flags", "severity", "message")
+
+    def __init__(self, id: str, pattern: str, flags: int = 0,
+                 severity: Optional[str] = None, message: Optional[str] = None):
+        if severity is not None and severity not in SEVERITIES:
+            raise ValueError(f"Rule {id}: unknown severity '{severity}'")
+        self.id = id
+        self.pattern = pattern
+        self.flags = flags
+        self.severity = severity
+        self.message = message
+
+    @classmethod
+    def from_spec(cls, spec) -> "Rule":
+        if isinstance(spec, Rule):
+            return spec
+        return cls(*spec)
+
+    def __repr__(self):
+        return f"Rule({self.id!r}, {self.pattern!r})"
+
+
+# ============================================================================
+#  REGEX AST ANALYSIS
+# ============================================================================
+
+def _literal_score(literals: FrozenSet[str]) -> Tuple[int, int]:
+    """Prefer long literals, then fewer alternatives."""
+    return (min(len(s) for s in literals), -len(literals))
+
+
+def required_literals(items) -> Optional[FrozenSet[str]]:
+    """
+    Return a set of strings one of which occurs in every match of the parsed
+    regex `items`, or None when no such set can be proven.
+    """
+    best = None
+    run = []
+
+    def consider(candidate):
+        nonlocal best
+        if candidate and all(candidate) and (best is None or _literal_score(candidate) > _literal_score(best)):
+            best = candidate
+
+    for op, av in items:
+        if op is _LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            consider(frozenset({"".join(run)}))
+            run = []
+        if op is _BRANCH:
+            alternatives = [required_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                consider(frozenset().union(*alternatives))
+        elif op is _SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            if not add_flags and not del_flags:  # inline flags could change case handling
+                consider(required_literals(sub))
+        elif op in _REPEATS:
+            low, _high, sub = av
+            if low >= 1:
+                consider(required_literals(sub))
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            consider(required_literals(av))
+    if run:
+        consider(frozenset({"".join(run)}))
+    return best
+
+
+def _ranges_foldable(items) -> bool:
+    """Character ranges must stay equivalent when their letters are lowercased."""
+    for op, av in items:
+        if op is _IN:
+            for sub_op, sub_av in av:
+                if sub_op is _RANGE:
+                    lo, hi = sub_av
+                    letter_free = hi < 0x41 or lo > 0x7A or (lo > 0x5A and hi < 0x61)
+                    upper_only = 0x41 <= lo and hi <= 0x5A
+                    lower_only = 0x61 <= lo and hi <= 0x7A
+                    if not (letter_free or upper_only or lower_only):
+                        return False
+        elif op is _BRANCH:
+            if not all(_ranges_foldable(branch) for branch in av[1]):
+                return False
+        elif op is _SUBPATTERN:
+            if not _ranges_foldable(av[-1]):
+                return False
+        elif op in _REPEATS:
+            if not _ranges_foldable(av[2]):
+                return False
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            if not _ranges_foldable(av):
+                return False
+    return True
+
+
+def _source_foldable(pattern: str) -> bool:
+    """Lowercasing the source must not change escapes or inline constructs."""
+    if not pattern.isascii():
+        return False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if nxt.isupper() or nxt.isdigit() or nxt in "xuUN":
+                return False
+            i += 2
+            continue
+        if ch == "(" and pattern.startswith("?", i + 1) and i + 2 < len(pattern) and pattern[i + 2].isalpha():
+            return False
+        i += 1
+    return True
+
+
+def fold_pattern(pattern: str, flags: int) -> Optional[str]:
+    """
+    Return a case-sensitive equivalent of an IGNORECASE pattern for use on
+    ASCII-lowercased text, or None when the rewrite is not provably safe.
+    """
+    if not flags & re.IGNORECASE or flags & (re.VERBOSE | re.LOCALE):
+        return None
+    if not _source_foldable(pattern):
+        return None
+    if not _ranges_foldable(sre_parse.parse(pattern, flags)):
+        return None
+    return pattern.translate(_ASCII_LOWER)
+
+
+# ============================================================================
+#  COMPILATION
+# ============================================================================
+
+class _Program:
+    """One compiled (pattern, flags) pair shared by every rule that declares it."""
+
+    __slots__ = ("regex", "folded", "icase", "prefilter", "group", "risks", "tripped")
+
+    def __init__(self, pattern: str, flags: int):
+        self.regex = re.compile(pattern, flags)
+        self.icase = bool(self.regex.flags & re.IGNORECASE)
+        folded = fold_pattern(pattern, self.regex.flags)
+        self.folded = re.compile(folded, self.regex.flags & ~re.IGNORECASE) if folded is not None else None
+
+        literals = required_literals(sre_parse.parse(pattern, flags))
+        if literals and self.icase:
+            literals = frozenset(s.lower() for s in literals) if all(s.isascii() for s in literals) else None
+        self.prefilter = literals
+        self.group = -1
+        self.risks = backtracking_risks(pattern, flags)
+        self.tripped = False
+
+
+def _slice(text: str, span: Tuple[int, int]) -> str:
+    return text[span[0]:span[1]] if span[0] >= 0 else ""
+
+
+def _findall_mapped(regex, haystack: str, original: str) -> list:
+    """re.findall() over `haystack`, returning the matching text from `original`."""
+    groups = regex.groups
+    out = []
+    for m in regex.finditer(haystack):
+        if groups == 0:
+            out.append(original[m.start():m.end()])
+        elif groups == 1:
+            out.append(_slice(original, m.span(1)))
+        else:
+            out.append(tuple(_slice(original, m.span(g)) for g in range(1, groups + 1)))
+    return out
+
+
+class RuleSet:
+    """A compiled collection of rules."""
+
+    def __init__(self, rules, budget: float = RULE_BUDGET):
+        self.budget = budget
+        self.rules: Dict[str, Rule] = {}
+        self._program_of: Dict[str, int] = {}
+        self.programs: List[_Program] = []
+        self.groups: List[Tuple[FrozenSet[str], bool]] = []
+        self.stats: Dict[str, dict] = {}
+        self.profiler = None  # Optional audit_kit.profiler.Profiler
+
+        program_index: Dict[Tuple[str, int], int] = {}
+        group_index: Dict[Tuple[FrozenSet[str], bool], int] = {}
+
+        for spec in rules:
+            rule = Rule.from_spec(spec)
+            if rule.id in self.rules:
+                raise ValueError(f"Duplicate rule id '{rule.id}'")
+            self.rules[rule.id] = rule
+
+            key = (rule.pattern, rule.flags)
+            if key not in program_index:
+                program = _Program(rule.pattern, rule.flags)
+                warn_nested(rule.id, rule.pattern, program.risks)
+                if program.prefilter:
+                    group_key = (program.prefilter, program.icase)
+                    program.group = group_index.setdefault(group_key, len(group_index))
+                    if program.group == len(self.groups):
+                        self.groups.append(group_key)
+                program_index[key] = len(self.programs)
+                self.programs.append(program)
+            self._program_of[rule.id] = program_index[key]
+            self.stats[rule.id] = {"evaluations": 0, "skipped": 0, "matches": 0, "findings": 0, "time": 0.0,
+                                   "tripped": False}
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self.rules
+
+    def scan(self, content: str) -> "FileScan":
+        return FileScan(self, content)
+
+    def compiled(self, rule_id: str):
+        return self.programs[self._program_of[rule_id]].regex
+
+    def search(self, rule_id: str, text: str) -> bool:
+        """Run a single rule against an arbitrary snippet (no memoization)."""
+        start = time.perf_counter()
+        found = self.compiled(rule_id).search(text) is not None
+        stat = self.stats[rule_id]
+        stat["evaluations"] += 1
+        stat["matches"] += int(found)
+        stat["time"] += time.perf_counter() - start
+        return found
+
+    def message(self, rule_id: str, **fields) -> Tuple[str, str]:
+        """Format a rule's finding. Returns (severity, text)."""
+        rule = self.rules[rule_id]
+        if rule.severity is None:
+            raise ValueError(f"Rule '{rule_id}' is a probe and has no message")
+        self.stats[rule_id]["findings"] += 1
+        return rule.severity, rule.message.format(**fields)
+
+    def trip(self, index: int, elapsed: float) -> None:
+        """Disable a program that blew its time budget for the rest of the run."""
+        program = self.programs[index]
+        program.tripped = True
+        names = [rule_id for rule_id, i in self._program_of.items() if i == index]
+        for rule_id in names:
+            self.stats[rule_id]["tripped"] = True
+        print(f"[regex-guard] {', '.join(names)}: took {elapsed:.2f}s (budget {self.budget:.2f}s); "
+              f"rule disabled for the rest of this run", file=sys.stderr)
+
+    def risky_rules(self) -> Dict[str, List[str]]:
+        """Rule id -> backtracking risks found by the load-time static check."""
+        return {rule_id: self.programs[index].risks for rule_id, index in self._program_of.items()
+                if self.programs[index].risks}
+
+    def hot_rules(self, limit: int = 10) -> List[Tuple[str, dict]]:
+        """Rules ordered by time spent, most expensive first."""
+        ranked = sorted(self.stats.items(), key=lambda item: -item[1]["time"])
+        return [(rule_id, dict(stat)) for rule_id, stat in ranked[:limit] if stat["evaluations"] or stat["skipped"]]
+
+
+class FileScan:
+    """Lazy, memoized evaluation of a RuleSet against one file's content."""
+
+    def __init__(self, ruleset: RuleSet, content: str):
+        self.ruleset = ruleset
+        self.content = content
+        self._folded = None
+        self._fold_safe = None
+        self._capped = None
+        self._groups: Dict[int, bool] = {}
+        self._found: Dict[int, bool] = {}
+        self._matches: Dict[int, list] = {}
+
+    # -- helpers ------------------------------------------------------------
+
+    @property
+    def folded(self) -> str:
+        if self._folded is None:
+            self._folded = self.content.translate(_ASCII_LOWER)
+        return self._folded
+
+    @property
+    def capped(self) -> Tuple[str, str]:
+        """(content, folded) with overlong lines truncated, for risky rules."""
+        if self._capped is None:
+            capped = cap_lines(self.content)
+            if capped is self.content:
+                self._capped = (self.content, None)
+            else:
+                self._capped = (capped, capped.translate(_ASCII_LOWER))
+        return self._capped
+
+    @property
+    def fold_safe(self) -> bool:
+        if self._fold_safe is None:
+            self._fold_safe = not any(ch in self.content for ch in _FOLD_HAZARDS)
+        return self._fold_safe
+
+    def _prefilter_passes(self, program: _Program) -> bool:
+        if program.group < 0:
+            return True
+        if program.group not in self._groups:
+            literals, icase = self.ruleset.groups[program.group]
+            if icase and not self.fold_safe:
+                passed = True
+            else:
+                haystack = self.folded if icase else self.content
+                passed = any(literal in haystack for literal in literals)
+            self._groups[program.group] = passed
+        return self._groups[program.group]
+
+    def _evaluate(self, rule_id: str, want_all: bool):
+        index = self.ruleset._program_of[rule_id]
+        if want_all and index in self._matches:
+            return self._matches[index]
+        if not want_all and index in self._found:
+            return self._found[index]
+
+        program = self.ruleset.programs[index]
+        stat = self.ruleset.stats[rule_id]
+        if program.tripped or not self._prefilter_passes(program):
+            stat["skipped"] += 1
+            self._found[index] = False
+            self._matches[index] = []
+            return [] if want_all else False
+
+        content, folded = self.content, None
+        if program.risks:
+            content, folded = self.capped
+        use_fold = program.folded is not None and self.fold_safe
+        if use_fold and folded is None:
+            folded = self.folded
+
+        start = time.perf_counter()
+        if want_all:
+            if use_fold:
+                result = _findall_mapped(program.folded, folded, content)
+            else:
+                result = program.regex.findall(content)
+            self._matches[index] = result
+            self._found[index] = bool(result)
+            stat["matches"] += len(result)
+        else:
+            if use_fold:
+                result = program.folded.search(folded) is not None
+            else:
+                result = program.regex.search(content) is not None
+            self._found[index] = result
+            stat["matches"] += int(result)
+        elapsed = time.perf_counter() - start
+        stat["evaluations"] += 1
+        stat["time"] += elapsed
+        if program.risks and elapsed > self.ruleset.budget:
+            self.ruleset.trip(index, elapsed)
+        if self.ruleset.profiler is not None:
+            self.ruleset.profiler.record_rule(rule_id, start, elapsed, len(self.content),
+                                              len(result) if want_all else int(result))
+        return result
+
+    # -- public API ---------------------------------------------------------
+
+    def search(self, rule_id: str) -> bool:
+        """Equivalent of bool(re.search(pattern, content, flags))."""
+        return self._evaluate(rule_id, want_all=False)
+
+    def findall(self, rule_id: str) -> list:
+        """Equivalent of re.findall(pattern, content, flags)."""
+        return self._evaluate(rule_id, want_all=True)
+
+    def count(self, rule_id: str) -> int:
+        return len(self.findall(rule_id))
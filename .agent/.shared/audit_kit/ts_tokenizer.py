@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+TS Tokenizer - a fast, forgiving lexer for JavaScript/TypeScript and JSX.
+
+    tokens = tokenize(source, jsx=path.endswith(('.tsx', '.jsx')))
+    for kind, value, offset in tokens: ...
+    line, col = Positions(source).at(offset)
+
+Tokens are (kind, value, offset) tuples; whitespace and comments are
+dropped. Kinds:
+
+    ident      identifiers and keywords
+    number     numeric literals
+    string     '...' / "..." literals, value without quotes (JSX attribute
+               strings too)
+    template   a template literal's static text (`${}` parts are lexed as code)
+    regex      regular expression literals
+    punct      operators and brackets; `>` is never merged (`>>`, `>=`), so
+               nested generics close one bracket per token
+    jsx_open   `<Name` of a JSX element (value is the tag name, '' for <>)
+    jsx_attr   an attribute name inside a JSX tag
+    jsx_text   a JSX text child, value stripped, offset of its first character
+    jsx_close  end of a JSX element (`</Name>` or `/>`), value is the tag name
+
+It is not a parser: regex-vs-division and JSX-vs-generic are decided from
+the previous token, and unterminated strings stop at the end of the line,
+so malformed input degrades locally instead of derailing the whole file.
+"""
+
+import bisect
+import re
+from typing import List, Tuple
+
+Token = Tuple[str, str, int]
+
+_CODE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<ident>[A-Za-z_$\u00a0-\uffff][\w$\u00a0-\uffff]*)
+  | (?P<number>\.?\d[\w.]*)
+  | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+  | (?P<template>`)
+  | (?P<punct>=>|\.\.\.|\?\?=?|\?\.(?!\d)|[=!]==?|&&=?|\|\|=?|\*\*=?|\+\+|--|<=|[-+*/%&|^]=
+              |[{}()\[\];,.<>+\-*/%&|^!~?:=@\#])
+""", re.S | re.X)
+
+_REGEX_LITERAL = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+_TEMPLATE_CHUNK = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*", re.S)
+_JSX_NAME = re.compile(r"[A-Za-z_$][\w$.:\-]*")
+_JSX_ATTR = re.compile(r"[A-Za-z_$][\w$:\-]*")
+_JSX_TEXT = re.compile(r"[^<{]+")
+_SPACE = re.compile(r"(?:\s+|//[^\n]*|/\*.*?(?:\*/|\Z))*", re.S)
+
+# After these, `/` starts a regex literal and `<` may start a JSX element
+_EXPR_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void",
+                  "throw", "instanceof", "yield", "await", "default"}
+_EXPR_PUNCT = {"(", ",", "=", ":", "?", "[", "{", ";", "=>", "&&", "||", "??", "!", "+", "-", "*",
+               "%", "&", "|", "^", "~", "<", ">", "==", "===", "!=", "!==", "<=", "+=", "-=", "*=",
+               "/=", "%=", "&=", "|=", "^=", "&&=", "||=", "??=", "**", "**="}
+
+
+def _expression_start(prev) -> bool:
+    if prev is None:
+        return True
+    kind, value, _ = prev
+    if kind == "punct":
+        return value in _EXPR_PUNCT
+    if kind == "ident":
+        return value in _EXPR_KEYWORDS
+    return kind in ("jsx_open", "jsx_attr")
+
+
+class _Lexer:
+    def __init__(self, source: str, jsx: bool):
+        self.src = source
+        self.jsx = jsx
+        self.tokens: List[Token] = []
+
+    def prev(self):
+        return self.tokens[-1] if self.tokens else None
+
+    def code(self, pos: int, until_brace: bool = False) -> int:
+        """Lex code from pos; with until_brace, stop after the `}` closing an open `{`."""
+        src, end, depth = self.src, len(self.src), 0
+        while pos < end:
+            m = _CODE.match(src, pos)
+            if m is None:
+                pos += 1  # Stray character (e.g. a lone backslash)
+                continue
+            kind = m.lastgroup
+            if kind in ("ws", "comment"):
+                pos = m.end()
+                continue
+            if kind == "template":
+                pos = self.template(pos)
+                continue
+            value = m.group()
+            if kind == "punct":
+                if value in ("/", "/=") and _expression_start(self.prev()):
+                    rm = _REGEX_LITERAL.match(src, pos)
+                    if rm:
+                        self.tokens.append(("regex", rm.group(), pos))
+                        pos = rm.end()
+                        continue
+                if value == "<" and self.jsx and _expression_start(self.prev()) and self.jsx_ahead(pos):
+                    pos = self.element(pos)
+                    continue
+                if value == "{":
+                    depth += 1
+                elif value == "}":
+                    if until_brace and depth == 0:
+                        self.tokens.append(("punct", "}", pos))
+                        return m.end()
+                    depth -= 1
+            elif kind == "string":
+                value = value[1:-1] if len(value) > 1 and value[-1] == value[0] else value[1:]
+            self.tokens.append((kind, value, pos))
+            pos = m.end()
+        return pos
+
+    def template(self, pos: int) -> int:
+        """Lex a template literal starting at its backtick."""
+        src, end = self.src, len(self.src)
+        start, pos, text = pos, pos + 1, []
+        while pos < end:
+            m = _TEMPLATE_CHUNK.match(src, pos)
+            text.append(m.group())
+            pos = m.end()
+            if pos >= end:
+                break
+            if src[pos] == "`":
+                pos += 1
+                break
+            # `${`: lex the substitution as code, then keep reading the template
+            self.tokens.append(("template", "".join(text), start))
+            pos = self.code(pos + 2, until_brace=True)
+            text, start = [], pos
+        self.tokens.append(("template", "".join(text), start))
+        return pos
+
+    # -- JSX ----------------------------------------------------------------
+
+    def jsx_ahead(self, pos: int) -> bool:
+        """`<` at pos opens a JSX element rather than a comparison or a generic."""
+        nxt = self.src[pos + 1:pos + 2]
+        if nxt == ">":
+            return True  # Fragment
+        m = _JSX_NAME.match(self.src, pos + 1)
+        if not m:
+            return False
+        after = _SPACE.match(self.src, m.end()).end()
+        rest = self.src[after:after + 8]
+        # `<T,>(`, `<T extends U>(` and `<T>(` are generic arrow functions
+        if rest.startswith(",") or re.match(r"extends\b", rest):
+            return False
+        if rest.startswith(">") and self.src[_SPACE.match(self.src, after + 1).end():][:1] == "(":
+            return False
+        return True
+
+    def element(self, pos: int) -> int:
+        """Lex a JSX element starting at `<`; returns the position after it."""
+        src, end = self.src, len(self.src)
+        m = _JSX_NAME.match(src, pos + 1)
+        name = m.group() if m else ""
+        self.tokens.append(("jsx_open", name, pos))
+        pos = m.end() if m else pos + 1
+
+        # Attributes
+        while pos < end:
+            pos = _SPACE.match(src, pos).end()
+            if src.startswith("/>", pos):
+                self.tokens.append(("jsx_close", name, pos))
+                return pos + 2
+            if src.startswith(">", pos):
+                pos += 1
+                break
+            if src[pos] == "{":  # {...spread}
+                self.tokens.append(("punct", "{", pos))
+                pos = self.code(pos + 1, until_brace=True)
+                continue
+            am = _JSX_ATTR.match(src, pos)
+            if not am:
+                pos += 1
+                continue
+            self.tokens.append(("jsx_attr", am.group(), pos))
+            pos = _SPACE.match(src, am.end()).end()
+            if not src.startswith("=", pos):
+                continue
+            pos = _SPACE.match(src, pos + 1).end()
+            if pos < end and src[pos] in "\"'":
+                close = src.find(src[pos], pos + 1)
+                close = end if close < 0 else close
+                self.tokens.append(("string", src[pos + 1:close], pos))
+                pos = close + 1
+            elif src.startswith("{", pos):
+                self.tokens.append(("punct", "{", pos))
+                pos = self.code(pos + 1, until_brace=True)
+            elif src.startswith("<", pos):
+                pos = self.element(pos)
+        else:
+            return pos
+
+        # Children
+        while pos < end:
+            if src.startswith("</", pos):
+                close = src.find(">", pos)
+                close = end if close < 0 else close
+                self.tokens.append(("jsx_close", name, pos))
+                return close + 1
+            if src[pos] == "<":
+                pos = self.element(pos)
+            elif src[pos] == "{":
+                self.tokens.append(("punct", "{", pos))
+                pos = self.code(pos + 1, until_brace=True)
+            else:
+                tm = _JSX_TEXT.match(src, pos)
+                text = tm.group()
+                stripped = text.strip()
+                if stripped:
+                    self.tokens.append(("jsx_text", stripped, pos + len(text) - len(text.lstrip())))
+                pos = tm.end()
+        return pos
+
+
+def tokenize(source: str, jsx: bool = False) -> List[Token]:
+    """Tokens of a JS/TS source; jsx enables JSX elements (.jsx/.tsx files)."""
+    lexer = _Lexer(source, jsx)
+    lexer.code(0)
+    return lexer.tokens
+
+
+def match_brackets(tokens: List[Token]) -> dict:
+    """Index of the matching bracket for every (), [] and {} punct token."""
+    pairs, stack = {}, []
+    closers = {")": "(", "]": "[", "}": "{"}
+    for i, (kind, value, _) in enumerate(tokens):
+        if kind != "punct":
+            continue
+        if value in "([{":
+            stack.append((value, i))
+        elif value in closers:
+            # Pop to the nearest matching opener, tolerating unbalanced input
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == closers[value]:
+                    opener = stack[depth][1]
+                    del stack[depth:]
+                    pairs[opener], pairs[i] = i, opener
+                    break
+    return pairs
+
+
+class Positions:
+    """Offset to 1-based (line, column) conversion for one source."""
+
+    def __init__(self, source: str):
+        self.starts = [0] + [m.end() for m in re.finditer("\n", source)]
+
+    def at(self, offset: int) -> Tuple[int, int]:
+        line = bisect.bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
@@ -5,16 +5,26 @@ Auto Preview - Antigravity Kit
 Manages (start/stop/status) the local development server for previewing the application.
 
 Usage:
-    python .agent/scripts/auto_preview.py start [port]
+    python .agent/scripts/auto_preview.py start [port] [--timeout 60] [--no-wait]
     python .agent/scripts/auto_preview.py stop
-    python .agent/scripts/auto_preview.py status
+    python .agent/scripts/auto_preview.py status [--json]
+
+`start` picks the next free port when the requested one is busy, then polls
+the server (TCP connect + HTTP request, with backoff) until it answers and
+exits non-zero if it never does. The actual port, URL and startup latency
+are saved to .agent/preview.pid, which `status` reads back, so follow-up
+checks can run `start` and then use the URL from `status --json`.
 """
 
 import os
+import re
 import sys
 import time
 import json
+import shutil
 import signal
+import socket
+import asyncio
 import argparse
 import subprocess
 from pathlib import Path
@@ -23,6 +33,16 @@ AGENT_DIR = Path(".agent")
 PID_FILE = AGENT_DIR / "preview.pid"
 LOG_FILE = AGENT_DIR / "preview.log"
 
+HOST = "localhost"
+PORT_SCAN = 20            # ports tried after the requested one before asking the OS
+READY_TIMEOUT = 60.0      # seconds to wait for the first HTTP response
+PROBE_DELAY = 0.05        # first retry delay; doubles up to PROBE_MAX_DELAY
+PROBE_MAX_DELAY = 1.0
+CONNECT_TIMEOUT = 2.0
+
+# Dev servers print the URL they really bound, e.g. "Local:   http://localhost:5174/"
+URL_PATTERN = re.compile(r"https?://(?:localhost|127\.0\.0\.1|\[::1?\]|0\.0\.0\.0|[\d.]+):(\d+)")
+
 def get_project_root():
     return Path(".").resolve()
 
@@ -37,65 +57,214 @@ def get_start_command(root):
     pkg_file = root / "package.json"
     if not pkg_file.exists():
         return None
-    
+
     with open(pkg_file, 'r') as f:
         data = json.load(f)
-    
+
+    npm = shutil.which("npm") or "npm"
     scripts = data.get("scripts", {})
     if "dev" in scripts:
-        return ["npm", "run", "dev"]
+        return [npm, "run", "dev"], scripts["dev"]
     elif "start" in scripts:
-        return ["npm", "start"]
+        return [npm, "start"], scripts["start"]
     return None
 
-def start_server(port=3000):
-    if PID_FILE.exists():
+def port_args(script, port):
+    """CLI flags that pin the port for dev servers that ignore $PORT"""
+    if re.match(r"\s*vite(\s|$)", script):
+        return ["--port", str(port), "--strictPort"]
+    if re.match(r"\s*next\s+(dev|start)", script):
+        return ["-p", str(port)]
+    return []
+
+def read_state():
+    """State saved by start_server: {"pid", "port", "url", ...}; older files hold just the PID"""
+    try:
+        text = PID_FILE.read_text().strip()
+    except OSError:
+        return None
+    try:
+        state = json.loads(text)
+    except ValueError:
+        return None
+    return {"pid": state} if isinstance(state, int) else state
+
+def write_state(state):
+    tmp = PID_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, PID_FILE)
+
+# ============================================================================
+#  PORTS AND READINESS
+# ============================================================================
+
+def is_port_free(port):
+    """Nothing listens on the port and it can be bound on all interfaces"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.2)
+        if s.connect_ex(("127.0.0.1", port)) == 0:
+            return False
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         try:
-            pid = int(PID_FILE.read_text().strip())
-            if is_running(pid):
-                print(f"⚠️  Preview already running (PID: {pid})")
-                return
-        except:
-            pass # Invalid PID file
+            s.bind(("", port))
+        except OSError:
+            return False
+    return True
+
+def pick_port(preferred):
+    """The preferred port, else the next free one after it, else one from the OS"""
+    for port in range(preferred, preferred + PORT_SCAN + 1):
+        if port < 65536 and is_port_free(port):
+            return port
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+async def http_ready(host, port):
+    """True once the port accepts a connection and answers an HTTP request (any status)"""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        writer.write(f"GET / HTTP/1.0\r\nHost: {host}:{port}\r\n\r\n".encode())
+        await writer.drain()
+        status = await asyncio.wait_for(reader.readline(), CONNECT_TIMEOUT)
+        return status.startswith(b"HTTP/")
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+
+def logged_ports():
+    try:
+        text = LOG_FILE.read_text(errors="replace")
+    except OSError:
+        return []
+    return [int(p) for p in URL_PATTERN.findall(text)]
+
+async def wait_until_ready(process, port, timeout):
+    """
+    Poll the port (plus any port the server logs) with exponential backoff.
+    Returns the port that answered, or None on timeout or when the process exits.
+    """
+    deadline = time.monotonic() + timeout
+    delay = PROBE_DELAY
+    while True:
+        candidates = list(dict.fromkeys([port] + logged_ports()))
+        results = await asyncio.gather(*(http_ready(HOST, p) for p in candidates))
+        for candidate, ready in zip(candidates, results):
+            if ready:
+                return candidate
+        if process.poll() is not None or time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, PROBE_MAX_DELAY)
+
+# ============================================================================
+#  COMMANDS
+# ============================================================================
+
+def start_server(port=3000, timeout=READY_TIMEOUT, wait=True):
+    state = read_state()
+    if state and is_running(state["pid"]):
+        print(f"⚠️  Preview already running (PID: {state['pid']})")
+        if state.get("url"):
+            print(f"   URL: {state['url']}")
+        return 0
 
     root = get_project_root()
-    cmd = get_start_command(root)
-    
-    if not cmd:
+    found = get_start_command(root)
+
+    if not found:
         print("❌ No 'dev' or 'start' script found in package.json")
-        sys.exit(1)
-    
-    # Add port env var if needed (simple heuristic)
+        return 1
+    cmd, script = found
+
+    requested = port
+    port = pick_port(requested)
+    if port != requested:
+        print(f"⚠️  Port {requested} is in use, using {port}")
+
+    extra = port_args(script, port)
+    if extra:
+        cmd = cmd + ["--"] + extra
     env = os.environ.copy()
     env["PORT"] = str(port)
-    
+
     print(f"🚀 Starting preview on port {port}...")
-    
+
+    started = time.monotonic()
     with open(LOG_FILE, "w") as log:
+        # Own process group/session, so stop_server takes npm's children with it
+        if sys.platform == 'win32':
+            group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group = {"start_new_session": True}
         process = subprocess.Popen(
             cmd,
             cwd=str(root),
             stdout=log,
             stderr=log,
             env=env,
-            shell=True # Required for npm on windows often, or consistent path handling
+            **group
         )
-    
-    PID_FILE.write_text(str(process.pid))
-    print(f"✅ Preview started! (PID: {process.pid})")
+
+    state = {
+        "pid": process.pid,
+        "port": port,
+        "requested_port": requested,
+        "url": f"http://{HOST}:{port}",
+        "command": cmd,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "ready": False,
+        "startup_seconds": None,
+    }
+    write_state(state)
+    if not wait:
+        print(f"✅ Preview started! (PID: {process.pid}, not waiting for it to answer)")
+        print(f"   Logs: {LOG_FILE}")
+        print(f"   URL: {state['url']}")
+        return 0
+
+    ready_port = asyncio.run(wait_until_ready(process, port, timeout))
+    if ready_port is None:
+        reason = f"exited with code {process.returncode}" if process.poll() is not None else f"no response after {timeout:.0f}s"
+        print(f"❌ Preview did not become ready ({reason})")
+        print(f"   Logs: {LOG_FILE}")
+        if process.poll() is None:
+            stop_server()
+        elif PID_FILE.exists():
+            PID_FILE.unlink()
+        return 1
+
+    state.update(port=ready_port, url=f"http://{HOST}:{ready_port}", ready=True,
+                 startup_seconds=round(time.monotonic() - started, 2))
+    write_state(state)
+    print(f"✅ Preview ready in {state['startup_seconds']:.1f}s! (PID: {process.pid})")
     print(f"   Logs: {LOG_FILE}")
-    print(f"   URL: http://localhost:{port}")
+    print(f"   URL: {state['url']}")
+    return 0
 
 def stop_server():
-    if not PID_FILE.exists():
+    state = read_state()
+    if not state:
         print("ℹ️  No preview server found.")
+        if PID_FILE.exists():
+            PID_FILE.unlink()
         return
 
+    pid = state["pid"]
     try:
-        pid = int(PID_FILE.read_text().strip())
         if is_running(pid):
             # Try gentle kill first
-            os.kill(pid, signal.SIGTERM) if sys.platform != 'win32' else subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)])
+            if sys.platform == 'win32':
+                subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)])
+            else:
+                try:
+                    os.killpg(pid, signal.SIGTERM)
+                except OSError:
+                    os.kill(pid, signal.SIGTERM)  # Started by an older version, not a group leader
             print(f"🛑 Preview stopped (PID: {pid})")
         else:
             print("ℹ️  Process was not running.")
@@ -105,44 +274,47 @@ def stop_server():
         if PID_FILE.exists():
             PID_FILE.unlink()
 
-def status_server():
-    running = False
-    pid = None
-    url = "Unknown"
-    
-    if PID_FILE.exists():
-        try:
-            pid = int(PID_FILE.read_text().strip())
-            if is_running(pid):
-                running = True
-                # Heuristic for URL, strictly we should save it
-                url = "http://localhost:3000" 
-        except:
-            pass
-            
+def status_server(as_json=False):
+    state = read_state()
+    running = bool(state) and is_running(state["pid"])
+    healthy = False
+    if running and state.get("port"):
+        healthy = asyncio.run(http_ready(HOST, state["port"]))
+
+    if as_json:
+        print(json.dumps(dict(state or {}, running=running, healthy=healthy), indent=2))
+        return 0 if running else 1
+
     print("\n=== Preview Status ===")
     if running:
         print(f"✅ Status: Running")
-        print(f"🔢 PID: {pid}")
-        print(f"🌐 URL: {url} (Likely)")
+        print(f"🔢 PID: {state['pid']}")
+        print(f"🌐 URL: {state.get('url', 'Unknown')}")
+        if state.get("startup_seconds") is not None:
+            print(f"⏱️  Startup: {state['startup_seconds']:.1f}s")
+        print(f"💚 Health: {'OK' if healthy else 'Not responding'}")
         print(f"📝 Logs: {LOG_FILE}")
     else:
         print("⚪ Status: Stopped")
     print("===================\n")
+    return 0
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("action", choices=["start", "stop", "status"])
     parser.add_argument("port", nargs="?", default="3000")
-    
+    parser.add_argument("--timeout", type=float, default=READY_TIMEOUT, help="seconds to wait for the server to answer")
+    parser.add_argument("--no-wait", action="store_true", help="return right after launching the server")
+    parser.add_argument("--json", action="store_true", help="status: print the saved state as JSON")
+
     args = parser.parse_args()
-    
+
     if args.action == "start":
-        start_server(int(args.port))
+        sys.exit(start_server(int(args.port), args.timeout, not args.no_wait))
     elif args.action == "stop":
         stop_server()
     elif args.action == "status":
-        status_server()
+        sys.exit(status_server(args.json))
 
 if __name__ == "__main__":
     main()
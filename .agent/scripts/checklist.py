@@ -9,6 +9,18 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --isolate          # One subprocess per check
+    python scripts/checklist.py . --no-cache         # Re-run checks with unchanged inputs
+
+Checks run in-process through their run(project_path, context) entry point
+when they have one (see .agent/.shared/audit_kit/plugin.py), so the
+interpreter, imports and project file index are shared across checks.
+
+Core checks declare their input files in CHECK_INPUTS. When neither the
+checker nor its inputs changed since the last run, the previous result is
+reported instantly and marked (cached); see audit_kit/check_cache.py.
+Security Scan results expire after an hour, since npm audit's advisory
+database changes independently of the project.
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -26,6 +38,12 @@ import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared"))
+from audit_kit.check_cache import CheckCache
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_check
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -69,13 +87,46 @@ PERFORMANCE_CHECKS = [
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
 ]
 
+# Files each core check reads (`**`-aware globs). Checks missing here always run.
+CODE_INPUTS = ("**/*.py", "**/*.js", "**/*.jsx", "**/*.ts", "**/*.tsx", "**/*.mjs", "**/*.cjs",
+               "**/*.vue", "**/*.svelte")
+# What is installed: node_modules is never indexed, but its lockfile changes on every install
+TOOLCHAIN_INPUTS = ("package-lock.json", "yarn.lock", "pnpm-lock.yaml", "node_modules/.package-lock.json",
+                    "poetry.lock", "uv.lock")
+CHECK_INPUTS = {
+    "Security Scan": ("**",),  # code, configs, lockfiles and stray secrets anywhere
+    "Lint Check": CODE_INPUTS + TOOLCHAIN_INPUTS + ("package.json", "tsconfig*.json", "**/.eslintrc*",
+                                                    "**/eslint.config.*", "pyproject.toml", "requirements.txt",
+                                                    "mypy.ini", "setup.cfg", "ruff.toml", ".ruff.toml"),
+    "Schema Validation": ("**/prisma/schema.prisma", "**/drizzle/*.ts", "**/schema/*.ts"),
+    "Test Runner": ("**",) + TOOLCHAIN_INPUTS,
+    "UX Audit": ("**/*.tsx", "**/*.jsx", "**/*.html", "**/*.vue", "**/*.svelte", "**/*.css"),
+    "SEO Check": ("**/*.html", "**/*.htm", "**/*.jsx", "**/*.tsx"),
+}
+# Seconds a cached result stays valid for checks that also read outside the project:
+# npm audit queries the advisory database, which changes while the lockfile does not
+CHECK_MAX_AGE = {
+    "Security Scan": 3600,
+}
+
+# Failures that say nothing about the project (a missing tool, a timeout, a crashed
+# checker). They are reported but never cached, so installing the tool re-runs the check.
+ENVIRONMENT_ERRORS = ("Command not found", "command not found", ": not found", "is not recognized as",
+                      "ENOTFOUND", "ENOENT", "could not determine executable", "Timeout after",
+                      "Traceback (most recent call last)")
+
+# Checks that drive external tools always run in a subprocess, so the timeout
+# can terminate the tool's whole process tree
+ISOLATED_CHECKS = {"Lint Check", "Test Runner", "Lighthouse Audit", "Playwright E2E"}
+
 def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               context: Optional[dict] = None, isolated: bool = False) -> dict:
     """
-    Run a validation script and capture results
+    Run a validation script and capture results, in-process when it supports it
     
     Returns:
         dict with keys: name, passed, output, skipped
@@ -86,44 +137,78 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
     
     print_step(f"Running: {name}")
     
-    # Build command
-    cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
+    if context is None:
+        context = {"url": url, "shared": {}}
     
     # Run script
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
+        result = run_check(
+            script_path,
+            project_path,
+            context,
+            isolated=isolated,
+            timeout=300  # 5 minute timeout for isolated checks
         )
         
-        passed = result.returncode == 0
+        passed = result["passed"]
         
         if passed:
             print_success(f"{name}: PASSED")
         else:
             print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+            if result["error"]:
+                print(f"  Error: {result['error'][:200]}")
         
         return {
             "name": name,
             "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
+            "output": result["output"],
+            "error": result["error"],
+            "skipped": False,
+            "isolated": result["isolated"],
+            "returncode": result["returncode"]
         }
     
     except subprocess.TimeoutExpired:
         print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False,
+                "crashed": True}
     
     except Exception as e:
         print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False,
+                "crashed": True}
+
+def reached_verdict(result: dict) -> bool:
+    """True when the check judged the project, rather than failing to run at all"""
+    if result.get("skipped") or result.get("crashed") or result.get("error") == "Timeout":
+        return False
+    if result["passed"]:
+        return True
+    if result.get("returncode", 1) not in (0, 1):
+        return False  # Killed, or exited with a usage/internal error
+    text = f"{result.get('output') or ''}\n{result.get('error') or ''}"
+    return not any(marker in text for marker in ENVIRONMENT_ERRORS)
+
+def run_cached(name: str, script_path: Path, project_path: str, cache: Optional[CheckCache],
+               context: dict, isolated: bool) -> dict:
+    """Report a check's cached result if its checker and inputs are unchanged, else run it."""
+    if cache is None or name not in CHECK_INPUTS:
+        return run_script(name, script_path, project_path, context=context, isolated=isolated)
+    
+    key = cache.key(name, script_path, CHECK_INPUTS[name])
+    result = cache.get(name, key, CHECK_MAX_AGE.get(name))
+    if result is not None:
+        if result["passed"]:
+            print_success(f"{name}: PASSED (cached)")
+        else:
+            print_error(f"{name}: FAILED (cached)")
+        return result
+    
+    result = run_script(name, script_path, project_path, context=context, isolated=isolated)
+    if reached_verdict(result):
+        cache.put(name, key, result)
+    return result
 
 def print_summary(results: List[dict]):
     """Print final summary report"""
@@ -148,7 +233,8 @@ def print_summary(results: List[dict]):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        print(f"{status} {r['name']}")
+        cached = " (cached)" if r.get("cached") else ""
+        print(f"{status} {r['name']}{cached}")
     
     print()
     
@@ -172,6 +258,8 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--isolate", action="store_true", help="Run every check in its own subprocess instead of in-process")
+    parser.add_argument("--no-cache", action="store_true", help="Run every check even if its inputs are unchanged")
     
     args = parser.parse_args()
     
@@ -186,13 +274,18 @@ Examples:
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
     results = []
+    context = {"url": args.url, "file_index": project_index(project_path), "shared": {}}
+    cache = None if args.no_cache else CheckCache("checklist", context["file_index"])
     
     # Run core checks
     print_header("📋 CORE CHECKS")
     for name, script_path, required in CORE_CHECKS:
         script = project_path / script_path
-        result = run_script(name, script, str(project_path))
+        result = run_cached(name, script, str(project_path), cache, context,
+                            isolated=args.isolate or name in ISOLATED_CHECKS)
         results.append(result)
+        if cache is not None:
+            cache.save()
         
         # If required check fails, stop
         if required and not result["passed"] and not result.get("skipped"):
@@ -205,7 +298,8 @@ Examples:
         print_header("⚡ PERFORMANCE CHECKS")
         for name, script_path, required in PERFORMANCE_CHECKS:
             script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
+            result = run_script(name, script, str(project_path), args.url, context=context,
+                                isolated=args.isolate or name in ISOLATED_CHECKS)
             results.append(result)
     
     # Print summary
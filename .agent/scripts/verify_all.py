@@ -7,7 +7,27 @@ Runs COMPLETE validation including all checks + performance + E2E.
 Use this before deployment or major releases.
 
 Usage:
-    python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --url <URL> [--jobs N] [--isolate] [--live]
+    python scripts/verify_all.py . --trend [N]
+
+Independent checks run concurrently (up to --jobs at a time). A category
+waits for the categories listed in its "depends_on"; output is buffered per
+check and printed in suite order.
+
+Checkers that expose a run(project_path, context) entry point are imported
+once and run in this interpreter, sharing the project file index and other
+caches (see .agent/.shared/audit_kit/plugin.py). Checks listed in their
+category's "isolated", checkers without run() and every check under
+--isolate run in a subprocess instead: their output streams line by line
+(--live prints it as it arrives, prefixed with the check name), they get a
+timeout adapted to their recorded durations, and with --stop-on-fail the
+process trees of all running checks are terminated once a required check
+fails.
+
+Every run is recorded in .agent/.cache/verify_history.jsonl (duration,
+pass/fail, peak RSS and output size per check). The history predicts the
+total time before a run starts, flags checks that got slower, and --trend
+prints p50/p95 per check over the last N runs.
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -22,13 +42,22 @@ Includes ALL checks:
     ✅ Mobile Audit (if applicable)
 """
 
+import os
 import sys
 import subprocess
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.history import History, percentile
+from audit_kit.plugin import run_check
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -40,24 +69,29 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
-def print_header(text: str):
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.ENDC}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}\n")
+def print_header(text: str, out: Callable = print):
+    out(f"\n{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}")
+    out(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.ENDC}")
+    out(f"{Colors.BOLD}{Colors.CYAN}{'='*70}{Colors.ENDC}\n")
 
-def print_step(text: str):
-    print(f"{Colors.BOLD}{Colors.BLUE}🔄 {text}{Colors.ENDC}")
+def print_step(text: str, out: Callable = print):
+    out(f"{Colors.BOLD}{Colors.BLUE}🔄 {text}{Colors.ENDC}")
 
-def print_success(text: str):
-    print(f"{Colors.GREEN}✅ {text}{Colors.ENDC}")
+def print_success(text: str, out: Callable = print):
+    out(f"{Colors.GREEN}✅ {text}{Colors.ENDC}")
 
-def print_warning(text: str):
-    print(f"{Colors.YELLOW}⚠️  {text}{Colors.ENDC}")
+def print_warning(text: str, out: Callable = print):
+    out(f"{Colors.YELLOW}⚠️  {text}{Colors.ENDC}")
 
-def print_error(text: str):
-    print(f"{Colors.RED}❌ {text}{Colors.ENDC}")
+def print_error(text: str, out: Callable = print):
+    out(f"{Colors.RED}❌ {text}{Colors.ENDC}")
+
+# Timeout for isolated checks without enough history to adapt it
+DEFAULT_TIMEOUT = 600
 
 # Complete verification suite
+# "isolated" lists checks that drive external tools: they run as a subprocess,
+# so a timeout or a cancel can terminate the tool's whole process tree.
 VERIFICATION_SUITE = [
     # P0: Security (CRITICAL)
     {
@@ -71,6 +105,7 @@ VERIFICATION_SUITE = [
     # P1: Code Quality (CRITICAL)
     {
         "category": "Code Quality",
+        "isolated": ["Lint Check"],
         "checks": [
             ("Lint Check", ".agent/skills/lint-and-validate/scripts/lint_runner.py", True),
             ("Type Coverage", ".agent/skills/lint-and-validate/scripts/type_coverage.py", False),
@@ -88,6 +123,7 @@ VERIFICATION_SUITE = [
     # P3: Testing
     {
         "category": "Testing",
+        "isolated": ["Test Suite"],
         "checks": [
             ("Test Suite", ".agent/skills/testing-patterns/scripts/test_runner.py", False),
         ]
@@ -115,6 +151,7 @@ VERIFICATION_SUITE = [
     {
         "category": "Performance",
         "requires_url": True,
+        "isolated": ["Lighthouse Audit", "Bundle Analysis"],
         "checks": [
             ("Lighthouse Audit", ".agent/skills/performance-profiling/scripts/lighthouse_audit.py", True),
             ("Bundle Analysis", ".agent/skills/performance-profiling/scripts/bundle_analyzer.py", False),
@@ -122,9 +159,12 @@ VERIFICATION_SUITE = [
     },
     
     # P7: E2E Testing (requires URL)
+    # Runs after Performance so browser load does not skew Lighthouse timings
     {
         "category": "E2E Testing",
         "requires_url": True,
+        "depends_on": ["Performance"],
+        "isolated": ["Playwright E2E"],
         "checks": [
             ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
         ]
@@ -147,58 +187,277 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               out: Callable = print, context: Optional[dict] = None, isolated: bool = False,
+               timeout: float = DEFAULT_TIMEOUT, on_line: Optional[Callable] = None) -> dict:
+    """
+    Run validation script, in-process when it supports it (see audit_kit.plugin).
+    Status lines go to `out` (print, or a buffer's append); on_line gets
+    each line of the check's own output as it is produced.
+    """
     if not script_path.exists():
-        print_warning(f"{name}: Script not found, skipping")
+        print_warning(f"{name}: Script not found, skipping", out)
         return {"name": name, "passed": True, "skipped": True, "duration": 0}
     
-    print_step(f"Running: {name}")
+    print_step(f"Running: {name}", out)
     start_time = datetime.now()
     
-    # Build command
-    cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
+    if context is None:
+        context = {"url": url, "shared": {}}
     
     # Run
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout for slow checks
+        result = run_check(
+            script_path,
+            project_path,
+            context,
+            isolated=isolated,
+            timeout=timeout,
+            on_line=on_line
         )
         
         duration = (datetime.now() - start_time).total_seconds()
-        passed = result.returncode == 0
+        if result.get("cancelled"):
+            print_warning(f"{name}: CANCELLED ({duration:.1f}s)", out)
+            return {"name": name, "passed": False, "skipped": True, "cancelled": True,
+                    "duration": duration, "output": result["output"], "error": result["error"]}
+        passed = result["passed"]
         
         if passed:
-            print_success(f"{name}: PASSED ({duration:.1f}s)")
+            print_success(f"{name}: PASSED ({duration:.1f}s)", out)
         else:
-            print_error(f"{name}: FAILED ({duration:.1f}s)")
-            if result.stderr:
-                print(f"  {result.stderr[:300]}")
+            print_error(f"{name}: FAILED ({duration:.1f}s)", out)
+            if result["error"]:
+                out(f"  {result['error'][:300]}")
         
         return {
             "name": name,
             "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
+            "output": result["output"],
+            "error": result["error"],
             "skipped": False,
+            "isolated": result["isolated"],
+            "peak_rss": result.get("peak_rss"),
             "duration": duration
         }
     
-    except subprocess.TimeoutExpired:
+    except subprocess.TimeoutExpired as e:
         duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout"}
+        print_error(f"{name}: TIMEOUT (>{timeout:.0f}s)", out)
+        return {"name": name, "passed": False, "skipped": False, "duration": duration,
+                "error": f"Timeout after {timeout:.0f}s", "output": e.output or ""}
     
     except Exception as e:
         duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: ERROR - {str(e)}")
+        print_error(f"{name}: ERROR - {str(e)}", out)
         return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
 
+def plan_checks(project_path: Path, url: Optional[str], no_e2e: bool, isolate: bool = False) -> List[dict]:
+    """Flatten VERIFICATION_SUITE into check jobs, in suite order."""
+    jobs = []
+    for suite in VERIFICATION_SUITE:
+        category = suite["category"]
+        
+        # Skip if requires URL and not provided
+        if suite.get("requires_url", False) and not url:
+            continue
+        
+        # Skip E2E if flag set
+        if no_e2e and category == "E2E Testing":
+            continue
+        
+        for name, script_path, required in suite["checks"]:
+            jobs.append({
+                "category": category,
+                "name": name,
+                "script": project_path / script_path,
+                "required": required,
+                "depends_on": suite.get("depends_on", []),
+                "isolated": isolate or name in suite.get("isolated", []),
+                "log": [],
+                "result": None,
+            })
+    return jobs
+
+def run_suite(jobs: List[dict], project_path: Path, url: Optional[str],
+              workers: int, stop_on_fail: bool, context: Optional[dict] = None,
+              timeouts: Optional[Dict[str, float]] = None, live: bool = False) -> bool:
+    """
+    Run jobs concurrently, respecting category dependencies.
+    Each job's output is buffered and printed in suite order; with live set,
+    check output is also echoed as it arrives, prefixed with the check name.
+    Returns False if a required check failed with stop_on_fail set, after
+    cancelling the checks still running.
+    """
+    if context is None:
+        context = {"url": url, "shared": {}}
+    cancel = context.setdefault("cancel", threading.Event())
+    timeouts = timeouts or {}
+    live_lock = threading.Lock()
+    remaining: Dict[str, int] = {}
+    for job in jobs:
+        remaining[job["category"]] = remaining.get(job["category"], 0) + 1
+    
+    pending = list(jobs)
+    running = {}
+    stopped = False
+    printed = 0
+    current_category = None
+    
+    def flush(final: bool = False):
+        # Print every finished job whose predecessors have all been printed
+        nonlocal printed, current_category
+        while printed < len(jobs):
+            job = jobs[printed]
+            if job["result"] is None and not final:
+                break
+            printed += 1
+            if job["result"] is None:
+                continue  # Never started (stopped early)
+            if job["category"] != current_category:
+                current_category = job["category"]
+                print_header(f"📋 {current_category.upper()}")
+            for line in job["log"]:
+                print(line)
+    
+    def live_printer(name: str) -> Optional[Callable]:
+        if not live:
+            return None
+        def echo(line: str):
+            with live_lock:
+                print(f"{Colors.CYAN}[{name}]{Colors.ENDC} {line}", flush=True)
+        return echo
+    
+    def run_job(job: dict) -> dict:
+        return run_script(job["name"], job["script"], str(project_path), url, out=job["log"].append,
+                          context=context, isolated=job["isolated"],
+                          timeout=timeouts.get(job["name"], DEFAULT_TIMEOUT),
+                          on_line=live_printer(job["name"]))
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            if not stopped:
+                for job in list(pending):
+                    if len(running) >= workers:
+                        break
+                    if all(remaining.get(dep, 0) == 0 for dep in job["depends_on"]):
+                        pending.remove(job)
+                        running[pool.submit(run_job, job)] = job
+            if not running:
+                break
+            
+            try:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            except KeyboardInterrupt:
+                cancel.set()  # Take the running checks' process trees down with us
+                raise
+            for future in finished:
+                job = running.pop(future)
+                job["result"] = future.result()
+                job["result"]["category"] = job["category"]
+                remaining[job["category"]] -= 1
+                
+                # Stop on critical failure if flag set
+                result = job["result"]
+                if stop_on_fail and job["required"] and not result["passed"] and not result.get("skipped"):
+                    if not stopped:
+                        job["log"].append(f"{Colors.RED}❌ CRITICAL: {job['name']} failed. Stopping verification.{Colors.ENDC}")
+                    stopped = True
+                    cancel.set()
+            flush()
+    
+    flush(final=True)
+    return not stopped
+
+def predict_duration(jobs: List[dict], estimates: Dict[str, float], workers: int) -> Tuple[float, int]:
+    """
+    Replay run_suite's scheduling with historical median durations.
+    Returns (predicted seconds, number of checks without history).
+    """
+    remaining: Dict[str, int] = {}
+    for job in jobs:
+        remaining[job["category"]] = remaining.get(job["category"], 0) + 1
+    
+    pending = list(jobs)
+    running = []  # (finish time, job)
+    clock = 0.0
+    while pending or running:
+        for job in list(pending):
+            if len(running) >= workers:
+                break
+            if all(remaining.get(dep, 0) == 0 for dep in job["depends_on"]):
+                pending.remove(job)
+                running.append((clock + estimates.get(job["name"], 0.0), job))
+        if not running:
+            break
+        running.sort(key=lambda item: item[0])
+        clock, job = running.pop(0)
+        remaining[job["category"]] -= 1
+    
+    unknown = sum(1 for job in jobs if job["name"] not in estimates and job["script"].exists())
+    return clock, unknown
+
+def history_record(results: List[dict], start_time: datetime, workers: int) -> dict:
+    """One history line for this run"""
+    checks = []
+    for r in results:
+        output_bytes = len((r.get("output") or "").encode("utf-8")) + len((r.get("error") or "").encode("utf-8"))
+        checks.append({
+            "name": r["name"],
+            "category": r.get("category"),
+            "passed": r["passed"],
+            "skipped": r.get("skipped", False),
+            "duration": round(r.get("duration", 0), 3),
+            "peak_rss": r.get("peak_rss"),
+            "output_bytes": output_bytes,
+            "isolated": r.get("isolated"),
+        })
+    return {
+        "started": start_time.isoformat(timespec="seconds"),
+        "workers": workers,
+        "total": round((datetime.now() - start_time).total_seconds(), 3),
+        "checks": checks,
+    }
+
+def format_bytes(size: Optional[int]) -> str:
+    if not size:
+        return "-"
+    if size >= 1048576:
+        return f"{size / 1048576:.0f} MiB"
+    return f"{size / 1024:.0f} KiB" if size >= 1024 else f"{size} B"
+
+def print_trend(history: History, last: int, threshold: float):
+    """Print p50/p95 per check over the last runs, flagging regressions"""
+    print_header(f"📈 CHECK DURATION TREND (last {last} runs)")
+    rows = history.trend(last, threshold)
+    if not rows:
+        print_warning("No recorded runs for this project yet")
+        return
+    
+    totals = [run["total"] for run in history.runs[-last:]]
+    print(f"Runs: {len(totals)}   Total p50: {percentile(totals, 50):.1f}s   "
+          f"p95: {percentile(totals, 95):.1f}s\n")
+    print(f"{Colors.BOLD}{'Check':<22} {'Runs':>4} {'p50':>8} {'p95':>8} {'Latest':>8} {'Pass':>5} {'Peak RSS':>9} {'Output':>8}{Colors.ENDC}")
+    for row in rows:
+        line = (f"{row['name']:<22} {row['runs']:>4} {row['p50']:>7.1f}s {row['p95']:>7.1f}s "
+                f"{row['latest']:>7.1f}s {row['pass_rate']:>5.0%} {format_bytes(row['peak_rss']):>9} "
+                f"{format_bytes(row['output_bytes']):>8}")
+        if row["regressed"]:
+            print(f"{Colors.YELLOW}{line}  ⚠️  +{row['latest'] / row['baseline'] - 1:.0%} vs median{Colors.ENDC}")
+        else:
+            print(line)
+    print()
+
+def print_regressions(history: History, last: int, threshold: float):
+    """Warn about checks that ran slower than their recent median"""
+    slower = [row for row in history.trend(last, threshold) if row["regressed"]]
+    if not slower:
+        return
+    print(f"{Colors.BOLD}{Colors.YELLOW}⏱️  SLOWER THAN USUAL (>{threshold:.0%} over median):{Colors.ENDC}")
+    for row in slower:
+        print(f"  {row['name']}: {row['latest']:.1f}s (median {row['baseline']:.1f}s over {row['runs'] - 1} runs)")
+    print()
+
 def print_final_report(results: List[dict], start_time: datetime):
     """Print comprehensive final report"""
     total_duration = (datetime.now() - start_time).total_seconds()
@@ -215,7 +474,9 @@ def print_final_report(results: List[dict], start_time: datetime):
     print(f"Total Checks: {total}")
     print(f"{Colors.GREEN}✅ Passed: {passed}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed}{Colors.ENDC}")
-    print(f"{Colors.YELLOW}⏭️  Skipped: {skipped}{Colors.ENDC}")
+    cancelled = sum(1 for r in results if r.get("cancelled"))
+    cancelled_str = f" ({cancelled} cancelled)" if cancelled else ""
+    print(f"{Colors.YELLOW}⏭️  Skipped: {skipped}{cancelled_str}{Colors.ENDC}")
     print()
     
     # Category breakdown
@@ -228,7 +489,9 @@ def print_final_report(results: List[dict], start_time: datetime):
             print(f"\n{Colors.BOLD}{Colors.CYAN}{current_category}:{Colors.ENDC}")
         
         # Print result
-        if r.get("skipped"):
+        if r.get("cancelled"):
+            status = f"{Colors.YELLOW}⏹️ {Colors.ENDC}"
+        elif r.get("skipped"):
             status = f"{Colors.YELLOW}⏭️ {Colors.ENDC}"
         elif r["passed"]:
             status = f"{Colors.GREEN}✅{Colors.ENDC}"
@@ -236,6 +499,8 @@ def print_final_report(results: List[dict], start_time: datetime):
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
         duration_str = f"({r.get('duration', 0):.1f}s)" if not r.get("skipped") else ""
+        if r.get("cancelled"):
+            duration_str = f"(cancelled after {r.get('duration', 0):.1f}s)"
         print(f"  {status} {r['name']} {duration_str}")
     
     print()
@@ -271,11 +536,23 @@ Examples:
         """
     )
     parser.add_argument("project", help="Project path to validate")
-    parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
+    parser.add_argument("--url", help="URL for performance & E2E checks (required unless --trend)")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
     parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Maximum checks running at once (1 = sequential)")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Run every check in its own subprocess instead of in-process")
+    parser.add_argument("--live", action="store_true",
+                        help="Print check output as it arrives, prefixed with the check name")
+    parser.add_argument("--trend", type=int, nargs="?", const=20, metavar="N",
+                        help="Print per-check duration trend over the last N runs (default 20) and exit")
+    parser.add_argument("--regression", type=float, default=25, metavar="PCT",
+                        help="Flag checks more than PCT%% slower than their median (default 25)")
     
     args = parser.parse_args()
+    if args.trend is None and not args.url:
+        parser.error("--url is required")
     
     project_path = Path(args.project).resolve()
     
@@ -283,43 +560,44 @@ Examples:
         print_error(f"Project path does not exist: {project_path}")
         sys.exit(1)
     
+    history = History(project_path)
+    threshold = args.regression / 100
+    if args.trend is not None:
+        print_trend(history, max(1, args.trend), threshold)
+        sys.exit(0)
+    
     print_header("🚀 ANTIGRAVITY KIT - FULL VERIFICATION SUITE")
     print(f"Project: {project_path}")
     print(f"URL: {args.url}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     start_time = datetime.now()
-    results = []
     
     # Run all verification categories
-    for suite in VERIFICATION_SUITE:
-        category = suite["category"]
-        requires_url = suite.get("requires_url", False)
-        
-        # Skip if requires URL and not provided
-        if requires_url and not args.url:
-            continue
-        
-        # Skip E2E if flag set
-        if args.no_e2e and category == "E2E Testing":
-            continue
-        
-        print_header(f"📋 {category.upper()}")
-        
-        for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+    # Shared by every in-process check: one file index, one cache namespace
+    context = {"url": args.url, "file_index": project_index(project_path), "shared": {}}
+    
+    jobs = plan_checks(project_path, args.url, args.no_e2e, args.isolate)
+    workers = max(1, args.jobs)
+    estimates = history.estimates()
+    if estimates:
+        predicted, unknown = predict_duration(jobs, estimates, workers)
+        note = f", {unknown} check(s) without history" if unknown else ""
+        print(f"Predicted: ~{predicted:.0f}s (median of last {min(len(history.runs), 20)} runs{note})")
+    
+    completed = run_suite(jobs, project_path, args.url, workers, args.stop_on_fail, context,
+                          timeouts=history.timeouts(DEFAULT_TIMEOUT), live=args.live)
+    results = [job["result"] for job in jobs if job["result"] is not None]
+    history.record(history_record(results, start_time, workers))
+    
+    if not completed:
+        print_final_report(results, start_time)
+        print_regressions(history, 20, threshold)
+        sys.exit(1)
     
     # Print final report
     all_passed = print_final_report(results, start_time)
+    print_regressions(history, 20, threshold)
     
     sys.exit(0 if all_passed else 1)
 
@@ -8,6 +8,11 @@ import json
 import re
 from pathlib import Path
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -27,11 +32,9 @@ def find_api_files(project_path: Path) -> list:
         "**/openapi.json", "**/openapi.yaml"
     ]
     
-    files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    files = project_index(project_path).glob(*patterns)
     
-    # Exclude node_modules, etc.
+    # Exclude build output, etc.
     return [f for f in files if not any(x in str(f) for x in ['node_modules', '.git', 'dist', 'build', '__pycache__'])]
 
 def check_openapi_spec(file_path: Path) -> dict:
@@ -159,8 +162,9 @@ def check_api_code(file_path: Path) -> dict:
     
     return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'code'}
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    target = argv[1] if len(argv) > 1 else "."
     project_path = Path(target)
     
     print("\n" + "=" * 60)
@@ -207,5 +211,9 @@ def main():
         print("[X] Fix critical issues before deployment")
         sys.exit(1)
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
 if __name__ == "__main__":
     main()
@@ -19,6 +19,11 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -29,14 +34,15 @@ except:
 def find_schema_files(project_path: Path) -> list:
     """Find database schema files."""
     schemas = []
+    index = project_index(project_path)
     
     # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
+    prisma_files = index.glob('**/prisma/schema.prisma')
     schemas.extend([('prisma', f) for f in prisma_files])
     
     # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
+    drizzle_files = index.glob('**/drizzle/*.ts')
+    drizzle_files.extend(index.glob('**/schema/*.ts'))
     for f in drizzle_files:
         if 'schema' in f.name.lower() or 'table' in f.name.lower():
             schemas.append(('drizzle', f))
@@ -91,8 +97,9 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    project_path = Path(argv[1] if len(argv) > 1 else ".").resolve()
     
     print(f"\n{'='*60}")
     print(f"[SCHEMA VALIDATOR] Database Schema Validation")
@@ -168,5 +175,10 @@ def main():
     sys.exit(0)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
+
 if __name__ == "__main__":
     main()
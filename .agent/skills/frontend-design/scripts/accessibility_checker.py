@@ -4,7 +4,7 @@ Accessibility Checker - WCAG compliance audit
 Checks HTML files for accessibility issues.
 
 Usage:
-    python accessibility_checker.py <project_path>
+    python accessibility_checker.py <project_path> [--profile[=trace.json]]
 
 Checks:
     - Form labels
@@ -16,10 +16,16 @@ Checks:
 
 import sys
 import json
-import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.page_model import load_pages
+from audit_kit.profiler import profiler_from_argv
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -29,87 +35,91 @@ except:
 
 def find_html_files(project_path: Path) -> list:
     """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
     skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
+    files = project_index(project_path).paths(exts={'.html', '.jsx', '.tsx'}, skip_dirs=skip_dirs)
     
     return files[:50]
 
 
-def check_accessibility(file_path: Path) -> list:
+def _attr(attrs: dict, name: str) -> str:
+    """Attribute value as lowercase text ('' when absent, 'true' when bare)."""
+    value = attrs.get(name)
+    if value is None:
+        return ''
+    return 'true' if value is True else str(value).strip('{}"\' ').lower()
+
+
+def check_accessibility(file_path: Path, doc: dict = None) -> list:
     """Check a single file for accessibility issues."""
     issues = []
     
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        
-        # Check for form inputs without labels
-        inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
-        for inp in inputs:
-            if 'type="hidden"' not in inp.lower():
-                if 'aria-label' not in inp.lower() and 'id=' not in inp.lower():
-                    issues.append("Input without label or aria-label")
-                    break
-        
-        # Check for buttons without accessible text
-        buttons = re.findall(r'<button[^>]*>[^<]*</button>', content, re.IGNORECASE)
-        for btn in buttons:
-            # Check if button has text content or aria-label
-            if 'aria-label' not in btn.lower():
-                text = re.sub(r'<[^>]+>', '', btn)
-                if not text.strip():
-                    issues.append("Button without accessible text")
-                    break
-        
-        # Check for missing lang attribute
-        if '<html' in content.lower() and 'lang=' not in content.lower():
-            issues.append("Missing lang attribute on <html>")
-        
-        # Check for missing skip link
-        if '<main' in content.lower() or '<body' in content.lower():
-            if 'skip' not in content.lower() and '#main' not in content.lower():
-                issues.append("Consider adding skip-to-main-content link")
-        
-        # Check for click handlers without keyboard support
-        onclick_count = content.lower().count('onclick=')
-        onkeydown_count = content.lower().count('onkeydown=') + content.lower().count('onkeyup=')
-        if onclick_count > 0 and onkeydown_count == 0:
-            issues.append("onClick without keyboard handler (onKeyDown)")
-        
-        # Check for tabIndex misuse
-        if 'tabindex=' in content.lower():
-            if 'tabindex="-1"' not in content.lower() and 'tabindex="0"' not in content.lower():
-                positive_tabindex = re.findall(r'tabindex="([1-9]\d*)"', content, re.IGNORECASE)
-                if positive_tabindex:
-                    issues.append("Avoid positive tabIndex values")
-        
-        # Check for autoplay media
-        if 'autoplay' in content.lower():
-            if 'muted' not in content.lower():
-                issues.append("Autoplay media should be muted")
-        
-        # Check for role usage
-        if 'role="button"' in content.lower():
-            # Divs with role button should have tabindex
-            div_buttons = re.findall(r'<div[^>]*role="button"[^>]*>', content, re.IGNORECASE)
-            for div in div_buttons:
-                if 'tabindex' not in div.lower():
-                    issues.append("role='button' without tabindex")
-                    break
-        
-    except Exception as e:
-        issues.append(f"Error reading file: {str(e)[:50]}")
+    if doc is None:
+        doc = load_pages([file_path])[0]
+    if 'error' in doc:
+        return [f"Error reading file: {doc['error'][:50]}"]
+    
+    tags = [(tag, attrs) for tag, attrs, _ in doc['elements']]
+    
+    # Check for form inputs without labels
+    for tag, attrs in tags:
+        if tag == 'input' and _attr(attrs, 'type') != 'hidden':
+            if 'aria-label' not in attrs and 'id' not in attrs:
+                issues.append("Input without label or aria-label")
+                break
+    
+    # Check for buttons without accessible text
+    for button in doc['buttons']:
+        if 'aria-label' not in button['attrs'] and not button['text'] and not button['children']:
+            issues.append("Button without accessible text")
+            break
+    
+    # Check for missing lang attribute
+    if any(tag == 'html' and 'lang' not in attrs for tag, attrs in tags):
+        issues.append("Missing lang attribute on <html>")
+    
+    # Check for missing skip link
+    if any(tag in ('main', 'body') for tag, _ in tags):
+        has_skip = any(str(link['href'] or '').startswith('#main') or 'skip' in link['text'].lower()
+                       for link in doc['links'])
+        has_skip = has_skip or any('skip' in _attr(attrs, 'class') or 'skip' in _attr(attrs, 'classname')
+                                   for _, attrs in tags)
+        if not has_skip:
+            issues.append("Consider adding skip-to-main-content link")
+    
+    # Check for click handlers without keyboard support
+    onclick_count = sum(1 for _, attrs in tags if 'onclick' in attrs)
+    onkey_count = sum(1 for _, attrs in tags if 'onkeydown' in attrs or 'onkeyup' in attrs)
+    if onclick_count > 0 and onkey_count == 0:
+        issues.append("onClick without keyboard handler (onKeyDown)")
+    
+    # Check for tabIndex misuse
+    if any(_attr(attrs, 'tabindex').isdigit() and int(_attr(attrs, 'tabindex')) > 0 for _, attrs in tags):
+        issues.append("Avoid positive tabIndex values")
+    
+    # Check for autoplay media
+    if any('autoplay' in attrs and 'muted' not in attrs for _, attrs in tags):
+        issues.append("Autoplay media should be muted")
+    
+    # Check for role usage: divs with role button should have tabindex
+    for tag, attrs in tags:
+        if tag == 'div' and _attr(attrs, 'role') == 'button' and 'tabindex' not in attrs:
+            issues.append("role='button' without tabindex")
+            break
     
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    project_path = Path(args[0] if args else ".").resolve()
+    profiler = profiler_from_argv("accessibility_checker", argv)
+    if profiler:
+        module = sys.modules[__name__]
+        profiler.install(module, module, "check_accessibility")
+        # The page regexes run inside page_model, so time the parse and check stages
+        profiler.time_stage(module, "load_pages", "parse (page_model)")
+        profiler.time_stage(module, "check_accessibility", "check")
     
     print(f"\n{'='*60}")
     print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
@@ -137,8 +147,9 @@ def main():
     # Check each file
     all_issues = []
     
-    for f in files:
-        issues = check_accessibility(f)
+    # Page models are shared with the SEO and GEO checkers
+    for f, doc in zip(files, load_pages(files)):
+        issues = check_accessibility(f, doc)
         if issues:
             all_issues.append({
                 "file": str(f.name),
@@ -179,5 +190,10 @@ def main():
     sys.exit(0 if passed else 1)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
+
 if __name__ == "__main__":
     main()
@@ -95,160 +95,419 @@ import re
 import json
 from pathlib import Path
 
+# Shared audit engine lives in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit import regex_guard, rule_engine
+from audit_kit.batch import ResultCache, audit_files, auditor_version, merge_results
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+from audit_kit.profiler import profiler_from_argv
+from audit_kit.rule_engine import RuleSet
+
+I = re.IGNORECASE
+
+# Rules: (id, pattern, flags[, severity, message])
+# Rules without a severity are probes that feed a check's decision.
+UX_RULES = [
+    # Common flags
+    ("content.long_text", r'<p|<div.*class=.*text|article|<span.*text', I),
+    ("content.form", r'<form|<input|password|credit|card|payment', I),
+    ("content.complex_elements", r'<input|<select|<textarea|<option', I),
+
+    # 1. Psychology laws
+    ("hicks.nav_items", r'<NavLink|<Link|<a\s+href|nav-item', I, "issue",
+     "[Hick's Law] {filename}: {count} nav items (Max 7)"),
+    ("fitts.px_height", r'height:\s*([0-3]\d)px', 0, "warning",
+     "[Fitts' Law] {filename}: Small targets (< 44px)"),
+    ("fitts.tw_height", r'h-[1-9]\b|h-10\b', 0),
+    ("miller.form_fields", r'<input|<select|<textarea', I, "warning",
+     "[Miller's Law] {filename}: Complex form ({count} fields)"),
+    ("miller.multi_step", r'step|wizard|stage', I),
+    ("von_restorff.primary_cta", r'primary|bg-primary|Button.*primary|variant=["\']primary', I, "warning",
+     "[Von Restorff] {filename}: No primary CTA"),
+    ("serial_position.nav_labels", r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', I, "warning",
+     "[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end."),
+
+    # 1.5 Emotional design
+    ("visceral.hero", r'hero|<h1|banner', I, "warning",
+     "[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations."),
+    ("visceral.gradient", r'gradient|linear-gradient|radial-gradient', 0),
+    ("visceral.animation", r'@keyframes|transition:|animate-', 0),
+    ("visual.background", r'background:|bg-', 0),
+    ("behavioral.feedback", r'transition|animate|hover:|focus:|disabled|loading|spinner', I, "warning",
+     "[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states."),
+    ("behavioral.state_change", r'setState|useState|disabled|loading', 0),
+    ("reflective.brand_story", r'about|story|mission|values|why we|our journey|testimonials', I, "warning",
+     "[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section."),
+
+    # 1.6 Trust building
+    ("trust.security_signals", r'ssl|secure|encrypt|lock|padlock|https', I, "warning",
+     "[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon."),
+    ("trust.checkout", r'checkout|payment', I),
+    ("trust.social_proof", r'review|testimonial|rating|star|trust|trusted by|customer|logo', I, "warning",
+     "[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos."),
+    ("trust.footer", r'footer|<footer', I),
+    ("trust.authority", r'certif|award|media|press|featured|as seen in', I, "warning",
+     "[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions."),
+
+    # 1.7 Cognitive load
+    ("cognitive.progressive_disclosure",
+     r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', I, "warning",
+     "[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle."),
+    ("cognitive.colors", r'#[0-9a-fA-F]{3,6}|rgb|hsl', 0, "warning",
+     "[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load."),
+    ("visual.border", r'border:|border-', 0),
+    ("cognitive.labels", r'<label|placeholder|aria-label', I, "issue",
+     "[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity."),
+
+    # 1.8 Persuasive design
+    ("persuasion.defaults", r'checked|selected|default|value=["\'].*["\']', 0),
+    ("persuasion.radio_inputs", r'type=["\']radio', I, "warning",
+     "[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option."),
+    ("persuasion.price", r'price|pricing|cost|\$\d+', I),
+    ("persuasion.anchor", r'original|was|strike|del|save \d+%', I, "warning",
+     "[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value."),
+    ("persuasion.social", r'join|subscriber|member|user', I),
+    ("persuasion.social_count", r'\d+[+kmb]|\d+,\d+', 0, "warning",
+     "[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format."),
+    ("persuasion.progress", r'progress|step \d+|complete|%|bar', I, "warning",
+     "[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'."),
+
+    # 2. Typography
+    ("typography.font_face", r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', I, "issue",
+     "[Typography] {filename}: {count} font families detected. Limit to 2-3 for cohesion."),
+    ("typography.google_fonts", r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', I),
+    ("typography.font_family", r'font-family:\s*([^;]+)', I),
+    ("typography.measure", r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', 0, "warning",
+     "[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch]."),
+    ("typography.text_elements", r'<p|<span|<div.*text|<h[1-6]', I),
+    ("typography.leading", r'leading-|line-height:', 0, "warning",
+     "[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3"),
+    ("typography.heading_text", r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', I),
+    ("typography.line_heights", r'(?:leading-|line-height:\s*)([\d.]+)', 0, "warning",
+     "[Typography] {filename}: Heading has line-height {value} (>1.3). Headings should be tighter (1.1-1.3)."),
+    ("typography.uppercase", r'uppercase|text-transform:\s*uppercase', I),
+    ("typography.tracking", r'tracking-|letter-spacing:', 0, "warning",
+     "[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing."),
+    ("typography.display_size", r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', 0),
+    ("typography.tracking_tight", r'tracking-tight|letter-spacing:\s*-[0-9]', 0, "warning",
+     "[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing."),
+    ("typography.weights",
+     r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', I,
+     "warning",
+     "[Typography] {filename}: Adjacent font weights ({first}/{second}). Skip at least 2 levels for contrast."),
+    ("typography.weight_levels",
+     r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', I,
+     "warning", "[Typography] {filename}: {count} font weights. Limit to 3-4 per page."),
+    ("typography.font_sizes", r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', 0),
+    ("typography.clamp", r'clamp\(|responsive:', 0, "warning",
+     "[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)"),
+    ("typography.headings", r'<(h[1-6])', I, "warning",
+     "[Typography] {filename}: Skipped heading level (h{current} -> h{next}). Maintain sequential hierarchy."),
+    ("typography.missing_h1", r'<(h[1-6])', I, "warning",
+     "[Typography] {filename}: No h1 found. Each page should have one primary heading."),
+    ("typography.scale", r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', 0, "warning",
+     "[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third)."),
+    ("typography.paragraphs", r'<p[^>]*>([^<]+)</p>', I, "warning",
+     "[Typography] {filename}: Long paragraph detected ({count} words). Break into 3-4 line chunks for readability."),
+    ("typography.subheadings", r'<h[2-6]', I, "warning",
+     "[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text."),
+
+    # 3. Visual effects
+    ("visual.glass_background", r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', 0, "warning",
+     "[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)"),
+    ("visual.motion", r'@keyframes|transition:', 0),
+    ("performance.layout_props", r'width|height|top|left|right|bottom|margin|padding', 0, "warning",
+     "[Performance] {filename}: Animating expensive properties ({props}). Use transform/opacity where possible."),
+    ("a11y.reduced_motion", r'prefers-reduced-motion', 0, "warning",
+     "[Accessibility] {filename}: Animations found without prefers-reduced-motion check"),
+    ("visual.box_shadow", r'box-shadow:\s*([^;]+)', 0, "warning",
+     "[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism."),
+    ("visual.shadow_y_offset", r'\d+px\s+[1-9]\d*px', 0),
+    ("visual.neomorphism", r'box-shadow:\s*([^;]+)', 0, "warning",
+     "[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility."),
+    ("visual.shadow_opacity", r'rgba?\([^)]+,\s*([\d.]+)\)', 0, "warning",
+     "[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy."),
+    ("visual.gradient", r'gradient|linear-gradient|radial-gradient|conic-gradient', 0),
+    ("visual.gradient_count", r'gradient', I, "warning",
+     "[Visual] {filename}: Many gradients detected ({count}). Ensure this serves purpose, not decoration."),
+    ("visual.hero_background", r'background:|bg-', 0, "warning",
+     "[Visual] {filename}: Hero section without visual interest. Consider gradient for depth."),
+    ("visual.border_declarations", r'border:', 0, "warning",
+     "[Visual] {filename}: Many border declarations ({count}). Simplify for cleaner look."),
+    ("visual.text_shadow", r'text-shadow:', 0, "warning",
+     "[Visual] {filename}: Text glow effect detected. Ensure readability is maintained."),
+    ("visual.glow", r'box-shadow:\s*[^;]*0\s+0\s+', 0, "warning",
+     "[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only."),
+    ("visual.images", r'<img|background-image:|bg-\[url', 0),
+    ("visual.overlay", r'overlay|rgba\(0|gradient.*transparent|::after|::before', 0, "warning",
+     "[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability."),
+    ("performance.will_change", r'will-change:\s*([^;]+)', 0, "issue",
+     "[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity."),
+    ("performance.will_change_count", r'will-change:', 0, "warning",
+     "[Performance] {filename}: Many will-change declarations ({count}). Use sparingly, only for heavy animations."),
+    ("visual.blur", r'backdrop-filter|blur\(', 0, "warning",
+     "[Visual] {filename}: Many visual effects ({count}). Ensure effects serve purpose, not decoration."),
+    ("visual.flat", r'backdrop-filter|blur\(', 0, "warning",
+     "[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy."),
+
+    # 4. Color system
+    ("color.purple",
+     r'#8B5CF6|#A855F7|#9333EA|#7C3AED|#6D28D9|#A78BFA|#C4B5FD|#DDD6FE|#EDE9FE|purple|violet|fuchsia|magenta|lavender',
+     I, "issue",
+     "[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead."),
+    ("color.hex", r'#[0-9a-fA-F]{3,6}', 0),
+    ("color.hsl", r'hsl\(', 0),
+    ("color.background_declarations", r'(?:background|bg-|bg\[)([^;}\s]+)', 0),
+    ("color.text_declarations", r'(?:color|text-)([^;}\s]+)', 0),
+    ("color.distinct_hex", r'#[0-9a-fA-F]{6}', 0, "warning",
+     "[Color] {filename}: {count} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%)."),
+    ("color.hsl_hues", r'hsl\((\d+),\s*\d+%,\s*\d+%\)', 0, "warning",
+     "[Color] {filename}: Monochromatic palette detected (hue variance: {variance}deg). Ensure adequate contrast."),
+    ("color.pure_black", r'color:\s*#000000|#000\b', 0, "warning",
+     "[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode."),
+    ("color.pure_white", r'background:\s*#ffffff|#fff\b', 0, "warning",
+     "[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain."),
+    ("color.dark_mode", r'dark:\s*|dark:', 0),
+    ("color.light_contrast", r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', 0, "warning",
+     "[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text)."),
+    ("color.dark_contrast", r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', 0),
+    ("color.blue",
+     r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', 0, "warning",
+     "[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow)."),
+    ("color.food_context", r'restaurant|food|cooking|recipe|menu|dish|meal', I),
+    ("color.variables", r'--color-|color-|primary-|secondary-', 0, "warning",
+     "[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness)."),
+
+    # 5. Animation guide
+    ("animation.durations", r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', 0, "warning",
+     "[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility."),
+    ("animation.long_transition", r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', 0,
+     "warning",
+     "[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness."),
+    ("animation.ease_in_entry", r'ease-in\s+.*entry|fade-in.*ease-in', 0, "warning",
+     "[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel."),
+    ("animation.ease_out_exit", r'ease-out\s+.*exit|fade-out.*ease-out', 0, "warning",
+     "[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel."),
+    ("animation.interactive", r'<button|<a\s+href|onClick|@click', 0, "warning",
+     "[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback."),
+    ("animation.hover_focus", r'hover:|focus:|:hover|:focus', 0),
+    ("animation.async", r'async|await|fetch|axios|loading|isLoading', 0, "warning",
+     "[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance."),
+    ("animation.loading_indicator", r'skeleton|spinner|progress|loading|<circle.*animate', 0),
+    ("animation.routing", r'router|navigate|Link.*to|useHistory', 0, "warning",
+     "[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity."),
+    ("animation.page_transition", r'AnimatePresence|motion\.|transition.*page|fade.*route', 0),
+    ("animation.scroll", r'onScroll|scroll.*trigger|IntersectionObserver', 0),
+    ("animation.scroll_layout", r'onScroll.*[^\w](width|height|top|left)', 0, "issue",
+     "[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps."),
+
+    # 6. Motion graphics
+    ("motion.lottie", r'lottie|Lottie|@lottie-react', 0, "warning",
+     "[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility."),
+    ("motion.lottie_fallback", r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', 0),
+    ("motion.gsap", r'gsap|ScrollTrigger|from\(.*gsap', 0, "issue",
+     "[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount."),
+    ("motion.gsap_cleanup", r'kill\(|revert\(|useEffect.*return.*gsap', 0),
+    ("motion.svg_animations", r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', 0, "warning",
+     "[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance."),
+    ("motion.transform_3d", r'transform3d|perspective\(|rotate3d|translate3d', 0, "warning",
+     "[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices."),
+    ("motion.perspective", r'perspective:\s*\d+px|perspective\s*\(', 0, "warning",
+     "[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth."),
+    ("motion.particles", r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', 0, "warning",
+     "[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices."),
+    ("motion.scroll_driven", r'IntersectionObserver.*animate|scroll.*progress|view-timeline', 0, "issue",
+     "[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps."),
+    ("motion.throttle", r'throttle|debounce|requestAnimationFrame', 0),
+    ("motion.animations", r'@keyframes|transition:|animate-', 0, "warning",
+     "[Motion] {filename}: Many animations ({count}). Ensure majority serve functional purpose (feedback, guidance), not decoration."),
+    ("motion.functional", r'hover:|focus:|disabled|loading|error|success', 0),
+
+    # 7. Accessibility
+    ("a11y.img_alt", r'<img(?![^>]*alt=)[^>]*>', 0, "issue",
+     "[Accessibility] {filename}: Missing img alt text"),
+]
+
+PURPLE_TOKENS = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
+                 '#8B5CF6', '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
+                 '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
+                 'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
+
+GENERIC_FONTS = {'sans-serif', 'serif', 'monospace', 'cursive', 'fantasy', 'system-ui', 'inherit', 'arial',
+                 'georgia', 'times new roman', 'courier new', 'verdana', 'helvetica', 'tahoma'}
+
+WEIGHT_MAP = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+              'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900'}
+
+LAYOUT_PROPERTIES = ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']
+
+# Compiled once per process and shared by every UXAuditor
+RULES = RuleSet(UX_RULES)
+
+# Cached per-file results are reused only while this script and the engine are unchanged
+AUDITOR_VERSION = auditor_version(__file__, rule_engine.__file__, regex_guard.__file__)
+
+
 class UXAuditor:
-    def __init__(self):
+    def __init__(self, rules: RuleSet = RULES):
+        self.rules = rules
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
-    
+
+    def _flag(self, rule_id: str, filename: str, **fields) -> None:
+        severity, message = self.rules.message(rule_id, filename=filename, **fields)
+        (self.issues if severity == "issue" else self.warnings).append(message)
+
     def audit_file(self, filepath: str) -> None:
         try:
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
         except: return
-        
+
         self.files_checked += 1
         filename = os.path.basename(filepath)
+        scan = self.rules.scan(content)
+        lowered = content.lower()
 
         # Pre-calculate common flags
-        has_long_text = bool(re.search(r'<p|<div.*class=.*text|article|<span.*text', content, re.IGNORECASE))
-        has_form = bool(re.search(r'<form|<input|password|credit|card|payment', content, re.IGNORECASE))
-        complex_elements = len(re.findall(r'<input|<select|<textarea|<option', content, re.IGNORECASE))
+        has_long_text = scan.search('content.long_text')
+        has_form = scan.search('content.form')
+        complex_elements = scan.count('content.complex_elements')
 
         # --- 1. PSYCHOLOGY LAWS ---
         # Hick's Law
-        nav_items = len(re.findall(r'<NavLink|<Link|<a\s+href|nav-item', content, re.IGNORECASE))
+        nav_items = scan.count('hicks.nav_items')
         if nav_items > 7:
-            self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
-        
+            self._flag('hicks.nav_items', filename, count=nav_items)
+
         # Fitts' Law
-        if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
-            self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
-        
+        if scan.search('fitts.px_height') or scan.search('fitts.tw_height'):
+            self._flag('fitts.px_height', filename)
+
         # Miller's Law
-        form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
-        if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
-            self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
-            
+        form_fields = scan.count('miller.form_fields')
+        if form_fields > 7 and not scan.search('miller.multi_step'):
+            self._flag('miller.form_fields', filename, count=form_fields)
+
         # Von Restorff
-        if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
-            self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
+        if 'button' in lowered and not scan.search('von_restorff.primary_cta'):
+            self._flag('von_restorff.primary_cta', filename)
 
         # Serial Position Effect - Important items at beginning/end
         if nav_items > 3:
             # Check if last nav item is important (contact, login, etc.)
-            nav_content = re.findall(r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', content, re.IGNORECASE)
+            nav_content = scan.findall('serial_position.nav_labels')
             if nav_content and len(nav_content) > 2:
                 last_item = nav_content[-1].lower() if nav_content else ''
                 if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
-                    self.warnings.append(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.")
+                    self._flag('serial_position.nav_labels', filename)
 
         # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
 
         # Visceral: First impressions (aesthetics, gradients, animations)
-        has_hero = bool(re.search(r'hero|<h1|banner', content, re.IGNORECASE))
+        has_hero = scan.search('visceral.hero')
         if has_hero:
             # Check for visual appeal elements
-            has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient', content))
-            has_animation = bool(re.search(r'@keyframes|transition:|animate-', content))
+            has_gradient = scan.search('visceral.gradient')
+            has_animation = scan.search('visceral.animation')
             has_visual_interest = has_gradient or has_animation
 
-            if not has_visual_interest and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
+            if not has_visual_interest and not scan.search('visual.background'):
+                self._flag('visceral.hero', filename)
 
         # Behavioral: Instant feedback and usability
         if 'onClick' in content or '@click' in content or 'onclick' in content:
-            has_feedback = re.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', content, re.IGNORECASE)
-            has_state_change = re.search(r'setState|useState|disabled|loading', content)
+            has_feedback = scan.search('behavioral.feedback')
+            has_state_change = scan.search('behavioral.state_change')
 
             if not has_feedback and not has_state_change:
-                self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
+                self._flag('behavioral.feedback', filename)
 
         # Reflective: Brand story, values, identity
-        has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
+        has_reflective = scan.search('reflective.brand_story')
         if has_long_text and not has_reflective:
-            self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
+            self._flag('reflective.brand_story', filename)
 
         # --- 1.6 TRUST BUILDING (Enhanced) ---
 
         # Security signals
         if has_form:
-            security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
-            if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
-                self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
+            security_signals = scan.findall('trust.security_signals')
+            if len(security_signals) == 0 and not scan.search('trust.checkout'):
+                self._flag('trust.security_signals', filename)
 
         # Social proof elements
-        social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
-        if len(social_proof) > 0:
+        if scan.search('trust.social_proof'):
             self.passed_count += 1
         else:
             if has_long_text:
-                self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
+                self._flag('trust.social_proof', filename)
 
         # Authority indicators
-        has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
+        has_footer = scan.search('trust.footer')
         if has_footer:
-            authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
-            if len(authority) == 0:
-                self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
+            if not scan.search('trust.authority'):
+                self._flag('trust.authority', filename)
 
         # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
 
         # Progressive disclosure
         if complex_elements > 5:
-            has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
+            has_progressive = scan.search('cognitive.progressive_disclosure')
             if not has_progressive:
-                self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
+                self._flag('cognitive.progressive_disclosure', filename)
 
         # Visual noise check
-        has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
-        has_many_borders = len(re.findall(r'border:|border-', content)) > 10
+        has_many_colors = scan.count('cognitive.colors') > 15
+        has_many_borders = scan.count('visual.border') > 10
         if has_many_colors and has_many_borders:
-            self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
+            self._flag('cognitive.colors', filename)
 
         # Familiar patterns
         if has_form:
-            has_standard_labels = bool(re.search(r'<label|placeholder|aria-label', content, re.IGNORECASE))
+            has_standard_labels = scan.search('cognitive.labels')
             if not has_standard_labels:
-                self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
+                self._flag('cognitive.labels', filename)
 
         # --- 1.8 PERSUASIVE DESIGN (Ethical) ---
 
         # Smart defaults
         if has_form:
-            has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
-            radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
+            has_defaults = scan.search('persuasion.defaults')
+            radio_inputs = scan.count('persuasion.radio_inputs')
             if radio_inputs > 0 and not has_defaults:
-                self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
+                self._flag('persuasion.radio_inputs', filename)
 
         # Anchoring (showing original price)
-        if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
-            has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
+        if scan.search('persuasion.price'):
+            has_anchor = scan.search('persuasion.anchor')
             if not has_anchor:
-                self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
+                self._flag('persuasion.anchor', filename)
 
         # Social proof live indicators
-        has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
+        has_social = scan.search('persuasion.social')
         if has_social:
-            has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
+            has_count = scan.search('persuasion.social_count')
             if not has_count:
-                self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
+                self._flag('persuasion.social_count', filename)
 
         # Progress indicators
         if has_form:
-            has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
+            has_progress = scan.search('persuasion.progress')
             if complex_elements > 5 and not has_progress:
-                self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
+                self._flag('persuasion.progress', filename)
 
         # --- 2. TYPOGRAPHY SYSTEM (Complete Coverage) ---
 
         # 2.1 Font Pairing - Too many font families
         font_families = set()
         # Check for @font-face, Google Fonts, font-family declarations
-        font_faces = re.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', content, re.IGNORECASE)
-        google_fonts = re.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', content, re.IGNORECASE)
-        font_family_css = re.findall(r'font-family:\s*([^;]+)', content, re.IGNORECASE)
+        font_faces = scan.findall('typography.font_face')
+        google_fonts = scan.findall('typography.google_fonts')
+        font_family_css = scan.findall('typography.font_family')
 
         for font in font_faces: font_families.add(font.strip().lower())
         for font in google_fonts:
@@ -258,51 +517,49 @@ class UXAuditor:
             # Extract first font from stack
             first_font = family.split(',')[0].strip().strip('"\'')
 
-            if first_font.lower() not in {'sans-serif', 'serif', 'monospace', 'cursive', 'fantasy', 'system-ui', 'inherit', 'arial', 'georgia', 'times new roman', 'courier new', 'verdana', 'helvetica', 'tahoma'}:
+            if first_font.lower() not in GENERIC_FONTS:
                 font_families.add(first_font.lower())
 
         if len(font_families) > 3:
-            self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
+            self._flag('typography.font_face', filename, count=len(font_families))
 
         # 2.2 Line Length - Character-based width
-        if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
-            self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
+        if has_long_text and not scan.search('typography.measure'):
+            self._flag('typography.measure', filename)
 
         # 2.3 Line Height - Proper leading ratios
         # Check for text without proper line-height
-        text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
-        if text_elements > 0 and not re.search(r'leading-|line-height:', content):
-            self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
+        if scan.search('typography.text_elements') and not scan.search('typography.leading'):
+            self._flag('typography.leading', filename)
 
         # Check for heading-specific line height issues
-        if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
+        if scan.search('typography.heading_text'):
             # Extract line-height values
-            line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
+            line_heights = scan.findall('typography.line_heights')
             for lh in line_heights:
                 if float(lh) > 1.5:
-                    self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
+                    self._flag('typography.line_heights', filename, value=lh)
 
         # 2.4 Letter Spacing (Tracking)
         # Uppercase without tracking
-        if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
-            if not re.search(r'tracking-|letter-spacing:', content):
-                self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
+        if scan.search('typography.uppercase'):
+            if not scan.search('typography.tracking'):
+                self._flag('typography.tracking', filename)
 
         # Large text (display/hero) should have negative tracking
-        if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
-            if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
-                self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
+        if scan.search('typography.display_size'):
+            if not scan.search('typography.tracking_tight'):
+                self._flag('typography.tracking_tight', filename)
 
         # 2.5 Weight and Emphasis - Contrast levels
         # Check for adjacent weight levels (poor contrast)
-        weights = re.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', content, re.IGNORECASE)
+        weights = scan.findall('typography.weights')
         weight_values = []
         for w in weights:
             val = w[0] or w[1]
             if val:
                 # Map named weights to numbers
-                weight_map = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900'}
-                val = weight_map.get(val.lower(), val)
+                val = WEIGHT_MAP.get(val.lower(), val)
                 try:
                     weight_values.append(int(val))
                 except: pass
@@ -311,35 +568,35 @@ class UXAuditor:
         for i in range(len(weight_values) - 1):
             diff = abs(weight_values[i] - weight_values[i+1])
             if diff == 100:
-                self.warnings.append(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
+                self._flag('typography.weights', filename, first=weight_values[i], second=weight_values[i+1])
 
         # Too many weight levels
         unique_weights = set(weight_values)
         if len(unique_weights) > 4:
-            self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
+            self._flag('typography.weight_levels', filename, count=len(unique_weights))
 
         # 2.6 Responsive Typography - Fluid sizing with clamp()
-        has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
-        if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
-            self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
+        has_font_sizes = scan.search('typography.font_sizes')
+        if has_font_sizes and not scan.search('typography.clamp'):
+            self._flag('typography.clamp', filename)
 
         # 2.7 Hierarchy - Heading structure
-        headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
+        headings = scan.findall('typography.headings')
         if headings:
             # Check for skipped levels (h1 -> h3)
             for i in range(len(headings) - 1):
                 curr = int(headings[i][1])
                 next_h = int(headings[i+1][1])
                 if next_h > curr + 1:
-                    self.warnings.append(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.")
+                    self._flag('typography.headings', filename, current=curr, next=next_h)
 
             # Check if h1 exists for main content
             if 'h1' not in [h.lower() for h in headings] and has_long_text:
-                self.warnings.append(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.")
+                self._flag('typography.missing_h1', filename)
 
         # 2.8 Modular Scale - Consistent sizing
         # Extract font-size values
-        font_sizes = re.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', content)
+        font_sizes = scan.findall('typography.scale')
         size_values = []
         for size, unit in font_sizes:
             if unit == 'rem' or unit == 'em':
@@ -359,347 +616,354 @@ class UXAuditor:
             common_ratios = {1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618}
             for ratio in ratios[:3]:  # Check first 3 ratios
                 if not any(abs(ratio - cr) < 0.05 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")
+                    self._flag('typography.scale', filename, ratio=ratio)
                     break
 
         # 2.9 Readability - Content chunking
         # Check for very long paragraphs (>5 lines estimated)
-        paragraphs = re.findall(r'<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
+        paragraphs = scan.findall('typography.paragraphs')
         for p in paragraphs:
             word_count = len(p.split())
             if word_count > 100:  # ~5-6 lines
-                self.warnings.append(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.")
+                self._flag('typography.paragraphs', filename, count=word_count)
 
         # Check for missing subheadings in long content
         if len(paragraphs) > 5:
-            subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
-            if subheadings == 0:
-                self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
+            if not scan.search('typography.subheadings'):
+                self._flag('typography.subheadings', filename)
 
         # --- 3. VISUAL EFFECTS (visual-effects.md) ---
-        
+
         # Glassmorphism Check
         if 'backdrop-filter' in content or 'blur(' in content:
-            if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
-                self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
-        
+            if not scan.search('visual.glass_background'):
+                self._flag('visual.glass_background', filename)
+
         # GPU Acceleration / Performance
-        if re.search(r'@keyframes|transition:', content):
-            expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
+        if scan.search('visual.motion'):
+            expensive_props = scan.findall('performance.layout_props')
             if expensive_props:
-                self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
-            
+                self._flag('performance.layout_props', filename, props=', '.join(set(expensive_props)))
+
             # Reduced Motion
-            if not re.search(r'prefers-reduced-motion', content):
-                self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
+            if not scan.search('a11y.reduced_motion'):
+                self._flag('a11y.reduced_motion', filename)
 
         # Natural Shadows
-        shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        shadows = scan.findall('visual.box_shadow')
         for shadow in shadows:
             # Check if natural (Y > X) or multiple layers
-            if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
-                 self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
+            if ',' not in shadow and not self.rules.search('visual.shadow_y_offset', shadow): # Simple heuristic for Y-offset
+                 self._flag('visual.box_shadow', filename)
 
         # --- 3.1 NEOMORPHISM CHECK ---
         # Check for neomorphism patterns (dual shadows with opposite directions)
-        neo_shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        neo_shadows = scan.findall('visual.neomorphism')
         for shadow in neo_shadows:
             # Neomorphism has two shadows: positive offset + negative offset
             if ',' in shadow and '-' in shadow:
                 # Check for inset pattern (pressed state)
                 if 'inset' in shadow:
-                    self.warnings.append(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.")
+                    self._flag('visual.neomorphism', filename)
 
         # --- 3.2 SHADOW HIERARCHY ---
         # Count shadow levels to check for elevation consistency
         shadow_count = len(shadows)
         if shadow_count > 0:
             # Check for shadow opacity levels (should indicate hierarchy)
-            opacities = re.findall(r'rgba?\([^)]+,\s*([\d.]+)\)', content)
+            opacities = scan.findall('visual.shadow_opacity')
             shadow_opacities = [float(o) for o in opacities if float(o) < 0.5]
             if shadow_count >= 3 and len(shadow_opacities) > 0:
                 # Check if there's variety in shadow opacities for different elevations
                 unique_opacities = len(set(shadow_opacities))
                 if unique_opacities < 2:
-                    self.warnings.append(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
+                    self._flag('visual.shadow_opacity', filename)
 
         # --- 3.3 GRADIENT CHECKS ---
         # Check for gradient usage
-        has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient|conic-gradient', content))
+        has_gradient = scan.search('visual.gradient')
         if has_gradient:
             # Warn about mesh/aurora gradients (can be overused)
-            gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
+            gradient_count = scan.count('visual.gradient_count')
             if gradient_count > 5:
-                self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
+                self._flag('visual.gradient_count', filename, count=gradient_count)
         else:
             # Check if hero section exists without gradient
-            if has_hero and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
+            if has_hero and not scan.search('visual.hero_background'):
+                self._flag('visual.hero_background', filename)
 
         # --- 3.4 BORDER EFFECTS ---
         # Check for gradient borders or animated borders
-        has_border = bool(re.search(r'border:|border-', content))
+        has_border = scan.search('visual.border')
         if has_border:
             # Check for overly complex borders
-            border_count = len(re.findall(r'border:', content))
+            border_count = scan.count('visual.border_declarations')
             if border_count > 8:
-                self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
+                self._flag('visual.border_declarations', filename, count=border_count)
 
         # --- 3.5 GLOW EFFECTS ---
         # Check for text-shadow or multiple box-shadow layers (glow effects)
-        text_shadows = re.findall(r'text-shadow:', content)
+        text_shadows = scan.findall('visual.text_shadow')
         for ts in text_shadows:
             # Multiple text-shadow layers indicate glow
             if ',' in ts:
-                self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
+                self._flag('visual.text_shadow', filename)
 
         # Check for box-shadow glow (multiple layers with 0 offset)
-        glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
-        if len(glow_shadows) > 2:
-            self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
+        if scan.count('visual.glow') > 2:
+            self._flag('visual.glow', filename)
 
         # --- 3.6 OVERLAY TECHNIQUES ---
         # Check for image overlays (for readability)
-        has_images = bool(re.search(r'<img|background-image:|bg-\[url', content))
+        has_images = scan.search('visual.images')
         if has_images and has_long_text:
-            has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
+            has_overlay = scan.search('visual.overlay')
             if not has_overlay:
-                self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
+                self._flag('visual.overlay', filename)
 
         # --- 3.7 PERFORMANCE: will-change ---
         # Check for will-change usage
-        if re.search(r'will-change:', content):
-            will_change_props = re.findall(r'will-change:\s*([^;]+)', content)
+        will_change_count = scan.count('performance.will_change_count')
+        if will_change_count:
+            will_change_props = scan.findall('performance.will_change')
             for prop in will_change_props:
                 prop = prop.strip().lower()
-                if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
-                    self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
+                if prop in LAYOUT_PROPERTIES:
+                    self._flag('performance.will_change', filename, prop=prop)
 
         # Check for excessive will-change usage
-        will_change_count = len(re.findall(r'will-change:', content))
         if will_change_count > 3:
-            self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
+            self._flag('performance.will_change_count', filename, count=will_change_count)
 
         # --- 3.8 EFFECT SELECTION ---
         # Check for effect overuse (too many visual effects)
         effect_count = (
             (1 if has_gradient else 0) +
             shadow_count +
-            len(re.findall(r'backdrop-filter|blur\(', content)) +
-            len(re.findall(r'text-shadow:', content))
+            scan.count('visual.blur') +
+            len(text_shadows)
         )
         if effect_count > 10:
-            self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
+            self._flag('visual.blur', filename, count=effect_count)
 
         # Check for static/flat design (no depth)
         if has_long_text and effect_count == 0:
-            self.warnings.append(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
+            self._flag('visual.flat', filename)
 
         # --- 4. COLOR SYSTEM (color-system.md) ---
 
         # 4.1 PURPLE BAN - Critical check from color-system.md
-        purple_hexes = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
-                        '#8B5CF6', '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
-                        '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
-                        'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
-        for purple in purple_hexes:
-            if purple.lower() in content.lower():
-                self.issues.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
-                break
+        if scan.search('color.purple'):
+            for purple in PURPLE_TOKENS:
+                if purple.lower() in lowered:
+                    self._flag('color.purple', filename, purple=purple)
+                    break
 
         # 4.2 60-30-10 Rule check
         # Count color usage to estimate ratio
-        color_hex_count = len(re.findall(r'#[0-9a-fA-F]{3,6}', content))
-        hsl_count = len(re.findall(r'hsl\(', content))
+        color_hex_count = scan.count('color.hex')
+        hsl_count = scan.count('color.hsl')
         total_colors = color_hex_count + hsl_count
         if total_colors > 3:
             # Check for dominant colors (should be ~60%)
-            bg_declarations = re.findall(r'(?:background|bg-|bg\[)([^;}\s]+)', content)
-            text_declarations = re.findall(r'(?:color|text-)([^;}\s]+)', content)
+            bg_declarations = scan.findall('color.background_declarations')
+            text_declarations = scan.findall('color.text_declarations')
             if len(bg_declarations) > 0 and len(text_declarations) > 0:
                 # Just warn if too many distinct colors
-                unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
+                unique_hexes = set(scan.findall('color.distinct_hex'))
                 if len(unique_hexes) > 5:
-                    self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
+                    self._flag('color.distinct_hex', filename, count=len(unique_hexes))
 
         # 4.3 Color Scheme Pattern Detection
         # Detect monochromatic (same hue, different lightness)
-        hsl_matches = re.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)', content)
+        hsl_matches = scan.findall('color.hsl_hues')
         if len(hsl_matches) >= 3:
             hues = [int(h) for h in hsl_matches]
             hue_range = max(hues) - min(hues)
             if hue_range < 10:
-                self.warnings.append(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")
+                self._flag('color.hsl_hues', filename, variance=hue_range)
 
         # 4.4 Dark Mode Compliance
         # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
-        if re.search(r'color:\s*#000000|#000\b', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
-        if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
-            self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
+        if scan.search('color.pure_black'):
+            self._flag('color.pure_black', filename)
+        if scan.search('color.pure_white') and scan.search('color.dark_mode'):
+            self._flag('color.pure_white', filename)
 
         # 4.5 WCAG Contrast Pattern Check
         # Look for potential low-contrast combinations
-        light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
-        dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
+        light_bg_light_text = scan.search('color.light_contrast')
+        dark_bg_dark_text = scan.search('color.dark_contrast')
         if light_bg_light_text or dark_bg_dark_text:
-            self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
+            self._flag('color.light_contrast', filename)
 
         # 4.6 Color Psychology Context Check
         # Warn if blue used for food/restaurant context
-        has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
-        has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
+        has_blue = scan.search('color.blue')
+        has_food_context = scan.search('color.food_context')
         if has_blue and has_food_context:
-            self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
+            self._flag('color.blue', filename)
 
         # 4.7 HSL-Based Palette Detection
         # Check if using HSL for palette (recommended in color-system.md)
-        has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
-        if has_color_vars and not re.search(r'hsl\(', content):
-            self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
+        has_color_vars = scan.search('color.variables')
+        if has_color_vars and not scan.search('color.hsl'):
+            self._flag('color.variables', filename)
 
         # --- 5. ANIMATION GUIDE (animation-guide.md) ---
 
         # 5.1 Duration Appropriateness
         # Check for excessively long or short animations
-        durations = re.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', content)
+        durations = scan.findall('animation.durations')
         for duration, unit in durations:
             duration_ms = float(duration) * (1000 if unit == 's' else 1)
             if duration_ms < 50:
-                self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
-            elif duration_ms > 1000 and 'transition' in content.lower():
-                self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
+                self._flag('animation.durations', filename, duration=duration, unit=unit)
+            elif duration_ms > 1000 and 'transition' in lowered:
+                self._flag('animation.long_transition', filename, duration=duration, unit=unit)
 
         # 5.2 Easing Function Correctness
         # Check for incorrect easing patterns
-        if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
-            self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
-        if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
-            self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
+        if scan.search('animation.ease_in_entry'):
+            self._flag('animation.ease_in_entry', filename)
+        if scan.search('animation.ease_out_exit'):
+            self._flag('animation.ease_out_exit', filename)
 
         # 5.3 Micro-interaction Feedback Patterns
         # Check for interactive elements without hover/focus states
-        interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
-        has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
+        interactive_elements = scan.count('animation.interactive')
+        has_hover_focus = scan.search('animation.hover_focus')
         if interactive_elements > 2 and not has_hover_focus:
-            self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
+            self._flag('animation.interactive', filename)
 
         # 5.4 Loading State Indicators
         # Check for loading patterns
-        has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
-        has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
+        has_async = scan.search('animation.async')
+        has_loading_indicator = scan.search('animation.loading_indicator')
         if has_async and not has_loading_indicator:
-            self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
+            self._flag('animation.async', filename)
 
         # 5.5 Page Transition Patterns
         # Check for page/view transitions
-        has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
-        has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
+        has_routing = scan.search('animation.routing')
+        has_page_transition = scan.search('animation.page_transition')
         if has_routing and not has_page_transition:
-            self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
+            self._flag('animation.routing', filename)
 
         # 5.6 Scroll Animation Performance
         # Check for scroll-driven animations
-        has_scroll_anim = bool(re.search(r'onScroll|scroll.*trigger|IntersectionObserver', content))
+        has_scroll_anim = scan.search('animation.scroll')
         if has_scroll_anim:
             # Check if using expensive properties in scroll handlers
-            if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
-                self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
+            if scan.search('animation.scroll_layout'):
+                self._flag('animation.scroll_layout', filename)
 
         # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
 
         # 6.1 Lottie Animation Checks
-        has_lottie = bool(re.search(r'lottie|Lottie|@lottie-react', content))
+        has_lottie = scan.search('motion.lottie')
         if has_lottie:
             # Check for reduced motion fallback
-            has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
+            has_lottie_fallback = scan.search('motion.lottie_fallback')
             if not has_lottie_fallback:
-                self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
+                self._flag('motion.lottie', filename)
 
         # 6.2 GSAP Memory Leak Risks
-        has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
+        has_gsap = scan.search('motion.gsap')
         if has_gsap:
             # Check for cleanup patterns
-            has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
+            has_gsap_cleanup = scan.search('motion.gsap_cleanup')
             if not has_gsap_cleanup:
-                self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
+                self._flag('motion.gsap', filename)
 
         # 6.3 SVG Animation Performance
-        svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
-        if len(svg_animations) > 3:
-            self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
+        if scan.count('motion.svg_animations') > 3:
+            self._flag('motion.svg_animations', filename)
 
         # 6.4 3D Transform Performance
-        has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
+        has_3d_transform = scan.search('motion.transform_3d')
         if has_3d_transform:
             # Check for perspective on parent
-            has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
+            has_perspective_parent = scan.search('motion.perspective')
             if not has_perspective_parent:
-                self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
+                self._flag('motion.perspective', filename)
 
             # Warn about mobile performance
-            self.warnings.append(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.")
+            self._flag('motion.transform_3d', filename)
 
         # 6.5 Particle Effect Warnings
         # Check for canvas/WebGL particle systems
-        has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
-        if has_particles:
-            self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
+        if scan.search('motion.particles'):
+            self._flag('motion.particles', filename)
 
         # 6.6 Scroll-Driven Animation Performance
-        has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
+        has_scroll_driven = scan.search('motion.scroll_driven')
         if has_scroll_driven:
             # Check for throttling/debouncing
-            has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
+            has_throttle = scan.search('motion.throttle')
             if not has_throttle:
-                self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
+                self._flag('motion.scroll_driven', filename)
 
         # 6.7 Motion Decision Tree - Context Check
         # Check if animation serves purpose (not just decoration)
         total_animations = (
-            len(re.findall(r'@keyframes|transition:|animate-', content)) +
+            scan.count('motion.animations') +
             (1 if has_lottie else 0) +
             (1 if has_gsap else 0)
         )
         if total_animations > 5:
             # Check if animations are functional
-            functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
+            functional_animations = scan.count('motion.functional')
             if functional_animations < total_animations / 2:
-                self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
+                self._flag('motion.animations', filename, count=total_animations)
 
         # --- 7. ACCESSIBILITY ---
-        if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
-            self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
+        if scan.search('a11y.img_alt'):
+            self._flag('a11y.img_alt', filename)
 
-    def audit_directory(self, directory: str) -> None:
+    def audit_directory(self, directory: str, jobs: int = 0, use_cache: bool = True) -> None:
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
-
-    def get_report(self):
-        return {
+        paths = [str(p) for p in project_index(directory).paths(
+            exts=extensions, skip_dirs={'node_modules', '.git', 'dist', 'build', '.next'})]
+
+        cache = ResultCache("ux_audit", AUDITOR_VERSION) if use_cache else None
+        merge_results(self, audit_files(UXAuditor, paths, jobs=jobs, cache=cache))
+
+    def get_report(self, rule_stats: bool = False):
+        report = {
             "files_checked": self.files_checked,
             "issues": self.issues,
             "warnings": self.warnings,
             "passed_checks": self.passed_count,
             "compliant": len(self.issues) == 0
         }
+        if rule_stats:
+            report["rule_stats"] = self.rules.stats
+            report["risky_rules"] = self.rules.risky_rules()
+        return report
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2: sys.exit(1)
+
+    path = argv[1]
+    is_json = "--json" in argv
+    show_rule_stats = "--rule-stats" in argv
+    jobs = int(argv[argv.index("--jobs") + 1]) if "--jobs" in argv else 0
+    profiler = profiler_from_argv("ux_audit", argv)
+    if profiler:
+        RULES.profiler = profiler
+        profiler.install(sys.modules[__name__], UXAuditor, "audit_file")
 
-def main():
-    if len(sys.argv) < 2: sys.exit(1)
-    
-    path = sys.argv[1]
-    is_json = "--json" in sys.argv
-    
     auditor = UXAuditor()
     if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
-    
-    report = auditor.get_report()
-    
+    elif show_rule_stats or profiler:
+        # Rule statistics are collected in-process, so audit every file here
+        auditor.audit_directory(path, jobs=1, use_cache=False)
+    else: auditor.audit_directory(path, jobs=jobs, use_cache="--no-cache" not in argv)
+
+    report = auditor.get_report(rule_stats=show_rule_stats)
+
     if is_json:
         print(json.dumps(report))
     else:
@@ -713,10 +977,20 @@ def main():
             print(f"[*] WARNINGS ({len(report['warnings'])}):")
             for w in report['warnings'][:15]: print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
+        if show_rule_stats:
+            print("[~] SLOWEST RULES:")
+            for rule_id, stat in auditor.rules.hot_rules(10):
+                print(f"  - {rule_id}: {stat['time'] * 1000:.1f}ms, {stat['evaluations']} runs, "
+                      f"{stat['skipped']} prefiltered, {stat['matches']} matches")
         status = "PASS" if report['compliant'] else "FAIL"
         print(f"STATUS: {status}")
 
     sys.exit(0 if report['compliant'] else 1)
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    # The runner already runs checks side by side; audit this one in-process
+    return run_main(main, [__file__, project_path, "--jobs", "1"])
+
 if __name__ == "__main__":
     main()
@@ -14,13 +14,20 @@ WHAT IT CHECKS:
     - NOT markdown files (those are developer docs, not public content)
 
 Usage:
-    python geo_checker.py <project_path>
+    python geo_checker.py <project_path> [--profile[=trace.json]]
 """
 import sys
 import re
 import json
 from pathlib import Path
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.page_model import load_pages
+from audit_kit.profiler import profiler_from_argv
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -80,48 +87,44 @@ def is_page_file(file_path: Path) -> bool:
 
 def find_web_pages(project_path: Path) -> list:
     """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
+    candidates = project_index(project_path).paths(exts={'.html', '.htm', '.jsx', '.tsx'}, skip_dirs=SKIP_DIRS)
+    
+    # Keep files that are likely pages
+    files = [f for f in candidates if is_page_file(f)]
     
     return files[:30]  # Limit to 30 pages
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, doc: dict = None) -> dict:
     """Check a single web page for GEO elements."""
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-    except Exception as e:
-        return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
+    if doc is None:
+        doc = load_pages([file_path])[0]
+    if 'error' in doc:
+        return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {doc['error']}"], 'score': 0}
     
     issues = []
     passed = []
     
+    types = set(doc['schema_types'])
+    attr_values = [str(value).lower() for _, attrs, _ in doc['elements'] for value in attrs.values()]
+    text = doc['text']
+    
     # 1. JSON-LD Structured Data (Critical for AI)
-    if 'application/ld+json' in content:
+    if doc['json_ld']:
         passed.append("JSON-LD structured data found")
-        if '"@type"' in content:
-            if 'Article' in content:
+        if types:
+            if any('Article' in t for t in types):
                 passed.append("Article schema present")
-            if 'FAQPage' in content:
+            if 'FAQPage' in types:
                 passed.append("FAQ schema present")
-            if 'Organization' in content or 'Person' in content:
+            if 'Organization' in types or 'Person' in types:
                 passed.append("Entity schema present")
     else:
         issues.append("No JSON-LD structured data (AI engines prefer structured content)")
     
     # 2. Heading Structure
-    h1_count = len(re.findall(r'<h1[^>]*>', content, re.I))
-    h2_count = len(re.findall(r'<h2[^>]*>', content, re.I))
+    h1_count = sum(1 for level, _, _ in doc['headings'] if level == 1)
+    h2_count = sum(1 for level, _, _ in doc['headings'] if level == 2)
     
     if h1_count == 1:
         passed.append("Single H1 heading (clear topic)")
@@ -135,47 +138,47 @@ def check_page(file_path: Path) -> dict:
     else:
         issues.append("Add more H2 subheadings for scannable content")
     
-    # 3. Author Attribution (E-E-A-T signal)
-    author_patterns = ['author', 'byline', 'written-by', 'contributor', 'rel="author"']
-    has_author = any(p in content.lower() for p in author_patterns)
+    # 3. Author Attribution (E-E-A-T signal): meta author, rel/itemprop/class, JSON-LD author
+    author_patterns = ['author', 'byline', 'written-by', 'contributor']
+    has_author = (any(p in value for value in attr_values for p in author_patterns)
+                  or any('"author"' in block or 'author:' in block for block in doc['json_ld']))
     if has_author:
         passed.append("Author attribution found")
     else:
         issues.append("No author info (AI prefers attributed content)")
     
     # 4. Publication Date (Freshness signal)
-    date_patterns = ['datePublished', 'dateModified', 'datetime=', 'pubdate', 'article:published']
-    has_date = any(re.search(p, content, re.I) for p in date_patterns)
+    date_patterns = ['datepublished', 'datemodified', 'pubdate', 'article:published']
+    has_date = (any(p in value for value in attr_values for p in date_patterns)
+                or any('datetime' in attrs for tag, attrs, _ in doc['elements'] if tag == 'time')
+                or any(re.search(r'date(Published|Modified)', block) for block in doc['json_ld']))
     if has_date:
         passed.append("Publication date found")
     else:
         issues.append("No publication date (freshness matters for AI)")
     
     # 5. FAQ Section (Highly citable)
-    faq_patterns = [r'<details', r'faq', r'frequently.?asked', r'"FAQPage"']
-    has_faq = any(re.search(p, content, re.I) for p in faq_patterns)
+    has_faq = (any(tag == 'details' for tag, _, _ in doc['elements']) or 'FAQPage' in types
+               or re.search(r'faq|frequently.?asked', text, re.I)
+               or any('faq' in value for value in attr_values))
     if has_faq:
         passed.append("FAQ section detected (highly citable)")
     
     # 6. Lists (Structured content)
-    list_count = len(re.findall(r'<(ul|ol)[^>]*>', content, re.I))
+    list_count = sum(1 for tag, _, _ in doc['elements'] if tag in ('ul', 'ol'))
     if list_count >= 2:
         passed.append(f"{list_count} lists (structured content)")
     
     # 7. Tables (Comparison data)
-    table_count = len(re.findall(r'<table[^>]*>', content, re.I))
+    table_count = sum(1 for tag, _, _ in doc['elements'] if tag == 'table')
     if table_count >= 1:
         passed.append(f"{table_count} table(s) (comparison data)")
     
     # 8. Entity Recognition (E-E-A-T signal) - NEW 2025
-    entity_patterns = [
-        r'"@type"\s*:\s*"Organization"',
-        r'"@type"\s*:\s*"LocalBusiness"', 
-        r'"@type"\s*:\s*"Brand"',
-        r'itemtype.*schema\.org/(Organization|Person|Brand)',
-        r'rel="author"'
-    ]
-    has_entity = any(re.search(p, content, re.I) for p in entity_patterns)
+    has_entity = (bool(types & {'Organization', 'LocalBusiness', 'Brand'})
+                  or any(re.search(r'schema\.org/(Organization|Person|Brand)', str(attrs.get('itemtype', '')), re.I)
+                         for _, attrs, _ in doc['elements'])
+                  or any(link['rel'] == 'author' for link in doc['links']))
     if has_entity:
         passed.append("Entity/Brand recognition (E-E-A-T)")
     
@@ -189,7 +192,7 @@ def check_page(file_path: Path) -> dict:
         r'\d+x\s+(faster|better|more)', # Comparison stats
         r'(million|billion|trillion)', # Large numbers
     ]
-    stat_matches = sum(1 for p in stat_patterns if re.search(p, content, re.I))
+    stat_matches = sum(1 for p in stat_patterns if re.search(p, text, re.I))
     if stat_matches >= 2:
         passed.append("Original statistics/data (citation magnet)")
     
@@ -201,9 +204,9 @@ def check_page(file_path: Path) -> dict:
         r'the answer is',
         r'in short,',
         r'simply put,',
-        r'<dfn'
     ]
-    has_direct = any(re.search(p, content, re.I) for p in direct_answer_patterns)
+    has_direct = (any(re.search(p, text, re.I) for p in direct_answer_patterns)
+                  or any(tag == 'dfn' for tag, _, _ in doc['elements']))
     if has_direct:
         passed.append("Direct answer patterns (LLM-friendly)")
     
@@ -219,8 +222,17 @@ def check_page(file_path: Path) -> dict:
     }
 
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    target = args[0] if args else "."
+    profiler = profiler_from_argv("geo_checker", argv)
+    if profiler:
+        module = sys.modules[__name__]
+        profiler.install(module, module, "check_page")
+        # The page regexes run inside page_model, so time the parse and check stages
+        profiler.time_stage(module, "load_pages", "parse (page_model)")
+        profiler.time_stage(module, "check_page", "check")
     target_path = Path(target).resolve()
     
     print("\n" + "=" * 60)
@@ -242,10 +254,10 @@ def main():
     
     print(f"Found {len(pages)} public pages to analyze\n")
     
-    # Check each page
+    # Check each page (models are shared with the other page checkers)
     results = []
-    for page in pages:
-        result = check_page(page)
+    for page, doc in zip(pages, load_pages(pages)):
+        result = check_page(page, doc)
         results.append(result)
     
     # Print results
@@ -285,5 +297,10 @@ def main():
     sys.exit(0 if avg_score >= 60 else 1)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
+
 if __name__ == "__main__":
     main()
@@ -2,12 +2,37 @@
 """
 i18n Checker - Detects hardcoded strings and missing translations.
 Scans for untranslated text in React, Vue, and Python files.
+
+Usage:
+    python i18n_checker.py <project_path> [--base-lang en] [--allow "tr(,<Localized>"]
+                           [--all] [--jobs N] [--no-cache]
+
+Every language is compared with the base language (--base-lang, default
+'en' when present, else the first code alphabetically). Locale keys are
+read with a streaming JSON scanner and kept in a per-file index keyed by
+content hash in .agent/.cache, so only changed locale files are re-read.
+
+Code files are tokenized (audit_kit.ts_tokenizer for JS/TS/JSX/Vue, ast
+for Python) to find JSX text nodes, text attributes and sentence-like
+string literals outside translation wrappers (t(, i18n.t(, <Trans>, ...;
+--allow adds more). Each hit is reported as path:line:column; per-file
+results are cached the same way, so re-runs only re-scan edited files.
 """
+import ast
+import functools
 import sys
 import re
 import json
 from pathlib import Path
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit import ts_tokenizer
+from audit_kit.batch import ResultCache, auditor_version, map_files
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+from audit_kit.ts_tokenizer import Positions, match_brackets, tokenize
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,28 +40,33 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-# Patterns that indicate hardcoded strings (should be translated)
-HARDCODED_PATTERNS = {
-    'jsx': [
-        # Text directly in JSX: <div>Hello World</div>
-        r'>\s*[A-Z][a-zA-Z\s]{3,30}\s*</',
-        # JSX attribute strings: title="Welcome"
-        r'(title|placeholder|label|alt|aria-label)="[A-Z][a-zA-Z\s]{2,}"',
-        # Button/heading text
-        r'<(button|h[1-6]|p|span|label)[^>]*>\s*[A-Z][a-zA-Z\s!?.,]{3,}\s*</',
-    ],
-    'vue': [
-        # Vue template text
-        r'>\s*[A-Z][a-zA-Z\s]{3,30}\s*</',
-        r'(placeholder|label|title)="[A-Z][a-zA-Z\s]{2,}"',
-    ],
-    'python': [
-        # print/raise with string literals
-        r'(print|raise\s+\w+)\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
-        # Flask flash messages
-        r'flash\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
-    ]
-}
+# Translation wrappers: text inside these calls/elements is already translated.
+# Extend with --allow "tr(,<Localized>"
+DEFAULT_WRAPPERS = ("t(", "i18n.t(", "$t(", "_(", "gettext(", "<Trans>", "<FormattedMessage>")
+
+# Calls whose string arguments are never shown to users
+IGNORED_CALLS = {'require', 'import', 'console.log', 'console.warn', 'console.error', 'console.info',
+                 'console.debug', 'describe', 'it', 'test', 'expect', 'querySelector', 'getElementById'}
+
+# JSX/HTML attributes that carry user-visible text
+TEXT_ATTRS = {'title', 'placeholder', 'label', 'alt', 'aria-label', 'aria-description', 'aria-placeholder'}
+
+# Python calls whose literal first argument is user-visible
+PY_TEXT_CALLS = {'print', 'flash'}
+
+CODE_EXTENSIONS = {'.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'ts', '.js': 'jsx', '.vue': 'vue', '.py': 'python'}
+
+# Agent and CI tooling print to a console, not to the app's users
+CODE_SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', 'out', '.next', 'coverage', '__pycache__',
+                  'venv', '.venv', 'test', 'tests', '__tests__', '__mocks__', 'e2e', '.agent', '.github'}
+
+# A word of two or more letters (any script)
+TEXT_WORD = re.compile(r'[^\W\d_]{2,}')
+HTML_ENTITY = re.compile(r'&(?:\w+|#\d+|#x[0-9a-fA-F]+);')
+# A capitalised phrase of two or more words, without code-like characters
+SENTENCE = re.compile(r"^[A-Z][a-z'’]+(?:[ ,]+[\w'’.!?:()%-]+)+[.!?:…]?$")
+
+MAX_EXAMPLES = 10
 
 # Patterns that indicate proper i18n usage
 I18N_PATTERNS = [
@@ -61,144 +91,355 @@ def find_locale_files(project_path: Path) -> list:
         "**/*.po",  # gettext
     ]
     
-    files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
-    
-    return [f for f in files if 'node_modules' not in str(f)]
+    return project_index(project_path).glob(*patterns)
+
+# Language codes: en, ar, ku, pt-BR, zh_Hans
+LANG_CODE = re.compile(r'^[a-z]{2,3}(?:[-_][A-Za-z]{2,4})?$')
+
+# Base language when --base-lang is not given and it is present
+DEFAULT_BASE_LANG = 'en'
+
+# Locale JSON tokens: strings, structural characters, and bare scalars
+JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]:,]|[^\s{}\[\]:,"]+')
+CHUNK_SIZE = 1 << 20
+
+KEY_INDEX_VERSION = auditor_version(__file__)
+
+
+def _json_tokens(f):
+    """Tokens of a JSON text read CHUNK_SIZE characters at a time."""
+    buf = ''
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        buf += chunk
+        pos = 0
+        for m in JSON_TOKEN.finditer(buf):
+            # A token touching the end of the buffer, or a string whose closing
+            # quote is not read yet, may continue in the next chunk
+            if chunk and (m.end() == len(buf) or '"' in buf[pos:m.start()]):
+                break
+            yield m.group()
+            pos = m.end()
+        if not chunk:
+            return
+        buf = buf[pos:]
+
+
+def iter_json_keys(f):
+    """
+    Flattened dotted keys of a JSON object ({"a": {"b": 1}} -> "a.b"), streamed
+    from a text file without building the object tree. Arrays and scalars are
+    leaves; empty objects contribute no keys. Raises ValueError on input that
+    is not a JSON object.
+    """
+    stack = []  # One [prefix, pending key or None, is_object] per open container
+    expect_key = False
+    for token in _json_tokens(f):
+        if token == ':' or token == ',':
+            expect_key = token == ',' and bool(stack) and stack[-1][2]
+            continue
+        if not stack:
+            if token != '{':
+                raise ValueError("locale file is not a JSON object")
+            stack.append(['', None, True])
+            expect_key = True
+            continue
+        frame = stack[-1]
+        if token in ('}', ']'):
+            stack.pop()
+            expect_key = False
+            if not stack:
+                return
+            continue
+        if frame[2] and expect_key:
+            if token[0] != '"':
+                raise ValueError(f"expected a key, got {token[:20]!r}")
+            key = json.loads(token) if '\\' in token else token[1:-1]
+            frame[1] = f"{frame[0]}.{key}" if frame[0] else key
+            expect_key = False
+            continue
+        # A value
+        if not frame[2]:
+            if token in ('{', '['):
+                stack.append([None, None, False])  # Array contents are not keys
+            continue
+        name = frame[1]
+        if token == '{':
+            stack.append([name, None, True])
+            expect_key = True
+        elif token == '[':
+            stack.append([None, None, False])
+            yield name
+        else:
+            yield name
+    if stack:
+        raise ValueError("unexpected end of file")
+
+
+def extract_locale_keys(path: str) -> dict:
+    """Key index entry for one locale file; runs in worker processes."""
+    try:
+        with open(path, encoding='utf-8-sig') as f:
+            return {'keys': sorted(set(iter_json_keys(f)))}
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return {'keys': None, 'error': str(e)}
+
+
+def locale_of(f: Path) -> tuple:
+    """
+    (language, namespace) of a locale file: locales/en/common.json ->
+    ('en', 'common'); locales/en.json -> ('en', '').
+    """
+    if LANG_CODE.match(f.parent.name):
+        return f.parent.name, f.stem
+    if LANG_CODE.match(f.stem):
+        return f.stem, ''
+    return f.parent.name, f.stem
+
 
-def check_locale_completeness(locale_files: list) -> dict:
-    """Check if all locales have the same keys."""
+def check_locale_completeness(locale_files: list, base_lang: str = None,
+                              jobs: int = 0, use_cache: bool = True) -> dict:
+    """Check if all locales have the same keys as the base language."""
     issues = []
     passed = []
-    
+
     if not locale_files:
         return {'passed': [], 'issues': ["[!] No locale files found"]}
-    
-    # Group by parent folder (language)
+
+    # The key index is cached per file by content hash: only changed files are re-read
+    json_files = [f for f in locale_files if f.suffix == '.json']
+    cache = ResultCache("i18n_keys", KEY_INDEX_VERSION) if use_cache else None
+    entries = map_files(extract_locale_keys, [str(f) for f in json_files], jobs=jobs, cache=cache)
+
+    # Group by language, then namespace
     locales = {}
-    for f in locale_files:
-        if f.suffix == '.json':
-            try:
-                lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
-                if lang not in locales:
-                    locales[lang] = {}
-                locales[lang][f.stem] = set(flatten_keys(content))
-            except:
-                continue
-    
+    for f, entry in zip(json_files, entries):
+        if entry['keys'] is None:
+            issues.append(f"[!] {f.name}: unreadable ({entry['error']})")
+            continue
+        lang, namespace = locale_of(f)
+        locales.setdefault(lang, {})[namespace] = set(entry['keys'])
+
     if len(locales) < 2:
         passed.append(f"[OK] Found {len(locale_files)} locale file(s)")
         return {'passed': passed, 'issues': issues}
-    
-    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales.keys())}")
-    
+
+    all_langs = sorted(locales)
+    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(all_langs)}")
+
+    if base_lang is None:
+        base_lang = DEFAULT_BASE_LANG if DEFAULT_BASE_LANG in locales else all_langs[0]
+    elif base_lang not in locales:
+        issues.append(f"[X] Base language '{base_lang}' not found")
+        return {'passed': passed, 'issues': issues}
+    passed.append(f"[OK] Base language: {base_lang}")
+
     # Compare keys across locales
-    all_langs = list(locales.keys())
-    base_lang = all_langs[0]
-    
-    for namespace in locales.get(base_lang, {}):
-        base_keys = locales[base_lang].get(namespace, set())
-        
-        for lang in all_langs[1:]:
-            other_keys = locales.get(lang, {}).get(namespace, set())
-            
+    compared = len(issues)
+    for namespace in sorted(locales[base_lang]):
+        base_keys = locales[base_lang][namespace]
+
+        for lang in all_langs:
+            if lang == base_lang:
+                continue
+            other_keys = locales[lang].get(namespace, set())
+            where = f"{lang}/{namespace}" if namespace else lang
+
             missing = base_keys - other_keys
             if missing:
-                issues.append(f"[X] {lang}/{namespace}: Missing {len(missing)} keys")
-            
+                sample = ', '.join(sorted(missing)[:3])
+                issues.append(f"[X] {where}: Missing {len(missing)} keys (e.g. {sample})")
+
             extra = other_keys - base_keys
             if extra:
-                issues.append(f"[!] {lang}/{namespace}: {len(extra)} extra keys")
-    
-    if not issues:
+                issues.append(f"[!] {where}: {len(extra)} extra keys")
+
+    if len(issues) == compared:
         passed.append("[OK] All locales have matching keys")
-    
+
     return {'passed': passed, 'issues': issues}
 
-def flatten_keys(d, prefix=''):
-    """Flatten nested dict keys."""
-    keys = set()
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            keys.update(flatten_keys(v, new_key))
+def parse_wrappers(specs) -> tuple:
+    """Split wrapper specs into (call names, element names): 't(' -> call, '<Trans>' -> element."""
+    calls, elements = set(), set()
+    for spec in specs:
+        spec = spec.strip()
+        if spec.startswith('<'):
+            elements.add(spec.strip('<>/ '))
+        elif spec:
+            calls.add(spec.rstrip('( '))
+    return calls, elements
+
+
+def _callee(tokens, i: int) -> str:
+    """Dotted name called by the `(` at i ('i18n.t'), or '' for non-calls."""
+    parts, j = [], i - 1
+    while j >= 0 and tokens[j][0] == 'ident':
+        parts.append(tokens[j][1])
+        if j >= 2 and tokens[j - 1] == ('punct', '.', tokens[j - 1][2]):
+            j -= 2
         else:
-            keys.add(new_key)
-    return keys
+            break
+    return '.'.join(reversed(parts))
+
+
+def _is_text(text: str) -> bool:
+    return bool(TEXT_WORD.search(HTML_ENTITY.sub('', text)))
 
-def check_hardcoded_strings(project_path: Path) -> dict:
+
+def extract_script_strings(source: str, jsx: bool, calls: set, elements: set) -> list:
+    """
+    (offset, kind, text) of user-visible text in a JS/TS/JSX source: JSX text
+    nodes, text attributes (title, placeholder, ...) and sentence-like string
+    literals, except inside translation wrappers and ignored calls.
+    """
+    found = []
+    tokens = tokenize(source, jsx=jsx)
+    pairs = match_brackets(tokens)
+    skip_calls = calls | IGNORED_CALLS
+    call_stack = []     # close index of each enclosing wrapper/ignored call
+    element_stack = []  # names of the enclosing JSX elements
+    wrapped = 0         # enclosing wrapper elements (<Trans>) or <script>/<style>
+
+    for i, (kind, value, offset) in enumerate(tokens):
+        while call_stack and i > call_stack[-1]:
+            call_stack.pop()
+        if kind == 'punct' and value == '(' and i in pairs:
+            callee = _callee(tokens, i)
+            if callee in skip_calls or callee.endswith('Error') \
+                    or (i > 0 and tokens[i - 1][1] == 'import'):
+                call_stack.append(pairs[i])
+            continue
+        if kind == 'jsx_open':
+            element_stack.append(value)
+            wrapped += value in elements or value in ('script', 'style')
+            continue
+        if kind == 'jsx_close':
+            if element_stack:
+                name = element_stack.pop()
+                wrapped -= name in elements or name in ('script', 'style')
+            continue
+        if call_stack or wrapped:
+            continue
+
+        if kind == 'jsx_text':
+            if _is_text(value):
+                found.append((offset, 'text', value))
+        elif kind == 'string' and i > 0 and tokens[i - 1][0] == 'jsx_attr':
+            if tokens[i - 1][1] in TEXT_ATTRS and _is_text(value):
+                found.append((offset, 'attribute', value))
+        elif kind in ('string', 'template') and SENTENCE.match(value.strip()):
+            prev = tokens[i - 1][1] if i > 0 else ''
+            nxt = tokens[i + 1][1] if i + 1 < len(tokens) else ''
+            # Module specifiers, object keys and comparisons are not displayed
+            if prev in ('from', 'import', '===', '!==', '==', '!=', 'case') or nxt == ':' and prev in ('{', ','):
+                continue
+            # Fallback of a translation: t('key') || 'Default text'
+            if prev in ('||', '??') and tokens[i - 2][1] == ')' and i - 2 in pairs \
+                    and _callee(tokens, pairs[i - 2]) in calls:
+                continue
+            found.append((offset, 'string', value.strip()))
+    return found
+
+
+def extract_python_strings(source: str) -> list:
+    """(line, col, kind, text) of literal messages passed to print/flash or raised."""
+    found = []
+    for node in ast.walk(ast.parse(source)):
+        call = node.exc if isinstance(node, ast.Raise) else node
+        if not isinstance(call, ast.Call) or not call.args:
+            continue
+        func = call.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else ''
+        if isinstance(node, ast.Raise) or name in PY_TEXT_CALLS:
+            arg = call.args[0]
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str) and SENTENCE.match(arg.value.strip()):
+                found.append((arg.lineno, arg.col_offset + 1, 'string', arg.value.strip()))
+    return found
+
+
+def analyze_code_file(wrappers: tuple, path: str) -> dict:
+    """Hardcoded strings with 1-based line/column in one code file; runs in worker processes."""
+    try:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            source = f.read()
+    except OSError:
+        return {'i18n': False, 'strings': []}
+    has_i18n = any(re.search(p, source) for p in I18N_PATTERNS)
+    file_type = CODE_EXTENSIONS.get(Path(path).suffix, 'jsx')
+    if file_type == 'python':
+        try:
+            strings = extract_python_strings(source)
+        except (SyntaxError, ValueError, RecursionError):
+            strings = []
+    else:
+        calls, elements = parse_wrappers(wrappers)
+        positions = Positions(source)
+        try:
+            strings = [(*positions.at(offset), kind, text)
+                       for offset, kind, text in extract_script_strings(source, file_type != 'ts', calls, elements)]
+        except RecursionError:  # JSX nested deeper than the lexer can follow
+            strings = []
+    return {'i18n': has_i18n, 'strings': [[line, col, kind, text[:60]] for line, col, kind, text in sorted(strings)]}
+
+
+def check_hardcoded_strings(project_path: Path, wrappers=DEFAULT_WRAPPERS, jobs: int = 0,
+                            use_cache: bool = True, max_examples: int = MAX_EXAMPLES) -> dict:
     """Check for hardcoded strings in code files."""
     issues = []
     passed = []
-    
-    # Find code files
-    extensions = {
-        '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
-        '.vue': 'vue',
-        '.py': 'python'
-    }
-    
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
-    
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
-                  ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
-    
+
+    code_files = project_index(project_path).paths(exts=CODE_EXTENSIONS, skip_dirs=CODE_SKIP_DIRS)
+    code_files = [f for f in code_files if '.test.' not in f.name and '.spec.' not in f.name]
+
     if not code_files:
         return {'passed': ["[!] No code files found"], 'issues': []}
-    
-    files_with_i18n = 0
-    files_with_hardcoded = 0
-    hardcoded_examples = []
-    
-    for file_path in code_files[:50]:  # Limit
+
+    wrappers = tuple(sorted(set(wrappers)))
+    version = auditor_version(__file__, ts_tokenizer.__file__, *wrappers)
+    cache = ResultCache("i18n_strings", version) if use_cache else None
+    results = map_files(functools.partial(analyze_code_file, wrappers), [str(f) for f in code_files],
+                        jobs=jobs, cache=cache)
+
+    files_with_i18n = sum(1 for r in results if r['i18n'])
+    hardcoded = []
+    for f, result in zip(code_files, results):
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
-        except:
-            continue
-    
+            rel = f.relative_to(project_path).as_posix()
+        except ValueError:
+            rel = f.as_posix()
+        for line, col, kind, text in result['strings']:
+            hardcoded.append(f"{rel}:{line}:{col} {kind} \"{text}\"")
+    files_with_hardcoded = sum(1 for r in results if r['strings'])
+
     passed.append(f"[OK] Analyzed {len(code_files)} code files")
-    
+
     if files_with_i18n > 0:
         passed.append(f"[OK] {files_with_i18n} files use i18n")
-    
-    if files_with_hardcoded > 0:
-        issues.append(f"[X] {files_with_hardcoded} files may have hardcoded strings")
-        for ex in hardcoded_examples:
+
+    if hardcoded:
+        issues.append(f"[X] {len(hardcoded)} hardcoded strings in {files_with_hardcoded} files")
+        shown = hardcoded if max_examples is None else hardcoded[:max_examples]
+        for ex in shown:
             issues.append(f"   → {ex}")
+        if len(hardcoded) > len(shown):
+            issues.append(f"   ... and {len(hardcoded) - len(shown)} more (--all to list every one)")
     else:
         passed.append("[OK] No obvious hardcoded strings detected")
-    
+
     return {'passed': passed, 'issues': issues}
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    target = argv[1] if len(argv) > 1 else "."
     project_path = Path(target)
+    base_lang = argv[argv.index("--base-lang") + 1] if "--base-lang" in argv else None
+    jobs = int(argv[argv.index("--jobs") + 1]) if "--jobs" in argv else 0
+    use_cache = "--no-cache" not in argv
+    wrappers = DEFAULT_WRAPPERS
+    if "--allow" in argv:
+        wrappers += tuple(argv[argv.index("--allow") + 1].split(","))
+    max_examples = None if "--all" in argv else MAX_EXAMPLES
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
@@ -206,10 +447,10 @@ def main():
     
     # Check locale files
     locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
+    locale_result = check_locale_completeness(locale_files, base_lang, jobs, use_cache)
     
     # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    code_result = check_hardcoded_strings(project_path, wrappers, jobs, use_cache, max_examples)
     
     # Print results
     print("[LOCALE FILES]")
@@ -237,5 +478,10 @@ def main():
         print(f"[X] i18n CHECK: {critical_issues} issues found")
         sys.exit(1)
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    # The runner already runs checks side by side; audit this one in-process
+    return run_main(main, [__file__, project_path, "--jobs", "1"])
+
 if __name__ == "__main__":
     main()
@@ -17,6 +17,10 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -101,8 +105,9 @@ def run_linter(linter: dict, cwd: Path) -> dict:
     return result
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    project_path = Path(argv[1] if len(argv) > 1 else ".").resolve()
     
     print(f"\n{'='*60}")
     print(f"[LINT RUNNER] Unified Linting")
@@ -168,5 +173,10 @@ def main():
     sys.exit(0 if all_passed else 1)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
+
 if __name__ == "__main__":
     main()
@@ -2,12 +2,30 @@
 """
 Type Coverage Checker - Measures TypeScript/Python type coverage.
 Identifies untyped functions, any usage, and type safety issues.
+
+Usage:
+    python type_coverage.py <project_path> [--jobs N] [--no-cache]
+
+Every .py, .ts and .tsx file in the project is analyzed (build output and
+dependency directories are pruned by name, .d.ts files skipped):
+    - Python with `ast`: exact parameter/return annotation counts, Any in annotations
+    - TypeScript with a tokenizer that understands arrow functions, generics and JSX
+Files are analyzed in a process pool and each file's statistics are cached
+by content hash in .agent/.cache, so a re-run only re-reads changed files.
 """
+import ast
 import sys
 import re
-import subprocess
 from pathlib import Path
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit import ts_tokenizer
+from audit_kit.batch import ResultCache, auditor_version, map_files
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+from audit_kit.ts_tokenizer import match_brackets, tokenize
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,41 +33,310 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def check_typescript_coverage(project_path: Path) -> dict:
+SKIP_DIRS = {'node_modules', 'dist', 'build', 'out', '.next', 'coverage', 'venv', '.venv',
+             '__pycache__', 'site-packages', '.tox', '.mypy_cache'}
+
+ANALYZER_VERSION = auditor_version(__file__, ts_tokenizer.__file__)
+
+# ============================================================================
+#  PYTHON (ast)
+# ============================================================================
+
+def _count_any(annotation) -> int:
+    """'Any' references in an annotation, including string annotations."""
+    count = 0
+    for node in ast.walk(annotation):
+        if isinstance(node, ast.Name) and node.id == 'Any':
+            count += 1
+        elif isinstance(node, ast.Attribute) and node.attr == 'Any':
+            count += 1
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            count += len(re.findall(r'\bAny\b', node.value))
+    return count
+
+
+def _is_static(func) -> bool:
+    return any(isinstance(d, ast.Name) and d.id == 'staticmethod' for d in func.decorator_list)
+
+
+def analyze_python(source: str) -> dict:
+    """Annotation statistics for one Python module."""
+    stats = {'typed_functions': 0, 'untyped_functions': 0, 'any_count': 0,
+             'params': 0, 'annotated_params': 0, 'returns': 0, 'annotated_returns': 0}
+
+    def visit(node, in_class: bool):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                args = child.args
+                positional = args.posonlyargs + args.args
+                params = positional + args.kwonlyargs + [a for a in (args.vararg, args.kwarg) if a]
+                if in_class and positional and not _is_static(child):
+                    params = params[1:]  # self / cls
+                annotated = [p for p in params if p.annotation is not None]
+
+                stats['params'] += len(params)
+                stats['annotated_params'] += len(annotated)
+                if child.name != '__init__':
+                    stats['returns'] += 1
+                    stats['annotated_returns'] += child.returns is not None
+                if annotated or child.returns is not None:
+                    stats['typed_functions'] += 1
+                else:
+                    stats['untyped_functions'] += 1
+                for p in annotated:
+                    stats['any_count'] += _count_any(p.annotation)
+                if child.returns is not None:
+                    stats['any_count'] += _count_any(child.returns)
+                visit(child, False)
+            elif isinstance(child, ast.ClassDef):
+                visit(child, True)
+            else:
+                if isinstance(child, ast.AnnAssign):
+                    stats['any_count'] += _count_any(child.annotation)
+                visit(child, in_class)
+
+    visit(ast.parse(source), False)
+    return stats
+
+# ============================================================================
+#  TYPESCRIPT (tokenizer)
+# ============================================================================
+
+# Tokens after which an `any` identifier is in a type position
+_ANY_CONTEXT = {':', 'as', '<', '|', '&', ',', '=>', 'extends', 'keyof', '[', '('}
+
+# Tokens that end a variable binding when scanning back from its `=`
+_BINDING_STOP = {'const', 'let', 'var', ';', '{', '}', '(', ')', ','}
+
+
+def _is(tok, value) -> bool:
+    return tok[0] in ('punct', 'ident') and tok[1] == value
+
+
+def _angle_back(tokens, i: int) -> int:
+    """Index of the `<` matching the `>` at i, or -1."""
+    depth = 0
+    for j in range(i, max(i - 200, -1), -1):
+        if _is(tokens[j], '>'):
+            depth += 1
+        elif _is(tokens[j], '<'):
+            depth -= 1
+            if depth == 0:
+                return j
+    return -1
+
+
+def _split_params(tokens, pairs, start: int, end: int):
+    """Top-level parameter segments between the parens at start and end."""
+    segments, current, angle, i = [], [], 0, start + 1
+    while i < end:
+        tok = tokens[i]
+        if tok[0] == 'punct' and tok[1] in '([{' and i in pairs:
+            current.append((tok, 1))
+            i = pairs[i] + 1
+            continue
+        if _is(tok, '<'):
+            angle += 1
+        elif _is(tok, '>') and angle:
+            angle -= 1
+        if _is(tok, ',') and angle == 0:
+            segments.append(current)
+            current = []
+        else:
+            current.append((tok, angle))
+        i += 1
+    if current:
+        segments.append(current)
+    return segments
+
+
+def _param_typed(segment) -> bool:
+    """Annotated (`x: T`, `{a}: Props`) or defaulted (`x = 1`, type inferred)."""
+    return any(depth == 0 and tok[0] == 'punct' and tok[1] in (':', '=') for tok, depth in segment)
+
+
+def _arrow_after(tokens, pairs, close: int):
+    """
+    For the `)` at close: (is_arrow, has_return_type). Handles
+    `(..) => ...` and `(..): ReturnType<Generic> => ...`.
+    """
+    nxt = close + 1
+    if nxt >= len(tokens):
+        return False, False
+    if _is(tokens[nxt], '=>'):
+        return True, False
+    if not _is(tokens[nxt], ':'):
+        return False, False
+    i, angle, first = nxt + 1, 0, True
+    limit = min(len(tokens), nxt + 200)
+    while i < limit:
+        tok = tokens[i]
+        if tok[0] == 'punct':
+            value = tok[1]
+            if value == '=>' and angle == 0:
+                return True, True
+            if value == '{' and not first and angle == 0 and not _is(tokens[i - 1], '|') \
+                    and not _is(tokens[i - 1], '&'):
+                return False, False  # Function body, not an object type
+            if value in '([{' and i in pairs:
+                i, first = pairs[i] + 1, False
+                continue
+            if value == '<':
+                angle += 1
+            elif value == '>' and angle:
+                angle -= 1
+            elif value in (';', '=', ')', ']', '}') or (value == ',' and angle == 0):
+                return False, False
+        first = False
+        i += 1
+    return False, False
+
+
+def _binding_annotated(tokens, eq: int) -> bool:
+    """`const f: Handler = ...` / `onClick: Fn = ...`: the binding before `=` has a type."""
+    i = eq - 1
+    while i >= 0 and eq - i < 60:
+        tok = tokens[i]
+        if _is(tok, '>'):
+            j = _angle_back(tokens, i)
+            if j < 0:
+                return False
+            i = j - 1
+            continue
+        if _is(tok, ':'):
+            return True
+        if tok[1] in _BINDING_STOP and tok[0] in ('punct', 'ident'):
+            return False
+        i -= 1
+    return False
+
+
+def _declaration_eq(tokens, i: int) -> int:
+    """Index of the `=` binding the function whose params start at i, or -1 (callbacks etc.)."""
+    j = i - 1
+    if j >= 0 and _is(tokens[j], '>'):
+        j = _angle_back(tokens, j) - 1  # <T,>(...) =>
+    if j >= 0 and _is(tokens[j], 'async'):
+        j -= 1
+    return j if j >= 0 and _is(tokens[j], '=') else -1
+
+
+def analyze_typescript(source: str, jsx: bool = False) -> dict:
+    """
+    Function and `any` statistics for one TypeScript module. Counts function
+    declarations and arrow functions bound to a name; inline callbacks are
+    contextually typed by TypeScript and are not counted.
+    """
+    stats = {'any_count': 0, 'typed_functions': 0, 'untyped_functions': 0,
+             'params': 0, 'implicit_any_params': 0}
+    tokens = tokenize(source, jsx=jsx)
+    pairs = match_brackets(tokens)
+
+    def record(open_idx: int, close_idx: int, typed: bool):
+        segments = _split_params(tokens, pairs, open_idx, close_idx)
+        # As for Python: typed once any parameter or the return is annotated
+        typed = typed or any(tok[0] == 'punct' and tok[1] == ':' and depth == 0
+                             for segment in segments for tok, depth in segment)
+        stats['typed_functions' if typed else 'untyped_functions'] += 1
+        stats['params'] += len(segments)
+        if not typed:
+            stats['implicit_any_params'] += sum(1 for segment in segments if not _param_typed(segment))
+
+    n = len(tokens)
+    for i, tok in enumerate(tokens):
+        kind, value, _ = tok
+        if kind == 'ident':
+            if value == 'any' and i > 0 and tokens[i - 1][1] in _ANY_CONTEXT \
+                    and not (i + 1 < n and tokens[i + 1][1] in ('(', '.', ':')):
+                stats['any_count'] += 1
+            elif value == 'function':
+                j = i + 1
+                if j < n and _is(tokens[j], '*'):
+                    j += 1
+                if j < n and tokens[j][0] == 'ident':
+                    j += 1
+                if j < n and _is(tokens[j], '<'):
+                    depth = 0
+                    while j < n:
+                        depth += _is(tokens[j], '<') - _is(tokens[j], '>')
+                        j += 1
+                        if depth == 0:
+                            break
+                if j < n and _is(tokens[j], '(') and j in pairs:
+                    close = pairs[j]
+                    record(j, close, close + 1 < n and _is(tokens[close + 1], ':'))
+            elif i + 1 < n and _is(tokens[i + 1], '=>'):
+                # x => ... bound to a name
+                eq = _declaration_eq(tokens, i)
+                if eq >= 0:
+                    typed = _binding_annotated(tokens, eq)
+                    stats['typed_functions' if typed else 'untyped_functions'] += 1
+                    stats['params'] += 1
+                    stats['implicit_any_params'] += not typed
+        elif kind == 'punct' and value == '(' and i in pairs:
+            close = pairs[i]
+            is_arrow, has_return = _arrow_after(tokens, pairs, close)
+            if not is_arrow:
+                continue
+            eq = _declaration_eq(tokens, i)
+            if eq < 0:
+                continue
+            typed = has_return or _binding_annotated(tokens, eq)
+            record(i, close, typed)
+    return stats
+
+# ============================================================================
+#  FILES
+# ============================================================================
+
+def analyze_file(path: str) -> dict:
+    """Statistics for one .py/.ts/.tsx file; runs in worker processes."""
+    try:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            source = f.read()
+    except OSError:
+        return {'lang': None}
+    if path.endswith('.py'):
+        try:
+            return dict(analyze_python(source), lang='python', parsed=True)
+        except (SyntaxError, ValueError, RecursionError):
+            return {'lang': 'python', 'parsed': False}
+    try:
+        return dict(analyze_typescript(source, jsx=path.endswith('.tsx')), lang='typescript', parsed=True)
+    except RecursionError:  # JSX nested deeper than the lexer can follow
+        return {'lang': 'typescript', 'parsed': False}
+
+
+def analyze_files(paths, jobs: int = 0, use_cache: bool = True) -> list:
+    cache = ResultCache("type_coverage", ANALYZER_VERSION) if use_cache else None
+    return map_files(analyze_file, [str(p) for p in paths], jobs=jobs, cache=cache)
+
+
+def _totals(results: list, keys) -> dict:
+    totals = {key: 0 for key in keys}
+    for result in results:
+        for key in keys:
+            totals[key] += result.get(key, 0)
+    return totals
+
+
+def check_typescript_coverage(project_path: Path, jobs: int = 0, use_cache: bool = True) -> dict:
     """Check TypeScript type coverage."""
     issues = []
     passed = []
-    stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
-    
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
-    ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
-    
+
+    ts_files = project_index(project_path).paths(exts={'.ts', '.tsx'}, skip_dirs=SKIP_DIRS)
+    ts_files = [f for f in ts_files if not f.name.endswith('.d.ts')]
+
     if not ts_files:
+        stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
         return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"], 'stats': stats}
-    
-    for file_path in ts_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count 'any' usage
-            any_matches = re.findall(r':\s*any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions without return types
-            # function name(params) { - no return type
-            untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
-            # Arrow functions without types: const fn = (x) => or (x) =>
-            untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
-            stats['untyped_functions'] += len(untyped)
-            
-            # Count typed functions
-            typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
-            typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
-            stats['total_functions'] += len(typed) + len(untyped)
-            
-        except Exception:
-            continue
-    
+
+    results = analyze_files(ts_files, jobs, use_cache)
+    stats = _totals(results, ('any_count', 'typed_functions', 'untyped_functions', 'params', 'implicit_any_params'))
+    unparsed = sum(1 for r in results if r.get('parsed') is False)
+    stats['total_functions'] = stats['typed_functions'] + stats['untyped_functions']
+
     # Analyze results
     if stats['any_count'] == 0:
         passed.append("[OK] No 'any' types found")
@@ -57,54 +344,44 @@ def check_typescript_coverage(project_path: Path) -> dict:
         issues.append(f"[!] {stats['any_count']} 'any' types found (acceptable)")
     else:
         issues.append(f"[X] {stats['any_count']} 'any' types found (too many)")
-    
+
     if stats['total_functions'] > 0:
-        typed_ratio = (stats['total_functions'] - stats['untyped_functions']) / stats['total_functions'] * 100
+        typed_ratio = stats['typed_functions'] / stats['total_functions'] * 100
         if typed_ratio >= 80:
             passed.append(f"[OK] Type coverage: {typed_ratio:.0f}%")
         elif typed_ratio >= 50:
             issues.append(f"[!] Type coverage: {typed_ratio:.0f}% (improve)")
         else:
             issues.append(f"[X] Type coverage: {typed_ratio:.0f}% (too low)")
-    
+
+    if stats['implicit_any_params']:
+        issues.append(f"[!] {stats['implicit_any_params']} of {stats['params']} parameters implicitly 'any'")
+
+    if unparsed:
+        issues.append(f"[!] {unparsed} TypeScript files could not be parsed")
+
     passed.append(f"[OK] Analyzed {len(ts_files)} TypeScript files")
-    
+
     return {'type': 'typescript', 'files': len(ts_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def check_python_coverage(project_path: Path) -> dict:
+def check_python_coverage(project_path: Path, jobs: int = 0, use_cache: bool = True) -> dict:
     """Check Python type hints coverage."""
     issues = []
     passed = []
-    stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
-    
-    py_files = list(project_path.rglob("*.py"))
-    py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
-    
+
+    py_files = project_index(project_path).paths(exts={'.py'}, skip_dirs=SKIP_DIRS)
+
     if not py_files:
+        stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
         return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"], 'stats': stats}
-    
-    for file_path in py_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count Any usage
-            any_matches = re.findall(r':\s*Any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions with type hints
-            typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
-            typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
-            stats['typed_functions'] += len(typed_funcs)
-            
-            # Find functions without type hints
-            all_funcs = re.findall(r'def\s+\w+\s*\(', content)
-            stats['untyped_functions'] += len(all_funcs) - len(typed_funcs)
-            
-        except Exception:
-            continue
-    
+
+    results = analyze_files(py_files, jobs, use_cache)
+    stats = _totals(results, ('typed_functions', 'untyped_functions', 'any_count',
+                              'params', 'annotated_params', 'returns', 'annotated_returns'))
+    unparsed = sum(1 for r in results if r.get('parsed') is False)
+
     total = stats['typed_functions'] + stats['untyped_functions']
-    
+
     if total > 0:
         typed_ratio = stats['typed_functions'] / total * 100
         if typed_ratio >= 70:
@@ -113,42 +390,63 @@ def check_python_coverage(project_path: Path) -> dict:
             issues.append(f"[!] Type hints coverage: {typed_ratio:.0f}%")
         else:
             issues.append(f"[X] Type hints coverage: {typed_ratio:.0f}% (add type hints)")
-    
+
+    slots = stats['params'] + stats['returns']
+    if slots:
+        annotated = stats['annotated_params'] + stats['annotated_returns']
+        annotated_ratio = annotated / slots * 100
+        detail = (f"{annotated_ratio:.0f}% of parameters and returns "
+                  f"({stats['annotated_params']}/{stats['params']} params, "
+                  f"{stats['annotated_returns']}/{stats['returns']} returns)")
+        if annotated_ratio >= 70:
+            passed.append(f"[OK] Annotated: {detail}")
+        elif annotated_ratio >= 40:
+            issues.append(f"[!] Annotated: {detail}")
+        else:
+            issues.append(f"[X] Annotated: {detail}")
+
     if stats['any_count'] == 0:
         passed.append("[OK] No 'Any' types found")
     elif stats['any_count'] <= 3:
         issues.append(f"[!] {stats['any_count']} 'Any' types found")
     else:
         issues.append(f"[X] {stats['any_count']} 'Any' types found")
-    
+
+    if unparsed:
+        issues.append(f"[!] {unparsed} Python files could not be parsed")
+
     passed.append(f"[OK] Analyzed {len(py_files)} Python files")
-    
+
     return {'type': 'python', 'files': len(py_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    target = args[0] if args else "."
     project_path = Path(target)
-    
+    jobs = int(argv[argv.index("--jobs") + 1]) if "--jobs" in argv else 0
+    use_cache = "--no-cache" not in argv
+
     print("\n" + "=" * 60)
     print("  TYPE COVERAGE CHECKER")
     print("=" * 60 + "\n")
-    
+
     results = []
-    
+
     # Check TypeScript
-    ts_result = check_typescript_coverage(project_path)
+    ts_result = check_typescript_coverage(project_path, jobs, use_cache)
     if ts_result['files'] > 0:
         results.append(ts_result)
-    
+
     # Check Python
-    py_result = check_python_coverage(project_path)
+    py_result = check_python_coverage(project_path, jobs, use_cache)
     if py_result['files'] > 0:
         results.append(py_result)
-    
+
     if not results:
         print("[!] No TypeScript or Python files found.")
         sys.exit(0)
-    
+
     # Print results
     critical_issues = 0
     for result in results:
@@ -160,7 +458,7 @@ def main():
             print(f"  {item}")
             if item.startswith("[X]"):
                 critical_issues += 1
-    
+
     print("\n" + "=" * 60)
     if critical_issues == 0:
         print("[OK] TYPE COVERAGE: ACCEPTABLE")
@@ -169,5 +467,10 @@ def main():
         print(f"[X] TYPE COVERAGE: {critical_issues} critical issues")
         sys.exit(1)
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    # The runner already runs checks side by side; analyze this one in-process
+    return run_main(main, [__file__, project_path, "--jobs", "1"])
+
 if __name__ == "__main__":
     main()
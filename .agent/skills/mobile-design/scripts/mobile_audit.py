@@ -71,6 +71,16 @@ import re
 import json
 from pathlib import Path
 
+# Shared audit engine lives in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.batch import ResultCache, audit_files, auditor_version, merge_results
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+from audit_kit.profiler import profiler_from_argv
+
+# Cached per-file results are reused only while this script is unchanged
+AUDITOR_VERSION = auditor_version(__file__)
+
 class MobileAuditor:
     def __init__(self):
         self.issues = []
@@ -610,13 +620,13 @@ class MobileAuditor:
             # This is more of a configuration check, not code pattern
             self.passed_count += 1  # Hermes is default in RN 0.70+
 
-    def audit_directory(self, directory: str) -> None:
+    def audit_directory(self, directory: str, jobs: int = 0, use_cache: bool = True) -> None:
         extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        paths = [str(p) for p in project_index(directory).paths(
+            exts=extensions, skip_dirs={'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', '.idea'})]
+
+        cache = ResultCache("mobile_audit", AUDITOR_VERSION) if use_cache else None
+        merge_results(self, audit_files(MobileAuditor, paths, jobs=jobs, cache=cache))
 
     def get_report(self):
         return {
@@ -628,19 +638,26 @@ class MobileAuditor:
         }
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python mobile_audit.py <directory>")
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2:
+        print("Usage: python mobile_audit.py <directory> [--json] [--jobs N] [--no-cache] [--profile[=trace.json]]")
         sys.exit(1)
 
-    path = sys.argv[1]
-    is_json = "--json" in sys.argv
+    path = argv[1]
+    is_json = "--json" in argv
+    jobs = int(argv[argv.index("--jobs") + 1]) if "--jobs" in argv else 0
+    profiler = profiler_from_argv("mobile_audit", argv)
+    if profiler:
+        # Profile in-process and uncached so every rule actually runs here
+        profiler.install(sys.modules[__name__], MobileAuditor, "audit_file")
+        jobs = 1
 
     auditor = MobileAuditor()
     if os.path.isfile(path):
         auditor.audit_file(path)
     else:
-        auditor.audit_directory(path)
+        auditor.audit_directory(path, jobs=jobs, use_cache=not profiler and "--no-cache" not in argv)
 
     report = auditor.get_report()
 
@@ -664,6 +681,11 @@ def main():
     sys.exit(0 if report['compliant'] else 1)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    # The runner already runs checks side by side; audit this one in-process
+    return run_main(main, [__file__, project_path, "--jobs", "1"])
+
 if __name__ == "__main__":
     # Fix missing import
     import re
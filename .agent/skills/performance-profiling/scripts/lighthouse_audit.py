@@ -12,6 +12,11 @@ import json
 import sys
 import os
 import tempfile
+from pathlib import Path
+
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.plugin import run_main
 
 def run_lighthouse(url: str) -> dict:
     """Run Lighthouse audit on URL."""
@@ -67,10 +72,18 @@ def get_summary(categories: dict) -> str:
     else:
         return "[X] Poor performance"
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2:
         print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
         sys.exit(1)
     
-    result = run_lighthouse(sys.argv[1])
+    result = run_lighthouse(argv[1])
     print(json.dumps(result, indent=2))
+
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, context.get("url") or project_path])
+
+if __name__ == "__main__":
+    main()
@@ -15,14 +15,20 @@ WHAT IT CHECKS:
     - Only files that are likely PUBLIC pages
 
 Usage:
-    python seo_checker.py <project_path>
+    python seo_checker.py <project_path> [--profile[=trace.json]]
 """
 import sys
 import json
-import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.page_model import load_pages
+from audit_kit.profiler import profiler_from_argv
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -77,67 +83,57 @@ def is_page_file(file_path: Path) -> bool:
 
 def find_pages(project_path: Path) -> list:
     """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
+    candidates = project_index(project_path).paths(exts={'.html', '.htm', '.jsx', '.tsx'}, skip_dirs=SKIP_DIRS)
+    
+    # Keep files that are likely pages
+    files = [f for f in candidates if is_page_file(f)]
     
     return files[:50]  # Limit to 50 files
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, doc: dict = None) -> dict:
     """Check a single page for SEO issues."""
     issues = []
     
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-    except Exception as e:
-        return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
+    if doc is None:
+        doc = load_pages([file_path])[0]
+    if "error" in doc:
+        return {"file": str(file_path.name), "issues": [f"Error: {doc['error']}"]}
     
     # Detect if this is a layout/template file (has Head component)
-    is_layout = 'Head>' in content or '<head' in content.lower()
+    is_layout = doc["head"]
     
     # 1. Title tag
-    has_title = '<title' in content.lower() or 'title=' in content or 'Head>' in content
+    has_title = doc["title"] is not None or any("title" in attrs for _, attrs, _ in doc["elements"])
     if not has_title and is_layout:
         issues.append("Missing <title> tag")
     
     # 2. Meta description
-    has_description = 'name="description"' in content.lower() or 'name=\'description\'' in content.lower()
+    has_description = any(str(meta.get("name", "")).lower() == "description" for meta in doc["meta"])
     if not has_description and is_layout:
         issues.append("Missing meta description")
     
     # 3. Open Graph tags
-    has_og = 'og:' in content or 'property="og:' in content.lower()
+    has_og = any(str(meta.get("property") or meta.get("name") or "").startswith("og:") for meta in doc["meta"])
     if not has_og and is_layout:
         issues.append("Missing Open Graph tags")
     
     # 4. Heading hierarchy - multiple H1s
-    h1_matches = re.findall(r'<h1[^>]*>', content, re.I)
-    if len(h1_matches) > 1:
-        issues.append(f"Multiple H1 tags ({len(h1_matches)})")
+    h1_count = sum(1 for level, _, _ in doc["headings"] if level == 1)
+    if h1_count > 1:
+        issues.append(f"Multiple H1 tags ({h1_count})")
     
     # 5. Images without alt
-    img_pattern = r'<img[^>]+>'
-    imgs = re.findall(img_pattern, content, re.I)
-    for img in imgs:
-        if 'alt=' not in img.lower():
+    for img in doc["images"]:
+        if img["alt"] is None:
             issues.append("Image missing alt attribute")
             break
-        if 'alt=""' in img or "alt=''" in img:
+        if img["alt"] == "":
             issues.append("Image has empty alt attribute")
             break
     
     # 6. Check for canonical link (nice to have)
-    # has_canonical = 'rel="canonical"' in content.lower()
+    # has_canonical = any(attrs.get("rel") == "canonical" for tag, attrs, _ in doc["elements"] if tag == "link")
     
     return {
         "file": str(file_path.name),
@@ -145,8 +141,17 @@ def check_page(file_path: Path) -> dict:
     }
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    args = [a for a in argv[1:] if not a.startswith("--")]
+    project_path = Path(args[0] if args else ".").resolve()
+    profiler = profiler_from_argv("seo_checker", argv)
+    if profiler:
+        module = sys.modules[__name__]
+        profiler.install(module, module, "check_page")
+        # The page regexes run inside page_model, so time the parse and check stages
+        profiler.time_stage(module, "load_pages", "parse (page_model)")
+        profiler.time_stage(module, "check_page", "check")
     
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
@@ -167,10 +172,10 @@ def main():
     
     print(f"Found {len(pages)} page files to analyze\n")
     
-    # Check each page
+    # Check each page (models are shared with the other page checkers)
     all_issues = []
-    for f in pages:
-        result = check_page(f)
+    for f, doc in zip(pages, load_pages(pages)):
+        result = check_page(f, doc)
         if result["issues"]:
             all_issues.append(result)
     
@@ -215,5 +220,10 @@ def main():
     sys.exit(0 if passed else 1)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
+
 if __name__ == "__main__":
     main()
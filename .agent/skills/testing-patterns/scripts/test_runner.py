@@ -17,6 +17,10 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.plugin import run_main
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -137,9 +141,10 @@ def run_tests(cmd: list, cwd: Path) -> dict:
     return result
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    with_coverage = "--coverage" in sys.argv
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    project_path = Path(argv[1] if len(argv) > 1 else ".").resolve()
+    with_coverage = "--coverage" in argv
     
     print(f"\n{'='*60}")
     print(f"[TEST RUNNER] Unified Test Execution")
@@ -215,5 +220,10 @@ def main():
     sys.exit(0 if result["passed"] else 1)
 
 
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
+
+
 if __name__ == "__main__":
     main()
@@ -22,6 +22,12 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.file_index import project_index
+from audit_kit.plugin import run_main
+from audit_kit.regex_guard import GuardedRegex, ScanCoverage
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -85,6 +91,12 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+# Compiled once. Patterns with backtracking risks (e.g. the SQL concat rule)
+# scan capped lines and are disabled if they overrun their time budget; the
+# scan then reports itself as incomplete (see audit_kit.regex_guard.ScanCoverage).
+SECRET_RULES = [(GuardedRegex(p, re.IGNORECASE, name=t), t, sev) for p, t, sev in SECRET_PATTERNS]
+DANGEROUS_RULES = [(GuardedRegex(p, re.IGNORECASE, name=n), n, sev, cat) for p, n, sev, cat in DANGEROUS_PATTERNS]
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
@@ -178,6 +190,19 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
+def mark_coverage(results: Dict[str, Any], coverage: ScanCoverage) -> None:
+    """Attach what the guarded rules skipped; an incomplete scan is not reported as clean."""
+    results["coverage"] = coverage.report()
+    if coverage.complete:
+        return
+    skipped = []
+    if coverage.tripped:
+        skipped.append(f"rules disabled: {', '.join(coverage.tripped)}")
+    if coverage.capped_lines:
+        skipped.append(f"{coverage.capped_lines} long lines only partly scanned")
+    results["status"] += f" (INCOMPLETE: {'; '.join(skipped)})"
+
+
 def scan_secrets(project_path: str) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
@@ -190,35 +215,31 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         "scanned_files": 0,
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
+    coverage = ScanCoverage(rule for rule, _, _ in SECRET_RULES)
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in project_index(project_path).paths(exts=CODE_EXTENSIONS | CONFIG_EXTENSIONS, skip_dirs=SKIP_DIRS):
+        results["scanned_files"] += 1
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+                relpath = str(filepath.relative_to(project_path))
+                coverage.add_file(relpath, content)
                 
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+                for rule, secret_type, severity in SECRET_RULES:
+                    matches = rule.findall(content)
+                    if matches:
+                        results["findings"].append({
+                            "file": str(filepath.relative_to(project_path)),
+                            "type": secret_type,
+                            "severity": severity,
+                            "count": len(matches)
+                        })
+                        results["by_severity"][severity] += len(matches)
+                coverage.after_file(relpath)
+                        
+        except Exception:
+            pass
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -226,6 +247,7 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         results["status"] = "[!] HIGH: Secrets found"
     elif sum(results["by_severity"].values()) > 0:
         results["status"] = "[?] Potential secrets detected"
+    mark_coverage(results, coverage)
     
     # Limit findings for output
     results["findings"] = results["findings"][:15]
@@ -245,37 +267,33 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         "scanned_files": 0,
         "by_category": {}
     }
+    coverage = ScanCoverage(rule for rule, _, _, _ in DANGEROUS_RULES)
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in project_index(project_path).paths(exts=CODE_EXTENSIONS, skip_dirs=SKIP_DIRS):
+        results["scanned_files"] += 1
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = f.readlines()
+                relpath = str(filepath.relative_to(project_path))
+                coverage.add_file(relpath, "".join(lines))
                 
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+                for line_num, line in enumerate(lines, 1):
+                    for rule, name, severity, category in DANGEROUS_RULES:
+                        if rule.search(line):
+                            results["findings"].append({
+                                "file": str(filepath.relative_to(project_path)),
+                                "line": line_num,
+                                "pattern": name,
+                                "severity": severity,
+                                "category": category,
+                                "snippet": line.strip()[:80]
+                            })
+                            results["by_category"][category] = results["by_category"].get(category, 0) + 1
+                coverage.after_file(relpath)
+                            
+        except Exception:
+            pass
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -286,6 +304,7 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         results["status"] = f"[!] HIGH: {high_count} risky patterns"
     elif results["findings"]:
         results["status"] = "[?] Some patterns need review"
+    mark_coverage(results, coverage)
     
     # Limit findings
     results["findings"] = results["findings"][:20]
@@ -315,30 +334,24 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
     ]
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    for filepath in project_index(project_path).paths(skip_dirs=SKIP_DIRS):
+        if filepath.suffix.lower() not in CONFIG_EXTENSIONS and filepath.name not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+            continue
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
                 
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+                for pattern, issue, severity in config_issues:
+                    if re.search(pattern, content, re.IGNORECASE):
+                        results["findings"].append({
+                            "file": str(filepath.relative_to(project_path)),
+                            "issue": issue,
+                            "severity": severity
+                        })
+                        
+        except Exception:
+            pass
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
@@ -381,6 +394,7 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
             "total_findings": 0,
             "critical": 0,
             "high": 0,
+            "incomplete": [],
             "overall_status": "[OK] SECURE"
         }
     }
@@ -397,6 +411,9 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
             result = scanner(project_path)
             report["scans"][name] = result
             
+            if not result.get("coverage", {}).get("complete", True):
+                report["summary"]["incomplete"].append(name)
+            
             findings_count = len(result.get("findings", []))
             report["summary"]["total_findings"] += findings_count
             
@@ -414,11 +431,13 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         report["summary"]["overall_status"] = "[!] HIGH RISK ISSUES"
     elif report["summary"]["total_findings"] > 0:
         report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
+    elif report["summary"]["incomplete"]:
+        report["summary"]["overall_status"] = "[?] INCOMPLETE SCAN"
     
     return report
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Validate security principles from vulnerability-scanner skill"
     )
@@ -428,7 +447,7 @@ def main():
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
     
-    args = parser.parse_args()
+    args = parser.parse_args(None if argv is None else argv[1:])
     
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
@@ -444,14 +463,31 @@ def main():
         print(f"Total Findings: {result['summary']['total_findings']}")
         print(f"  Critical: {result['summary']['critical']}")
         print(f"  High: {result['summary']['high']}")
+        if result['summary']['incomplete']:
+            print(f"Incomplete: {', '.join(result['summary']['incomplete'])} (see coverage below)")
         print(f"{'='*60}\n")
         
         for scan_name, scan_result in result['scans'].items():
             print(f"\n{scan_name.upper()}: {scan_result['status']}")
             for finding in scan_result.get('findings', [])[:5]:
                 print(f"  - {finding}")
+            coverage = scan_result.get('coverage', {})
+            for rule in coverage.get('tripped_rules', []):
+                print(f"  ! rule disabled: {rule['rule']} (over {rule['budget']:.1f}s on {rule['tripped_on']}, "
+                      f"{rule['files_skipped']} later files not checked)")
+            for capped in coverage.get('capped_files', [])[:5]:
+                print(f"  ! {capped['file']}: {capped['count']} long lines only partly scanned")
     else:
         print(json.dumps(result, indent=2))
+    
+    # Rules that were disabled or saw truncated lines leave the verdict open
+    if result['summary']['incomplete']:
+        sys.exit(1)
+
+
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, project_path])
 
 
 if __name__ == "__main__":
@@ -13,6 +13,11 @@ import json
 import os
 import tempfile
 from datetime import datetime
+from pathlib import Path
+
+# Shared audit helpers live in .agent/.shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared"))
+from audit_kit.plugin import run_main
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -149,8 +154,9 @@ def run_accessibility_check(url: str) -> dict:
     return result
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2:
         print(json.dumps({
             "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]",
             "examples": [
@@ -161,9 +167,9 @@ if __name__ == "__main__":
         }, indent=2))
         sys.exit(1)
     
-    url = sys.argv[1]
-    take_screenshot = "--screenshot" in sys.argv
-    check_a11y = "--a11y" in sys.argv
+    url = argv[1]
+    take_screenshot = "--screenshot" in argv
+    check_a11y = "--a11y" in argv
     
     if check_a11y:
         result = run_accessibility_check(url)
@@ -171,3 +177,12 @@ if __name__ == "__main__":
         result = run_basic_test(url, take_screenshot)
     
     print(json.dumps(result, indent=2))
+
+
+def run(project_path: str, context: dict) -> dict:
+    """Plugin entry point for verify_all and checklist (see audit_kit.plugin)."""
+    return run_main(main, [__file__, context.get("url") or project_path])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Local S3-compatible stand-in for R2, backed by a directory.
+
+    python .github/scripts/local_s3.py [--root DIR] [--port 9000]
+    R2_ENDPOINT_URL=http://127.0.0.1:9000 R2_ACCESS_KEY_ID=local R2_SECRET_ACCESS_KEY=local \\
+        python .github/scripts/r2_release_helper.py upload
+
+or in-process:
+
+    server = start_server()          # temp directory, free port
+    os.environ["R2_ENDPOINT_URL"] = server.url
+    ...
+    server.stop()
+
+Implements the part of the S3 API that r2_release_helper.py and boto3's
+transfer manager use: buckets, PutObject/GetObject (with Range)/HeadObject/
+DeleteObject, DeleteObjects, ListObjectsV2 and multipart uploads, plus
+conditional PutObject (If-Match / If-None-Match, 412 on failure). ETags are
+computed like S3's (MD5, or MD5 of the part MD5s with a -N suffix), so the
+skip-unchanged logic behaves as against R2. Signatures are not checked.
+Request bodies are streamed to disk, never held in memory whole.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+COPY_CHUNK = 1024 * 1024
+S3_NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+def _xml(root, *children, namespace=S3_NS):
+    """<root xmlns=S3>children</root> from (tag, text) pairs or nested lists."""
+    element = ET.Element(root, xmlns=namespace) if namespace else ET.Element(root)
+
+    def add(parent, items):
+        for tag, value in items:
+            child = ET.SubElement(parent, tag)
+            if isinstance(value, list):
+                add(child, value)
+            else:
+                child.text = str(value)
+
+    add(element, children)
+    return b'<?xml version="1.0" encoding="UTF-8"?>' + ET.tostring(element)
+
+
+class _Body:
+    """File-like reader over a request body: Content-Length bounded or HTTP chunked."""
+
+    def __init__(self, rfile, headers):
+        self.rfile = rfile
+        self.chunked = "chunked" in headers.get("Transfer-Encoding", "").lower()
+        self.left = 0 if self.chunked else int(headers.get("Content-Length") or 0)
+        self.done = False
+        self.buffer = b""
+
+    def _fill(self):
+        if self.chunked:
+            size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while self.rfile.readline().strip():
+                    pass  # trailers
+                self.done = True
+                return
+            self.buffer += self.rfile.read(size)
+            self.rfile.readline()
+        else:
+            data = self.rfile.read(min(self.left, COPY_CHUNK))
+            self.left -= len(data)
+            self.buffer += data
+            self.done = not data or self.left == 0
+
+    def read(self, size=COPY_CHUNK):
+        while len(self.buffer) < size and not self.done:
+            self._fill()
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self):
+        while b"\n" not in self.buffer and not self.done:
+            self._fill()
+        end = self.buffer.find(b"\n") + 1 or len(self.buffer)
+        line, self.buffer = self.buffer[:end], self.buffer[end:]
+        return line
+
+
+def _payload(body, headers):
+    """Chunks of the object data, undoing aws-chunked framing (botocore's streaming checksums)."""
+    aws_chunked = ("aws-chunked" in headers.get("Content-Encoding", "")
+                   or headers.get("x-amz-content-sha256", "").startswith("STREAMING-"))
+    if not aws_chunked:
+        while True:
+            data = body.read()
+            if not data:
+                return
+            yield data
+    while True:
+        size = int(body.readline().split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            return  # trailing checksum headers follow; not verified
+        while size:
+            data = body.read(min(size, COPY_CHUNK))
+            if not data:
+                return
+            size -= len(data)
+            yield data
+        body.readline()
+
+
+class LocalS3Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root, address):
+        super().__init__(address, _Handler)
+        self.root = root
+        self.url = f"http://{address[0]}:{self.server_address[1]}"
+        self.owns_root = False
+        self.commit_lock = threading.Lock()  # precondition check + swap of an object are one step
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self.owns_root:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    # Storage layout: <root>/<bucket>/objects/<quoted key> holds the data and
+    # <root>/<bucket>/meta/<quoted key> its size/etag/headers (written last, so
+    # an object exists once its meta does); multipart parts under <root>/.uploads/<id>/
+    def object_path(self, bucket, key):
+        return os.path.join(self.root, bucket, "objects", quote(key, safe=""))
+
+    def meta_path(self, bucket, key):
+        return os.path.join(self.root, bucket, "meta", quote(key, safe=""))
+
+    def upload_dir(self, upload_id):
+        return os.path.join(self.root, ".uploads", os.path.basename(upload_id))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "LocalS3"
+
+    def log_message(self, format, *args):
+        pass
+
+    # ---- plumbing --------------------------------------------------------
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        bucket, _, key = unquote(parts.path).lstrip("/").partition("/")
+        return bucket, key
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body or "Content-Length" not in (headers or {}):
+            self.send_header("Content-Length", str(len(body)))
+        if body and not (headers or {}).get("Content-Type"):
+            self.send_header("Content-Type", "application/xml")
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status, code, message=""):
+        self._drain()
+        self._send(status, b"" if self.command == "HEAD" else _xml("Error", ("Code", code), ("Message", message), namespace=None))
+
+    def _drain(self):
+        if not getattr(self, "drained", False):
+            self.drained = True
+            for _ in _payload(_Body(self.rfile, self.headers), {}):
+                pass
+
+    def _receive_tmp(self, path):
+        """Stream the request payload into a temp file next to path; returns (tmp, size, md5 hex)."""
+        self.drained = True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        md5 = hashlib.md5()
+        size = 0
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            for data in _payload(_Body(self.rfile, self.headers), self.headers):
+                md5.update(data)
+                size += len(data)
+                f.write(data)
+        return tmp, size, md5.hexdigest()
+
+    def _receive(self, path):
+        """Stream the request payload into path (atomically); returns (size, md5 hex)."""
+        tmp, size, md5 = self._receive_tmp(path)
+        os.replace(tmp, path)
+        return size, md5
+
+    def _failed_precondition(self, bucket, key):
+        """The If-Match/If-None-Match header that the key's current ETag fails, or None."""
+        meta = self._load_meta(bucket, key)
+        etag = meta["etag"] if meta else None
+        if_match = self.headers.get("If-Match")
+        if if_match and (etag is None or if_match.strip().strip('"') not in ("*", etag)):
+            return "If-Match"
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and etag is not None and if_none_match.strip().strip('"') in ("*", etag):
+            return "If-None-Match"
+        return None
+
+    def _object_headers(self):
+        headers = {name: self.headers[name] for name in ("Content-Type", "Cache-Control") if self.headers.get(name)}
+        headers.update({name.lower(): value for name, value in self.headers.items()
+                        if name.lower().startswith("x-amz-meta-")})
+        return headers
+
+    def _store_meta(self, bucket, key, size, etag, headers):
+        path = self.server.meta_path(bucket, key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"size": size, "etag": etag, "headers": headers, "modified": time.time()}, f)
+        os.replace(tmp, path)
+
+    def _load_meta(self, bucket, key):
+        try:
+            with open(self.server.meta_path(bucket, key)) as f:
+                return json.load(f)
+        except OSError:
+            return None
+
+    def _bucket_exists(self, bucket):
+        return os.path.isdir(os.path.join(self.server.root, bucket))
+
+    # ---- verbs -----------------------------------------------------------
+
+    def do_PUT(self):
+        bucket, key = self._route()
+        if not key:
+            for area in ("objects", "meta"):
+                os.makedirs(os.path.join(self.server.root, bucket, area), exist_ok=True)
+            self._drain()
+            return self._send(200)
+        if not self._bucket_exists(bucket):
+            return self._error(404, "NoSuchBucket", bucket)
+        if "uploadId" in self.query:
+            upload_dir = self.server.upload_dir(self.query["uploadId"])
+            if not os.path.isdir(upload_dir):
+                return self._error(404, "NoSuchUpload", self.query["uploadId"])
+            part = os.path.join(upload_dir, "%05d" % int(self.query["partNumber"]))
+            _, md5 = self._receive(part)
+            with open(part + ".md5", "w") as f:
+                f.write(md5)
+            return self._send(200, headers={"ETag": f'"{md5}"'})
+        path = self.server.object_path(bucket, key)
+        tmp, size, md5 = self._receive_tmp(path)
+        with self.server.commit_lock:
+            failed = self._failed_precondition(bucket, key)
+            if failed:
+                os.remove(tmp)
+                return self._error(412, "PreconditionFailed", f"{failed} precondition failed")
+            os.replace(tmp, path)
+            self._store_meta(bucket, key, size, md5, self._object_headers())
+        self._send(200, headers={"ETag": f'"{md5}"'})
+
+    def do_POST(self):
+        bucket, key = self._route()
+        if not self._bucket_exists(bucket):
+            return self._error(404, "NoSuchBucket", bucket)
+        if "delete" in self.query:
+            request = ET.fromstring(b"".join(_payload(_Body(self.rfile, self.headers), self.headers)))
+            self.drained = True
+            deleted = []
+            for obj in request.findall(".//{*}Object"):
+                name = obj.find("{*}Key").text
+                self._remove(bucket, name)
+                deleted.append(("Deleted", [("Key", name)]))
+            return self._send(200, _xml("DeleteResult", *deleted))
+        if "uploads" in self.query:
+            self._drain()
+            upload_id = uuid.uuid4().hex
+            upload_dir = self.server.upload_dir(upload_id)
+            os.makedirs(upload_dir)
+            with open(os.path.join(upload_dir, "upload.json"), "w") as f:
+                json.dump({"bucket": bucket, "key": key, "headers": self._object_headers()}, f)
+            return self._send(200, _xml("InitiateMultipartUploadResult",
+                                        ("Bucket", bucket), ("Key", key), ("UploadId", upload_id)))
+        if "uploadId" in self.query:
+            return self._complete(bucket, key, self.query["uploadId"])
+        self._error(400, "InvalidRequest", "unsupported POST")
+
+    def _complete(self, bucket, key, upload_id):
+        request = ET.fromstring(b"".join(_payload(_Body(self.rfile, self.headers), self.headers)))
+        self.drained = True
+        upload_dir = self.server.upload_dir(upload_id)
+        if not os.path.isdir(upload_dir):
+            return self._error(404, "NoSuchUpload", upload_id)
+        with open(os.path.join(upload_dir, "upload.json")) as f:
+            upload = json.load(f)
+        numbers = [int(part.find("{*}PartNumber").text) for part in request.findall(".//{*}Part")]
+        path = self.server.object_path(bucket, key)
+        tmp = f"{path}.{upload_id}.tmp"
+        digests = []
+        size = 0
+        with open(tmp, "wb") as out:
+            for number in numbers:
+                part = os.path.join(upload_dir, "%05d" % number)
+                if not os.path.exists(part):
+                    out.close()
+                    os.remove(tmp)
+                    return self._error(400, "InvalidPart", str(number))
+                with open(part + ".md5") as f:
+                    digests.append(bytes.fromhex(f.read()))
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, out, COPY_CHUNK)
+                size += os.path.getsize(part)
+        os.replace(tmp, path)
+        etag = f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+        self._store_meta(bucket, key, size, etag, upload["headers"])
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        self._send(200, _xml("CompleteMultipartUploadResult", ("Location", f"{self.server.url}/{bucket}/{key}"),
+                             ("Bucket", bucket), ("Key", key), ("ETag", f'"{etag}"')))
+
+    def do_GET(self):
+        bucket, key = self._route()
+        if not self._bucket_exists(bucket):
+            return self._error(404, "NoSuchBucket", bucket)
+        if not key:
+            return self._list(bucket)
+        self._object(bucket, key)
+
+    def do_HEAD(self):
+        bucket, key = self._route()
+        if not self._bucket_exists(bucket):
+            return self._error(404, "NoSuchBucket", bucket)
+        if not key:
+            return self._send(200)
+        self._object(bucket, key)
+
+    def _object(self, bucket, key):
+        self._drain()
+        meta = self._load_meta(bucket, key)
+        if meta is None:
+            return self._error(404, "NoSuchKey", key)
+        start, end = 0, meta["size"] - 1
+        status = 200
+        byte_range = self.headers.get("Range", "")
+        if byte_range.startswith("bytes=") and meta["size"]:
+            first, _, last = byte_range[6:].partition("-")
+            start = int(first) if first else max(meta["size"] - int(last), 0)
+            end = min(int(last), end) if first and last else end
+            status = 206
+        headers = {"ETag": f'"{meta["etag"]}"', "Last-Modified": formatdate(meta["modified"], usegmt=True),
+                   "Content-Length": str(end - start + 1), "Accept-Ranges": "bytes",
+                   "Content-Type": "application/octet-stream"}
+        headers.update(meta["headers"])
+        if status == 206:
+            headers["Content-Range"] = f"bytes {start}-{end}/{meta['size']}"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        with open(self.server.object_path(bucket, key), "rb") as f:
+            f.seek(start)
+            left = end - start + 1
+            while left > 0:
+                data = f.read(min(left, COPY_CHUNK))
+                if not data:
+                    break
+                self.wfile.write(data)
+                left -= len(data)
+
+    def _list(self, bucket):
+        self._drain()
+        prefix = self.query.get("prefix", "")
+        max_keys = int(self.query.get("max-keys", 1000))
+        after = self.query.get("continuation-token") or self.query.get("start-after", "")
+        encode = (lambda k: quote(k, safe="/")) if self.query.get("encoding-type") == "url" else (lambda k: k)
+        meta_dir = os.path.join(self.server.root, bucket, "meta")
+        keys = sorted(k for k in (unquote(name) for name in os.listdir(meta_dir) if not name.endswith(".tmp"))
+                      if k.startswith(prefix) and k > after)
+        page, truncated = keys[:max_keys], len(keys) > max_keys
+        contents = []
+        for key in page:
+            meta = self._load_meta(bucket, key)
+            if meta is None:
+                continue  # deleted meanwhile
+            contents.append(("Contents", [
+                ("Key", encode(key)),
+                ("LastModified", time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(meta["modified"]))),
+                ("ETag", f'"{meta["etag"]}"'), ("Size", meta["size"]), ("StorageClass", "STANDARD")]))
+        fields = [("Name", bucket), ("Prefix", encode(prefix)), ("KeyCount", len(contents)),
+                  ("MaxKeys", max_keys), ("IsTruncated", "true" if truncated else "false")]
+        if self.query.get("encoding-type") == "url":
+            fields.append(("EncodingType", "url"))
+        if truncated:
+            fields.append(("NextContinuationToken", page[-1]))
+        self._send(200, _xml("ListBucketResult", *fields, *contents))
+
+    def do_DELETE(self):
+        bucket, key = self._route()
+        self._drain()
+        if "uploadId" in self.query:
+            shutil.rmtree(self.server.upload_dir(self.query["uploadId"]), ignore_errors=True)
+        elif key:
+            self._remove(bucket, key)
+        self._send(204)
+
+    def _remove(self, bucket, key):
+        for name in (self.server.meta_path(bucket, key), self.server.object_path(bucket, key)):
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+
+
+def start_server(root=None, host="127.0.0.1", port=0):
+    """Serve root (a new temp directory when None, removed on stop()) from a background thread."""
+    owns_root = root is None
+    root = root or tempfile.mkdtemp(prefix="local-s3-")
+    os.makedirs(root, exist_ok=True)
+    server = LocalS3Server(root, (host, port))
+    server.owns_root = owns_root
+    threading.Thread(target=server.serve_forever, name="local-s3", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local S3-compatible server backed by a directory.")
+    parser.add_argument("--root", help="storage directory (default: a temp directory, removed on exit)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000, help="0 picks a free port")
+    args = parser.parse_args()
+
+    server = start_server(args.root, args.host, args.port)
+    print(f"Listening on {server.url} (root {server.root})", flush=True)
+    print(f"Use with: R2_ENDPOINT_URL={server.url} R2_ACCESS_KEY_ID=local R2_SECRET_ACCESS_KEY=local", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
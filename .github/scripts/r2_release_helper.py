@@ -1,35 +1,423 @@
 import os
 import json
-import glob
+import hashlib
+import random
+import threading
+import time
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
-def get_s3_client():
+try:
+    import zstandard
+except ImportError:  # Delta updates are skipped without it
+    zstandard = None
+
+MB = 1024 * 1024
+
+# Upload tuning: files in flight, multipart part size and parts in flight per file
+FILE_CONCURRENCY = int(os.environ.get("R2_FILE_CONCURRENCY", "4"))
+PART_SIZE_MB = int(os.environ.get("R2_PART_SIZE_MB", "16"))
+PART_CONCURRENCY = int(os.environ.get("R2_PART_CONCURRENCY", "8"))
+
+# Whole-file retries on top of botocore's per-request (per-part) retries
+UPLOAD_ATTEMPTS = 4
+BACKOFF_SECONDS = 2.0
+# Times latest.json is re-read and re-merged after another job changed it under us
+PUBLISH_CONFLICTS = 10
+
+PROGRESS_INTERVAL = 2.0
+
+# Local audit trail of what each run uploaded or skipped
+MANIFEST_PATH = os.environ.get("R2_UPLOAD_MANIFEST", "r2-upload-manifest.json")
+
+# Artifacts live under atlas-updates/v<version>/; atlas-updates/latest.json points at one of them
+UPDATES_PREFIX = "atlas-updates/"
+LATEST_KEY = UPDATES_PREFIX + "latest.json"
+
+# Version prefixes kept by garbage collection (the one latest.json points at is always kept)
+KEEP_VERSIONS = int(os.environ.get("R2_KEEP_VERSIONS", "3"))
+
+# Explicit list of artifacts written by the build: a JSON file path, or the JSON
+# itself (e.g. tauri-action's artifactPaths output); a list of paths or {"files": [...]}
+ARTIFACT_MANIFEST = os.environ.get("R2_ARTIFACT_MANIFEST", "release-artifacts.json")
+
+# Without a manifest, only these build output roots are scanned, never the repo
+ANDROID_APK_ROOT = "src-tauri/gen/android/app/build/outputs/apk"
+MAX_SCAN_DEPTH = 4
+PRUNE_DIRS = {'node_modules', '.git', 'deps', 'build', 'incremental', '.fingerprint', 'intermediates', 'tmp'}
+
+# Delta updates: installers are diffed against the same artifact of the previous release
+DELTA_EXTENSIONS = ('.msi', '.exe', '.apk')
+DELTA_DIR = os.environ.get("R2_DELTA_DIR", "r2-deltas")
+# A delta is only published when it is smaller than this fraction of the full file
+DELTA_MAX_RATIO = float(os.environ.get("R2_DELTA_MAX_RATIO", "0.5"))
+# Match-finder tables grow with the artifact up to 2^27 entries (~0.5 GB each)
+DELTA_MAX_TABLE_LOG = 27
+
+def get_s3_client(max_connections=None):
+    """
+    S3 client for R2. R2_ENDPOINT_URL points it at any other S3-compatible
+    endpoint instead (e.g. local_s3.py for offline testing), in which case
+    R2_ACCOUNT_ID is not needed.
+    """
     account_id = os.environ.get("R2_ACCOUNT_ID")
     access_key = os.environ.get("R2_ACCESS_KEY_ID")
     secret_key = os.environ.get("R2_SECRET_ACCESS_KEY")
+    endpoint_url = os.environ.get("R2_ENDPOINT_URL")
     
-    if not all([account_id, access_key, secret_key]):
+    if not all([account_id or endpoint_url, access_key, secret_key]):
         # Fallback to older worker-based env vars if S3 ones are missing
         # but print a warning because this will fail for large files
         print("Warning: R2 S3 credentials (R2_ACCOUNT_ID, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY) missing.")
         print("Large file uploads (>100MB) will likely fail if using the Worker proxy.")
         return None
 
-    endpoint_url = f"https://{account_id}.r2.cloudflarestorage.com"
+    if not endpoint_url:
+        endpoint_url = f"https://{account_id}.r2.cloudflarestorage.com"
     
     return boto3.client(
         service_name='s3',
         endpoint_url=endpoint_url,
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
-        config=Config(signature_version='s3v4'),
+        config=Config(
+            signature_version='s3v4',
+            # Failed parts are retried with exponential backoff by botocore
+            retries={'max_attempts': 8, 'mode': 'adaptive'},
+            max_pool_connections=max_connections or FILE_CONCURRENCY * PART_CONCURRENCY
+        ),
         region_name='auto' # R2 uses 'auto'
     )
 
+def transfer_config(part_size_mb=None, concurrency=None):
+    part_size = (part_size_mb or PART_SIZE_MB) * MB
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=concurrency or PART_CONCURRENCY,
+        use_threads=True
+    )
+
+def content_type_for(filename):
+    if filename.endswith(".json"): return "application/json"
+    if filename.endswith(".msi"): return "application/x-msi"
+    if filename.endswith(".exe"): return "application/x-msdos-program"
+    if filename.endswith(".apk"): return "application/vnd.android.package-archive"
+    return "application/octet-stream"
+
+class UploadProgress:
+    """Thread-safe byte counters printing MB/s per file and in total every PROGRESS_INTERVAL."""
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.sent = {name: 0 for name in sizes}
+        self.started = {}
+        self.start = time.monotonic()
+        self.last_print = 0.0
+        self.lock = threading.Lock()
+
+    def callback(self, name):
+        def on_bytes(amount):
+            with self.lock:
+                now = time.monotonic()
+                self.started.setdefault(name, now)
+                self.sent[name] += amount
+                if now - self.last_print >= PROGRESS_INTERVAL:
+                    self.last_print = now
+                    self._print(now)
+        return on_bytes
+
+    def restart(self, name):
+        """Forget the bytes of a failed attempt before retrying the file."""
+        with self.lock:
+            self.sent[name] = 0
+            self.started.pop(name, None)
+
+    def rate(self, name, now=None):
+        elapsed = (now or time.monotonic()) - self.started.get(name, self.start)
+        return self.sent[name] / MB / elapsed if elapsed > 0 else 0.0
+
+    def _print(self, now):
+        for name, size in self.sizes.items():
+            sent = self.sent[name]
+            if 0 < sent < size:
+                print(f"  {name}: {sent / MB:.1f}/{size / MB:.1f} MB ({sent * 100 // size}%) {self.rate(name, now):.1f} MB/s")
+        total = sum(self.sent.values())
+        elapsed = now - self.start
+        print(f"  total: {total / MB:.1f}/{sum(self.sizes.values()) / MB:.1f} MB "
+              f"{total / MB / elapsed if elapsed > 0 else 0:.1f} MB/s")
+
+def file_digests(file_path, part_size):
+    """
+    (size, sha256, etag) of a file in one streaming pass, one part in memory
+    at a time. etag is the ETag S3/R2 reports for the object when uploaded
+    with transfer_config(): the plain MD5 below the multipart threshold,
+    else the MD5 of the part MD5s suffixed with the part count.
+    """
+    sha = hashlib.sha256()
+    whole = hashlib.md5()
+    part_md5s = []
+    size = 0
+    with open(file_path, 'rb') as f:
+        while True:
+            part = f.read(part_size)
+            if not part:
+                break
+            size += len(part)
+            sha.update(part)
+            whole.update(part)
+            part_md5s.append(hashlib.md5(part).digest())
+    if size < part_size:
+        etag = whole.hexdigest()
+    else:
+        etag = f"{hashlib.md5(b''.join(part_md5s)).hexdigest()}-{len(part_md5s)}"
+    return size, sha.hexdigest(), etag
+
+def list_remote(s3, bucket_name, prefix):
+    """{key: {'size', 'etag'}} for every object under prefix, from one paginated listing."""
+    remote = {}
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            remote[obj['Key']] = {'size': obj['Size'], 'etag': obj['ETag'].strip('"')}
+    return remote
+
+def is_unchanged(s3, bucket_name, key, local, remote):
+    """Whether the remote object already holds this file's content."""
+    obj = remote.get(key)
+    if not obj or obj['size'] != local['size']:
+        return False
+    if obj['etag'] == local['etag']:
+        return True
+    # Same size but a different ETag (e.g. uploaded with another part size): ask for the stored hash
+    try:
+        head = s3.head_object(Bucket=bucket_name, Key=key)
+        return head.get('Metadata', {}).get('sha256') == local['sha256']
+    except Exception:
+        return False
+
+def plan_uploads(s3, bucket_name, uploads, prefix):
+    """Split (file_path, key) pairs into changed uploads and manifest entries for unchanged files."""
+    try:
+        remote = list_remote(s3, bucket_name, prefix)
+    except Exception as e:
+        print(f"Warning: Could not list {prefix} ({e}); uploading everything")
+        remote = {}
+
+    part_size = PART_SIZE_MB * MB
+    pending, entries = [], []
+    for file_path, key in uploads:
+        size, sha256, etag = file_digests(file_path, part_size)
+        entry = {'path': file_path, 'key': key, 'size': size, 'sha256': sha256, 'etag': etag}
+        if is_unchanged(s3, bucket_name, key, entry, remote):
+            print(f"Unchanged, skipping {os.path.basename(file_path)}")
+            entry['status'] = 'unchanged'
+        else:
+            entry['status'] = 'pending'
+            pending.append(entry)
+        entries.append(entry)
+    return pending, entries
+
+def write_manifest(bucket_name, entries):
+    manifest = {
+        "generated": datetime.utcnow().isoformat() + "Z",
+        "bucket": bucket_name,
+        "files": entries
+    }
+    try:
+        with open(MANIFEST_PATH, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Wrote upload manifest {MANIFEST_PATH}")
+    except OSError as e:
+        print(f"Warning: Could not write {MANIFEST_PATH}: {e}")
+
+def upload_one(s3, bucket_name, file_path, key, progress, config, sha256=None):
+    filename = os.path.basename(file_path)
+    extra_args = {'ContentType': content_type_for(filename)}
+    if sha256:
+        extra_args['Metadata'] = {'sha256': sha256}
+    for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+        try:
+            s3.upload_file(
+                Filename=file_path,
+                Bucket=bucket_name,
+                Key=key,
+                ExtraArgs=extra_args,
+                Config=config,
+                Callback=progress.callback(file_path)
+            )
+            print(f"Successfully uploaded {filename} ({progress.rate(file_path):.1f} MB/s)")
+            return True
+        except Exception as e:
+            if attempt == UPLOAD_ATTEMPTS:
+                print(f"Error uploading {filename}: {e}")
+                return False
+            delay = BACKOFF_SECONDS * 2 ** (attempt - 1)
+            print(f"Upload of {filename} failed (attempt {attempt}/{UPLOAD_ATTEMPTS}): {e}; retrying in {delay:.0f}s")
+            progress.restart(file_path)
+            time.sleep(delay)
+
+def upload_files(s3, bucket_name, uploads, hashes=None):
+    """
+    Upload (file_path, key) pairs concurrently, storing hashes[file_path]
+    (sha256) as object metadata when given. Returns the file paths that failed.
+    """
+    if not uploads:
+        return []
+    hashes = hashes or {}
+    sizes = {file_path: max(os.path.getsize(file_path), 1) for file_path, _ in uploads}
+    progress = UploadProgress(sizes)
+    config = transfer_config()
+    print(f"Uploading {len(uploads)} file(s), {sum(sizes.values()) / MB:.1f} MB "
+          f"({FILE_CONCURRENCY} files x {PART_CONCURRENCY} parts of {PART_SIZE_MB} MB in flight)...")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=FILE_CONCURRENCY) as pool:
+        futures = {pool.submit(upload_one, s3, bucket_name, file_path, key, progress, config,
+                               hashes.get(file_path)): file_path
+                   for file_path, key in uploads}
+        for future in as_completed(futures):
+            if not future.result():
+                failed.append(futures[future])
+
+    elapsed = time.monotonic() - progress.start
+    total = sum(progress.sent.values())
+    print(f"Uploaded {total / MB:.1f} MB in {elapsed:.1f}s ({total / MB / elapsed if elapsed > 0 else 0:.1f} MB/s)")
+    return failed
+
+def verify_uploads(s3, bucket_name, entries):
+    """HEAD every artifact in parallel; returns the keys that are missing or have the wrong size."""
+    def check(entry):
+        try:
+            head = s3.head_object(Bucket=bucket_name, Key=entry['key'])
+            if head['ContentLength'] == entry['size']:
+                return None
+            return f"{entry['key']}: {head['ContentLength']} bytes, expected {entry['size']}"
+        except Exception as e:
+            return f"{entry['key']}: {e}"
+
+    with ThreadPoolExecutor(max_workers=FILE_CONCURRENCY) as pool:
+        problems = [p for p in pool.map(check, entries) if p]
+    for problem in problems:
+        print(f"Verification failed for {problem}")
+    if not problems:
+        print(f"Verified {len(entries)} artifact(s)")
+    return problems
+
+def fetch_latest(s3, bucket_name):
+    try:
+        response = s3.get_object(Bucket=bucket_name, Key=LATEST_KEY)
+        return json.loads(response['Body'].read().decode('utf-8'))
+    except Exception:
+        return None
+
+def read_latest(s3, bucket_name):
+    """(data, etag) of latest.json; (None, None) when it does not exist. Other errors raise."""
+    try:
+        response = s3.get_object(Bucket=bucket_name, Key=LATEST_KEY)
+    except s3.exceptions.NoSuchKey:
+        return None, None
+    body = response['Body'].read().decode('utf-8')
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None  # Corrupt: replaced, but still only if nobody else writes first
+    return data, response['ETag']
+
+def _is_conflict(error):
+    """412 from a failed If-Match/If-None-Match, or R2/S3's 409 for a concurrent conditional write."""
+    code = error.response.get('Error', {}).get('Code')
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    return code in ('PreconditionFailed', 'ConditionalRequestConflict') or status in (409, 412)
+
+def publish_latest(s3, bucket_name, data, local_path):
+    """
+    Upload latest.json as the last step of a release. Platforms published
+    meanwhile for the same version (the other build job) are merged in.
+
+    The write is a compare-and-swap: a conditional PUT (If-Match on the ETag
+    that was merged, or If-None-Match: * when there was no latest.json).
+    When another job wrote in between, the PUT fails with 412 and the merge
+    is redone on the new contents, so neither job drops the other's platform.
+    """
+    attempt = conflicts = 0
+    while True:
+        try:
+            current, etag = read_latest(s3, bucket_name)
+            merged = dict(data, platforms=dict(data.get("platforms", {})))
+            if current and current.get("version") == data.get("version"):
+                for platform, details in current.get("platforms", {}).items():
+                    merged["platforms"].setdefault(platform, details)
+            body = json.dumps(merged, indent=2).encode('utf-8')
+            condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+            put = s3.put_object(Bucket=bucket_name, Key=LATEST_KEY, Body=body,
+                                ContentType='application/json', CacheControl='no-cache', **condition)
+            head = s3.head_object(Bucket=bucket_name, Key=LATEST_KEY)
+            # A different ETag means a later job already swapped in its own merge of ours
+            if head['ETag'] == put['ETag'] and head['ContentLength'] != len(body):
+                raise RuntimeError("size mismatch after upload")
+        except Exception as e:
+            if isinstance(e, ClientError) and _is_conflict(e) and conflicts < PUBLISH_CONFLICTS:
+                conflicts += 1
+                print(f"{LATEST_KEY} changed while merging (another job published); merging again...")
+                time.sleep(random.uniform(0.1, 0.5) * conflicts)
+                continue
+            attempt += 1
+            if attempt >= UPLOAD_ATTEMPTS:
+                print(f"Error publishing {LATEST_KEY}: {e}")
+                return False
+            time.sleep(BACKOFF_SECONDS * 2 ** (attempt - 1))
+            continue
+
+        with open(local_path, 'wb') as f:
+            f.write(body)
+        print(f"Generated final {local_path} with platforms: {list(merged['platforms'].keys())}")
+        print(f"Swapped in {LATEST_KEY} for version {data.get('version')}")
+        return True
+
+def _version_key(name):
+    return tuple(int(part) if part.isdigit() else 0 for part in name.lstrip('v').split('.'))
+
+def collect_garbage(s3, bucket_name, keep=None):
+    """
+    Delete version prefixes beyond the newest `keep` and pre-versioning
+    artifacts at the top of atlas-updates/, never anything the current
+    latest.json points at.
+    """
+    keep = KEEP_VERSIONS if keep is None else keep
+    try:
+        latest = fetch_latest(s3, bucket_name) or {}
+        referenced = {details.get("url", "") for details in latest.get("platforms", {}).values()}
+        live_version = f"v{latest['version']}" if latest.get("version") else None
+
+        keys = list(list_remote(s3, bucket_name, UPDATES_PREFIX))
+        versions = sorted({k[len(UPDATES_PREFIX):].split('/', 1)[0] for k in keys
+                           if '/' in k[len(UPDATES_PREFIX):]}, key=_version_key, reverse=True)
+        kept = set(versions[:keep]) | ({live_version} if live_version else set())
+
+        doomed = []
+        for key in keys:
+            rest = key[len(UPDATES_PREFIX):]
+            if key == LATEST_KEY or any(url.endswith('/' + key) for url in referenced):
+                continue
+            if '/' in rest and rest.split('/', 1)[0] in kept:
+                continue
+            doomed.append(key)
+
+        for start in range(0, len(doomed), 1000):
+            batch = doomed[start:start + 1000]
+            s3.delete_objects(Bucket=bucket_name, Delete={'Objects': [{'Key': k} for k in batch]})
+        print(f"Garbage collection: removed {len(doomed)} object(s), kept versions {sorted(kept, key=_version_key)}")
+    except Exception as e:
+        print(f"Warning: garbage collection failed (old versions stay until the next release): {e}")
+
 def clear_updates():
+    """Delete everything under atlas-updates/. Manual use only: releases publish in stages instead."""
     print("Clearing atlas-updates/ in R2...")
     bucket_name = os.environ.get("R2_BUCKET_NAME", "atlas")
     s3 = get_s3_client()
@@ -49,6 +437,205 @@ def clear_updates():
         print(f"Error clearing updates: {e}")
         exit(1)
 
+def previous_artifact(remote, version, filename):
+    """
+    (version, key) of the artifact `filename` replaces: the file with the same
+    extension (preferably the same name stem) in the newest version prefix
+    older than `version`; (None, None) when there is none.
+    """
+    ext = os.path.splitext(filename)[1]
+    stem = filename.split('_')[0]
+    by_version = {}
+    for key in remote:
+        rest = key[len(UPDATES_PREFIX):]
+        if '/' not in rest:
+            continue
+        prefix, name = rest.split('/', 1)
+        if name.endswith(ext) and '/' not in name:
+            by_version.setdefault(prefix, []).append(name)
+    older = [v for v in by_version if _version_key(v) < _version_key(f"v{version}")]
+    if not older:
+        return None, None
+    newest = max(older, key=_version_key)
+    names = sorted(by_version[newest], key=lambda name: name.split('_')[0] != stem)
+    return newest.lstrip('v'), f"{UPDATES_PREFIX}{newest}/{names[0]}"
+
+def make_delta(old_path, new_path, delta_path):
+    """
+    zstd-compress new_path with old_path as a raw-content dictionary, i.e.
+    as a binary diff against it. Decompressing with the same dictionary
+    is checked to reproduce new_path before the delta is kept. Returns
+    {'size', 'sha256', 'target_sha256'}.
+    """
+    with open(old_path, 'rb') as f:
+        dictionary = zstandard.ZstdCompressionDict(f.read(), dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    window_log = min(max(os.path.getsize(old_path), os.path.getsize(new_path), 1).bit_length(),
+                     zstandard.WINDOWLOG_MAX)
+    table_log = max(min(window_log, DELTA_MAX_TABLE_LOG), zstandard.HASHLOG_MIN)
+    params = zstandard.ZstdCompressionParameters(
+        window_log=window_log, hash_log=table_log, chain_log=table_log, search_log=4, min_match=5,
+        strategy=zstandard.STRATEGY_LAZY2, write_checksum=True)
+
+    target = hashlib.sha256()
+    with open(new_path, 'rb') as src, open(delta_path, 'wb') as dst:
+        with zstandard.ZstdCompressor(dict_data=dictionary, compression_params=params).stream_writer(dst, closefd=False) as writer:
+            for chunk in iter(lambda: src.read(PART_SIZE_MB * MB), b''):
+                target.update(chunk)
+                writer.write(chunk)
+
+    check = hashlib.sha256()
+    delta = hashlib.sha256()
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary, max_window_size=1 << window_log)
+    with open(delta_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(PART_SIZE_MB * MB), b''):
+            delta.update(chunk)
+        f.seek(0)
+        with decompressor.stream_reader(f) as reader:
+            for chunk in iter(lambda: reader.read(PART_SIZE_MB * MB), b''):
+                check.update(chunk)
+    if check.hexdigest() != target.hexdigest():
+        raise RuntimeError("delta does not reproduce the artifact")
+    return {'size': os.path.getsize(delta_path), 'sha256': delta.hexdigest(), 'target_sha256': target.hexdigest()}
+
+def build_deltas(s3, bucket_name, data, files, version, version_prefix, base_download_url):
+    """
+    Diff every installer referenced by data["platforms"] against its
+    previous release and add a "deltas" entry to those platforms. Returns
+    the delta files to upload alongside the full artifacts. Failures only
+    cost the delta; the full artifact is always published.
+    """
+    if zstandard is None:
+        print("zstandard not installed; skipping delta updates (pip install zstandard)")
+        return []
+    local = {os.path.basename(f): f for f in files if f.endswith(DELTA_EXTENSIONS)}
+    referenced = {os.path.basename(d.get("url", "")) for d in data["platforms"].values()}
+    targets = [name for name in local if name in referenced]
+    if not targets:
+        return []
+
+    os.makedirs(DELTA_DIR, exist_ok=True)
+    remote = list_remote(s3, bucket_name, UPDATES_PREFIX)
+    deltas = {}
+    for name in targets:
+        old_version, old_key = previous_artifact(remote, version, name)
+        if not old_key:
+            print(f"No previous release of {name}; no delta")
+            continue
+        old_path = os.path.join(DELTA_DIR, f"base-{old_version}-{os.path.basename(old_key)}")
+        delta_name = f"{name}.from-{old_version}.zst"
+        delta_path = os.path.join(DELTA_DIR, delta_name)
+        start = time.monotonic()
+        try:
+            s3.download_file(bucket_name, old_key, old_path, Config=transfer_config())
+            info = make_delta(old_path, local[name], delta_path)
+        except Exception as e:
+            print(f"Warning: Could not build a delta for {name}: {e}")
+            continue
+        finally:
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        full_size = os.path.getsize(local[name])
+        if info['size'] > full_size * DELTA_MAX_RATIO:
+            print(f"Delta for {name} is {info['size'] / MB:.1f} MB of {full_size / MB:.1f} MB; not worth publishing")
+            os.remove(delta_path)
+            continue
+        print(f"Delta {delta_name}: {info['size'] / MB:.2f} MB instead of {full_size / MB:.1f} MB "
+              f"({time.monotonic() - start:.1f}s)")
+        deltas[name] = (delta_path, {
+            "from_version": old_version,
+            "format": "zstd-dictionary",
+            "url": f"{base_download_url}{version_prefix}{delta_name}",
+            "size": info['size'],
+            "sha256": info['sha256'],
+            "target_sha256": info['target_sha256'],
+        })
+
+    for details in data["platforms"].values():
+        name = os.path.basename(details.get("url", ""))
+        if name in deltas:
+            details["deltas"] = [deltas[name][1]]
+    return [path for path, _ in deltas.values()]
+
+def load_artifact_manifest():
+    """Paths listed by the build, or None when there is no (usable) manifest."""
+    value = ARTIFACT_MANIFEST.strip()
+    if not value:
+        return None
+    try:
+        if value[0] in "[{":
+            listed = json.loads(value)
+        elif os.path.exists(value):
+            with open(value, 'r') as f:
+                listed = json.load(f)
+        else:
+            return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable artifact manifest: {e}")
+        return None
+    if isinstance(listed, dict):
+        listed = listed.get("files", [])
+    files = []
+    for path in listed:
+        if os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"Warning: Artifact manifest lists missing file {path}")
+    return files or None
+
+def bundle_roots():
+    """Tauri bundle dirs (host and cross-compiled targets) plus the Android APK output dir."""
+    target = os.environ.get("CARGO_TARGET_DIR") or "src-tauri/target"
+    roots = []
+    if os.path.isdir(target):
+        for entry in os.scandir(target):
+            if not entry.is_dir():
+                continue
+            bundle = f"{target}/release/bundle" if entry.name == "release" else f"{target}/{entry.name}/release/bundle"
+            if os.path.isdir(bundle):
+                roots.append(("windows", bundle))
+    if os.path.isdir(ANDROID_APK_ROOT):
+        roots.append(("android", ANDROID_APK_ROOT))
+    return sorted(roots, key=lambda root: (root[0] != "windows", root[1] != f"{target}/release/bundle", root[1]))
+
+def is_artifact(kind, path):
+    name = os.path.basename(path)
+    if kind == "windows":
+        return name == "latest.json" or name.endswith((".msi", ".msi.sig", ".exe", ".exe.sig"))
+    return name.endswith(".apk") and (name.startswith("Atlas_") or "/debug/" in path)
+
+def scan_artifacts(roots):
+    """One bounded walk of each bundle root, pruning build intermediates."""
+    found = []
+    for kind, root in roots:
+        stack = [(root, 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                path = f"{directory}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if depth < MAX_SCAN_DEPTH and entry.name not in PRUNE_DIRS:
+                        stack.append((path, depth + 1))
+                elif is_artifact(kind, path):
+                    found.append(path)
+    return found
+
+def find_artifacts():
+    start = time.monotonic()
+    files = load_artifact_manifest()
+    source = "artifact manifest"
+    if files is None:
+        roots = bundle_roots()
+        files = scan_artifacts(roots)
+        source = "scan of " + (", ".join(root for _, root in roots) or "no bundle dirs")
+    print(f"Found {len(files)} artifact(s) from {source} in {time.monotonic() - start:.2f}s")
+    for f in files:
+        print(f"  {f}")
+    return files
+
 def upload_assets():
     print("Starting asset upload to R2...")
     bucket_name = os.environ.get("R2_BUCKET_NAME", "atlas")
@@ -58,31 +645,7 @@ def upload_assets():
         print("Error: R2 S3 credentials missing. Cannot proceed with robust upload.")
         exit(1)
 
-    # Broaden patterns to find assets wherever they might be in the bundle dir
-    windows_patterns = [
-        "src-tauri/target/release/bundle/msi/*.msi",
-        "src-tauri/target/release/bundle/msi/*.msi.sig",
-        "src-tauri/target/release/bundle/nsis/*.exe",
-        "src-tauri/target/release/bundle/nsis/*.exe.sig",
-        "src-tauri/target/release/bundle/updater/latest.json",
-        "src-tauri/target/release/bundle/latest.json",
-        "**/target/release/bundle/updater/latest.json"
-    ]
-    
-    # Find Android assets
-    android_patterns = [
-        "src-tauri/gen/android/app/build/outputs/apk/universal/release/Atlas_*.apk",
-        "src-tauri/gen/android/app/build/outputs/apk/debug/*.apk",
-        "**/outputs/apk/**/Atlas_*.apk"
-    ]
-    
-    all_files = []
-    print("Searching for files using patterns...")
-    for p in windows_patterns + android_patterns:
-        matches = glob.glob(p, recursive=True)
-        if matches:
-            print(f"Pattern '{p}' matched: {matches}")
-        all_files.extend(matches)
+    all_files = find_artifacts()
         
     if not all_files:
         print("No assets found to upload!")
@@ -92,7 +655,7 @@ def upload_assets():
     remote_data = None
     try:
         print("Attempting to fetch existing latest.json from R2...")
-        response = s3.get_object(Bucket=bucket_name, Key='atlas-updates/latest.json')
+        response = s3.get_object(Bucket=bucket_name, Key=LATEST_KEY)
         remote_data = json.loads(response['Body'].read().decode('utf-8'))
         print("Successfully fetched existing latest.json from R2")
     except s3.exceptions.NoSuchKey:
@@ -108,6 +671,9 @@ def upload_assets():
     except Exception as e:
         print(f"Warning: Could not read version from tauri.conf.json: {e}")
 
+    # Artifacts of this release go under their own prefix; latest.json is swapped in last
+    version_prefix = f"{UPDATES_PREFIX}v{version}/"
+
     # Preserve min_version from remote if it exists
     remote_min_version = remote_data.get("min_version", "0.0.0") if remote_data else "0.0.0"
 
@@ -147,6 +713,9 @@ def upload_assets():
         # Fallback to S3-style public URL if needed, but Worker is probably preferred for downloads
         base_download_url = f"https://{bucket_name}.{os.environ.get('R2_ACCOUNT_ID')}.r2.cloudflarestorage.com/"
 
+    # Platforms this run built; entries for them from the published latest.json
+    # (a re-run of the same version) are stale and always replaced
+    local_platforms = set()
     if local_latest_json_path and os.path.exists(local_latest_json_path):
         print(f"Merging locally generated {local_latest_json_path}...")
         try:
@@ -156,8 +725,9 @@ def upload_assets():
             for platform, details in local_data.get("platforms", {}).items():
                 if "url" in details:
                     filename = os.path.basename(details["url"])
-                    details["url"] = f"{base_download_url}atlas-updates/{filename}"
+                    details["url"] = f"{base_download_url}{version_prefix}{filename}"
                     data["platforms"][platform] = details
+                    local_platforms.add(platform)
                     print(f"Merged local platform rules: {platform}")
         except Exception as e:
             print(f"Error reading local latest.json: {e}")
@@ -171,7 +741,7 @@ def upload_assets():
         elif f_path.endswith(".exe") and not windows_bin:
             windows_bin = f_path
             
-    if windows_bin and "windows-x86_64" not in data["platforms"]:
+    if windows_bin:
         sig_path = f"{windows_bin}.sig"
         signature = ""
         if os.path.exists(sig_path):
@@ -182,11 +752,11 @@ def upload_assets():
         filename = os.path.basename(windows_bin)
         details = {
             "signature": signature,
-            "url": f"{base_download_url}atlas-updates/{filename}"
+            "url": f"{base_download_url}{version_prefix}{filename}"
         }
-        data["platforms"]["windows-x86_64"] = details
-        data["platforms"]["windows-x86_64-msi"] = details
-        data["platforms"]["windows-x86_64-nsis"] = details
+        for plat in ["windows-x86_64", "windows-x86_64-msi", "windows-x86_64-nsis"]:
+            if plat not in local_platforms:
+                data["platforms"][plat] = details
         print(f"Dynamically mapped windows platforms to {filename}")
 
     # Dynamically Map Android
@@ -203,55 +773,66 @@ def upload_assets():
         filename = os.path.basename(android_apk)
         details = {
             "signature": "",
-            "url": f"{base_download_url}atlas-updates/{filename}"
+            "url": f"{base_download_url}{version_prefix}{filename}"
         }
         for plat in ["android-aarch64", "android-armv7", "android-x86_64", "android-i686", "android"]:
             data["platforms"][plat] = details
         print(f"Dynamically mapped android platforms to {filename}")
 
-    # Write merged JSON to disk
+    # Binary diffs against the previous release, published next to the full files
+    delta_files = build_deltas(s3, bucket_name, data, all_files, version, version_prefix, base_download_url)
+
+    # Stage 1: artifacts to the versioned prefix. Only new or changed files are
+    # uploaded, side by side; every file gets its retries before the step fails
+    # A manifest may list the same file twice
+    files_to_upload = list(dict.fromkeys(os.path.normpath(f) for f in all_files + delta_files
+                                         if os.path.basename(f) != "latest.json"))
+    uploads = [(file_path, f"{version_prefix}{os.path.basename(file_path)}") for file_path in files_to_upload]
+    pending, entries = plan_uploads(s3, bucket_name, uploads, version_prefix)
+    print(f"{len(pending)} of {len(entries)} file(s) new or changed")
+    failed = upload_files(s3, bucket_name, [(e['path'], e['key']) for e in pending],
+                          {e['path']: e['sha256'] for e in pending})
+    for entry in pending:
+        entry['status'] = 'failed' if entry['path'] in failed else 'uploaded'
+    if failed:
+        write_manifest(bucket_name, entries)
+        print(f"Error: {len(failed)} upload(s) failed: {', '.join(os.path.basename(f) for f in failed)}")
+        print("latest.json was not updated; clients keep the previous release.")
+        exit(1)
+
+    # Stage 2: every artifact must be readable at its final size before clients are pointed at it
+    bad = verify_uploads(s3, bucket_name, entries)
+    if bad:
+        write_manifest(bucket_name, entries)
+        print(f"Error: {len(bad)} artifact(s) failed verification; latest.json was not updated.")
+        exit(1)
+
+    # Stage 3: swap latest.json in
+    if not data.get("platforms"):
+        write_manifest(bucket_name, entries)
+        print("No platforms mapped; latest.json left unchanged.")
+        return
     final_latest_json = "latest.json"
-    with open(final_latest_json, 'w') as f:
-        json.dump(data, f, indent=2)
-    print(f"Generated final {final_latest_json} with platforms: {list(data.get('platforms', {}).keys())}")
-    
-    # Filter files for upload
-    files_to_upload = []
-    if len(data.get("platforms", {})) > 0:
-        files_to_upload.append(final_latest_json)
-    
-    for f in all_files:
-        if os.path.basename(f) == "latest.json":
-            continue
-        files_to_upload.append(f)
+    if not publish_latest(s3, bucket_name, data, final_latest_json):
+        write_manifest(bucket_name, entries)
+        exit(1)
+    entries.append({'path': final_latest_json, 'key': LATEST_KEY, 'status': 'published'})
+    write_manifest(bucket_name, entries)
 
-    # Upload all
-    for file_path in files_to_upload:
-        filename = os.path.basename(file_path)
-        r2_key = f"atlas-updates/{filename}"
-        print(f"Uploading {file_path} to {r2_key}...")
-        
-        content_type = "application/json" if filename.endswith(".json") else "application/octet-stream"
-        if filename.endswith(".msi"): content_type = "application/x-msi"
-        elif filename.endswith(".exe"): content_type = "application/x-msdos-program"
-        elif filename.endswith(".apk"): content_type = "application/vnd.android.package-archive"
-        
-        try:
-            s3.upload_file(
-                Filename=file_path,
-                Bucket=bucket_name,
-                Key=r2_key,
-                ExtraArgs={'ContentType': content_type}
-            )
-            print(f"Successfully uploaded {filename}")
-        except Exception as e:
-            print(f"Error uploading {filename}: {e}")
-            exit(1)
+    # Stage 4: drop old versions; the release is already live, so a failure here is harmless
+    print(f"Published {version}; removing old versions...")
+    collect_garbage(s3, bucket_name)
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "clear":
         clear_updates()
+    elif len(sys.argv) > 1 and sys.argv[1] == "gc":
+        s3 = get_s3_client()
+        if not s3:
+            print("Error: Cannot collect garbage without S3 credentials.")
+            exit(1)
+        collect_garbage(s3, os.environ.get("R2_BUCKET_NAME", "atlas"))
     else:
         upload_assets()
 
@@ -0,0 +1,220 @@
+"""
+Benchmark of the R2 upload path (r2_release_helper.upload_one) on synthetic artifacts.
+
+    python .github/scripts/r2_upload_bench.py                          # 50/200/500 MB vs local_s3.py
+    python .github/scripts/r2_upload_bench.py --sizes 100 --part-concurrency 2,8,16 --part-size-mb 8
+    R2_ENDPOINT_URL=... python .github/scripts/r2_upload_bench.py      # against another endpoint
+
+Without R2_ENDPOINT_URL (or --endpoint) a local_s3.py server is started in
+a subprocess on a temp directory, so the numbers cover the client only and
+the run needs no network or credentials. For every size x part concurrency
+it reports throughput, the peak number of part requests actually in flight
+and the peak RSS growth of this process, then checks the stored size and
+ETag. Results are printed as a table and as JSON (--json writes them to a file).
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import r2_release_helper as helper
+from r2_release_helper import MB, PART_CONCURRENCY, PART_SIZE_MB
+
+DEFAULT_SIZES = "50,200,500"
+DEFAULT_CONCURRENCY = "1,4,8,16"
+SAMPLE_INTERVAL = 0.05
+
+
+def rss_bytes():
+    """Current resident set size (Linux /proc), else the peak so far from getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemorySampler:
+    """Peak RSS above the starting point while the with-block runs."""
+
+    def __init__(self):
+        self.base = self.peak = 0
+        self.stop = threading.Event()
+
+    def __enter__(self):
+        self.base = self.peak = rss_bytes()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def _sample(self):
+        while not self.stop.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+    @property
+    def growth_mb(self):
+        return (self.peak - self.base) / MB
+
+
+class InFlight:
+    """Counts PutObject/UploadPart requests on the wire via botocore events."""
+
+    OPERATIONS = ("PutObject", "UploadPart")
+
+    def __init__(self, s3):
+        self.current = self.peak = self.requests = 0
+        self.lock = threading.Lock()
+        for operation in self.OPERATIONS:
+            s3.meta.events.register(f"before-send.s3.{operation}", self._sent)
+            s3.meta.events.register(f"response-received.s3.{operation}", self._done)
+
+    def _sent(self, **kwargs):
+        with self.lock:
+            self.current += 1
+            self.requests += 1
+            self.peak = max(self.peak, self.current)
+
+    def _done(self, **kwargs):
+        with self.lock:
+            self.current -= 1
+
+    def reset(self):
+        with self.lock:
+            self.current = self.peak = self.requests = 0
+
+
+def make_artifact(directory, size_mb):
+    """A size_mb file of incompressible data, reused across runs in the same directory."""
+    path = os.path.join(directory, f"bench-{size_mb}mb.bin")
+    if os.path.exists(path) and os.path.getsize(path) == size_mb * MB:
+        return path
+    block = bytearray(os.urandom(MB))
+    with open(path, "wb") as f:
+        for i in range(size_mb):
+            block[:8] = i.to_bytes(8, "little")  # no two parts alike
+            f.write(block)
+    return path
+
+
+def start_local_server(root):
+    """local_s3.py in a subprocess; returns (process, url)."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_s3.py")
+    process = subprocess.Popen([sys.executable, script, "--root", root, "--port", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Listening on "):
+        process.kill()
+        raise RuntimeError(f"local_s3.py did not start: {line!r}")
+    return process, line.split()[2]
+
+
+def run_case(s3, bucket, path, size_mb, part_size_mb, concurrency, counter):
+    key = f"bench/{os.path.basename(path)}"
+    size, sha256, etag = helper.file_digests(path, part_size_mb * MB)
+    progress = helper.UploadProgress({path: size})
+    counter.reset()
+    with MemorySampler() as memory:
+        start = time.perf_counter()
+        ok = helper.upload_one(s3, bucket, path, key, progress,
+                               helper.transfer_config(part_size_mb, concurrency), sha256)
+        seconds = time.perf_counter() - start
+    head = s3.head_object(Bucket=bucket, Key=key) if ok else {}
+    s3.delete_object(Bucket=bucket, Key=key)
+    return {
+        "size_mb": size_mb,
+        "part_size_mb": part_size_mb,
+        "part_concurrency": concurrency,
+        "uploaded": ok,
+        "seconds": round(seconds, 3),
+        "mb_per_s": round(size / MB / seconds, 1) if seconds > 0 else 0.0,
+        "requests": counter.requests,
+        "peak_in_flight": counter.peak,
+        "peak_rss_growth_mb": round(memory.growth_mb, 1),
+        "verified": head.get("ContentLength") == size and head.get("ETag", "").strip('"') == etag,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the R2 upload path on synthetic artifacts.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"artifact sizes in MB (default {DEFAULT_SIZES})")
+    parser.add_argument("--part-concurrency", default=DEFAULT_CONCURRENCY,
+                        help=f"parts in flight to compare (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--part-size-mb", type=int, default=PART_SIZE_MB, help=f"part size (default {PART_SIZE_MB})")
+    parser.add_argument("--endpoint", default=os.environ.get("R2_ENDPOINT_URL"),
+                        help="S3 endpoint (default: R2_ENDPOINT_URL, else a local_s3.py server)")
+    parser.add_argument("--bucket", default=os.environ.get("R2_BENCH_BUCKET", "bench"))
+    parser.add_argument("--workdir", help="where artifacts (and local server data) go (default: a temp dir)")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    levels = [int(c) for c in args.part_concurrency.split(",") if c]
+    workdir = args.workdir or tempfile.mkdtemp(prefix="r2-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    helper.PROGRESS_INTERVAL = float("inf")  # the table below is the report
+
+    server = None
+    endpoint = args.endpoint
+    if not endpoint:
+        server, endpoint = start_local_server(os.path.join(workdir, "s3"))
+        os.environ.setdefault("R2_ACCESS_KEY_ID", "local")
+        os.environ.setdefault("R2_SECRET_ACCESS_KEY", "local")
+    os.environ["R2_ENDPOINT_URL"] = endpoint
+
+    try:
+        s3 = helper.get_s3_client(max_connections=max(levels + [PART_CONCURRENCY]))
+        if not s3:
+            sys.exit(1)
+        if server:
+            s3.create_bucket(Bucket=args.bucket)
+        counter = InFlight(s3)
+
+        print(f"Endpoint: {endpoint}{' (local_s3.py)' if server else ''}")
+        print(f"Generating artifacts in {workdir}...")
+        artifacts = {size_mb: make_artifact(workdir, size_mb) for size_mb in sizes}
+
+        results = []
+        print(f"\n{'size':>6} {'parts':>6} {'secs':>8} {'MB/s':>8} {'reqs':>5} {'peak':>5} {'rss+MB':>7}  ok")
+        for size_mb in sizes:
+            for concurrency in levels:
+                result = run_case(s3, args.bucket, artifacts[size_mb], size_mb, args.part_size_mb,
+                                  concurrency, counter)
+                results.append(result)
+                print(f"{size_mb:>5}M {concurrency:>6} {result['seconds']:>8.2f} {result['mb_per_s']:>8.1f} "
+                      f"{result['requests']:>5} {result['peak_in_flight']:>5} {result['peak_rss_growth_mb']:>7.1f}  "
+                      f"{'yes' if result['uploaded'] and result['verified'] else 'NO'}")
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    output = {
+        "script": "r2_upload_bench",
+        "endpoint": endpoint,
+        "local_server": bool(server),
+        "results": results,
+        "passed": all(r["uploaded"] and r["verified"] for r in results),
+    }
+    print("\n" + json.dumps(output, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(output, f, indent=2)
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(0 if output["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,28 @@
 Asaas Release Helper
 A simple GUI to automate version bumping and release tagging.
 Run with: python release.py
+
+Headless (for automation):
+    python release.py --headless [--version 1.2.3] [--message "..."] [--notes notes.json]
+                      [--stealth] [--build apk,windows] [--no-release] [--no-cache] [--json summary.json]
+
+An APK built from the same sources (version fields aside) is restored from a
+local cache in .git/apk-cache instead of being rebuilt; --no-cache forces a build.
 """
 
+import argparse
+import hashlib
 import json
+import os
+import queue
+import shutil
+import signal
 import subprocess
-import tkinter as tk
-from tkinter import messagebox, ttk
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 # Paths
@@ -15,6 +31,26 @@ SCRIPT_DIR = Path(__file__).parent
 TAURI_CONF = SCRIPT_DIR / "src-tauri" / "tauri.conf.json"
 PACKAGE_JSON = SCRIPT_DIR / "package.json"
 PATCH_NOTES = SCRIPT_DIR / "src" / "data" / "patch-notes.json"
+APK_OUTPUTS = SCRIPT_DIR / "src-tauri" / "gen" / "android" / "app" / "build" / "outputs" / "apk"
+OUTPUT_APK = SCRIPT_DIR / "Asaas.apk"
+
+NPM = 'npm.cmd' if os.name == 'nt' else 'npm'
+
+# Local APK cache: entries/<inputs hash>.json points at objects/<APK sha256>
+APK_CACHE_ENTRIES = 5
+APK_INPUT_ROOTS = ["src", "src-tauri", "public"]
+APK_INPUT_FILES = ["package.json", "package-lock.json", "src-tauri/Cargo.lock", "index.html", "vite.config.ts",
+                   "tsconfig.json", "tsconfig.app.json", "tsconfig.node.json", "tailwind.config.js", "postcss.config.js"]
+# vite.config.ts calls loadEnv: .env, .env.local, .env.[mode]* and VITE_* variables are baked into the bundle
+APK_ENV_PREFIX = "VITE_"
+# Build output and runtime session data that never end up in the APK
+APK_INPUT_SKIP = {'node_modules', 'target', 'build', '.gradle', '.cxx', 'auth_info_baileys', '.wwebjs_cache'}
+# Hashed without their "version" field, so a bump alone does not force a rebuild
+VERSIONED_FILES = {"package.json", "src-tauri/tauri.conf.json"}
+
+# GUI: how often worker events are drained, and how much output the log pane keeps
+POLL_MS = 100
+LOG_MAX_LINES = 2000
 
 
 def read_version():
@@ -84,47 +120,338 @@ def is_git_clean():
         return False
 
 
-def run_git_commands(version, commit_msg):
-    """Run git commands to commit and push tag"""
+def run_git_commands(version, commit_msg, job=None):
+    """Run git commands to commit and push tag (inside `job`, output goes to its log)"""
     tag = f"v{version}"
+    log = job.log if job else print
+    run = job.run if job else (lambda cmd: subprocess.run(cmd, cwd=SCRIPT_DIR, check=True))
     
     try:
-        print(f"--- Starting Release {tag} ---")
+        log(f"--- Starting Release {tag} ---")
         
         # Stage all changes
-        print("Staging changes...")
-        subprocess.run(['git', 'add', '.'], cwd=SCRIPT_DIR, check=True)
+        log("Staging changes...")
+        run(['git', 'add', '.'])
         
         # Commit
-        print(f"Committing with message: {commit_msg}")
-        subprocess.run(['git', 'commit', '-m', commit_msg], cwd=SCRIPT_DIR, check=True)
+        log(f"Committing with message: {commit_msg}")
+        run(['git', 'commit', '-m', commit_msg])
         
         # Push to main
-        print("Pushing to origin main...")
-        subprocess.run(['git', 'push', 'origin', 'main'], cwd=SCRIPT_DIR, check=True)
+        log("Pushing to origin main...")
+        run(['git', 'push', 'origin', 'main'])
         
         # Create tag
-        print(f"Creating tag {tag}...")
-        subprocess.run(['git', 'tag', tag], cwd=SCRIPT_DIR, check=True)
+        log(f"Creating tag {tag}...")
+        run(['git', 'tag', tag])
         
         # Push tag
-        print(f"Pushing tag {tag} to origin...")
-        subprocess.run(['git', 'push', 'origin', tag], cwd=SCRIPT_DIR, check=True)
+        log(f"Pushing tag {tag} to origin...")
+        run(['git', 'push', 'origin', tag])
         
-        print(f"--- Successfully released {tag} ---")
+        log(f"--- Successfully released {tag} ---")
         return True, f"Successfully released {tag}!"
     except subprocess.CalledProcessError as e:
         error_msg = f"Git error: {e}"
-        print(f"❌ {error_msg}")
+        log(f"❌ {error_msg}")
         return False, error_msg
 
 
+def apk_cache_root():
+    """The cache lives inside .git when there is one, so it never shows up as changes"""
+    git_dir = SCRIPT_DIR / ".git"
+    return git_dir / "apk-cache" if git_dir.is_dir() else SCRIPT_DIR / ".apk-cache"
+
+
+def apk_input_files():
+    """Relative paths of the APK build inputs: git ls-files (tracked and untracked, minus ignored) plus lockfiles"""
+    try:
+        out = subprocess.run(["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--",
+                              *APK_INPUT_ROOTS], cwd=SCRIPT_DIR, capture_output=True, check=True).stdout
+        files = set(out.decode('utf-8', 'surrogateescape').split('\0')) - {''}
+    except (OSError, subprocess.CalledProcessError):
+        files = set()
+        for root in APK_INPUT_ROOTS:
+            for dirpath, dirs, names in os.walk(SCRIPT_DIR / root):
+                dirs[:] = [d for d in dirs if d not in APK_INPUT_SKIP and d != 'gen']
+                rel = Path(dirpath).relative_to(SCRIPT_DIR).as_posix()
+                files.update(f"{rel}/{name}" for name in names)
+    # Lockfiles (Cargo.lock) and .env files are often git-ignored but change what gets built
+    files.update(APK_INPUT_FILES)
+    files.update(p.name for p in SCRIPT_DIR.glob(".env*"))
+    return sorted(f for f in files
+                  if APK_INPUT_SKIP.isdisjoint(f.split('/')[:-1]) and (SCRIPT_DIR / f).is_file())
+
+
+def apk_input_hash():
+    """
+    sha256 over every input's path and contents plus the VITE_* environment;
+    unchanged files reuse the digest from the last run
+    """
+    stat_path = apk_cache_root() / "stat-cache.json"
+    try:
+        with open(stat_path, 'r') as f:
+            stat_cache = json.load(f)
+    except (OSError, ValueError):
+        stat_cache = {}
+    fresh = {}
+    digest = hashlib.sha256()
+    for rel in apk_input_files():
+        path = SCRIPT_DIR / rel
+        if rel in VERSIONED_FILES:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data.pop('version', None)
+            sha = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        else:
+            st = path.stat()
+            cached = stat_cache.get(rel)
+            if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+                sha = cached[2]
+            else:
+                with open(path, 'rb') as f:
+                    sha = hashlib.file_digest(f, 'sha256').hexdigest() if hasattr(hashlib, 'file_digest') \
+                        else hashlib.sha256(f.read()).hexdigest()
+            fresh[rel] = [st.st_size, st.st_mtime_ns, sha]
+        digest.update(f"{rel}\0{sha}\n".encode('utf-8', 'surrogateescape'))
+    for name in sorted(n for n in os.environ if n.startswith(APK_ENV_PREFIX)):
+        value = hashlib.sha256(os.environ[name].encode('utf-8', 'surrogateescape')).hexdigest()
+        digest.update(f"env:{name}\0{value}\n".encode('utf-8', 'surrogateescape'))
+    stat_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = stat_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(fresh, f)
+    os.replace(tmp, stat_path)
+    return digest.hexdigest()
+
+
+def cached_apk(key):
+    """(object path, entry) for a cached APK built from these inputs, or None"""
+    root = apk_cache_root()
+    try:
+        with open(root / "entries" / f"{key}.json", 'r') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    blob = root / "objects" / entry['sha256']
+    if not blob.is_file() or blob.stat().st_size != entry['size']:
+        return None
+    return blob, entry
+
+
+def store_apk(key, apk_path, version):
+    """Add the APK under its own sha256 and point the inputs hash at it; keeps the newest APK_CACHE_ENTRIES"""
+    root = apk_cache_root()
+    objects, entries = root / "objects", root / "entries"
+    objects.mkdir(parents=True, exist_ok=True)
+    entries.mkdir(parents=True, exist_ok=True)
+    with open(apk_path, 'rb') as f:
+        sha = hashlib.sha256(f.read()).hexdigest()
+    blob = objects / sha
+    if not blob.exists():
+        tmp = blob.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copy2(apk_path, tmp)
+        os.replace(tmp, blob)
+    entry = {"sha256": sha, "size": blob.stat().st_size, "version": version, "built": time.strftime('%Y-%m-%d %H:%M:%S')}
+    with open(entries / f"{key}.json", 'w') as f:
+        json.dump(entry, f, indent=2)
+
+    # Drop the oldest entries, then any APK no entry points at
+    for old in sorted(entries.glob("*.json"), key=lambda p: p.stat().st_mtime)[:-APK_CACHE_ENTRIES]:
+        old.unlink()
+    live = set()
+    for e in entries.glob("*.json"):
+        try:
+            with open(e, 'r') as f:
+                live.add(json.load(f)['sha256'])
+        except (OSError, ValueError, KeyError):
+            e.unlink()
+    for blob in objects.iterdir():
+        if blob.name not in live:
+            blob.unlink()
+
+
+def build_apk(job, tauri_args=(), use_cache=True):
+    """Run android build and copy the APK to Asaas.apk, or restore it from the cache when the inputs are unchanged"""
+    key = None
+    if use_cache:
+        start = time.perf_counter()
+        key = apk_input_hash()
+        hit = cached_apk(key)
+        job.log(f"APK inputs {key[:12]} hashed in {time.perf_counter() - start:.1f}s: {'cache hit' if hit else 'no cached build'}")
+        if hit:
+            blob, entry = hit
+            shutil.copy2(blob, OUTPUT_APK)
+            return f"APK restored from the build cache (built {entry['built']} as v{entry['version']}) to {OUTPUT_APK.name}"
+
+    # Run npm run android:build (tauri android build --debug)
+    # This version is AUTOMATICALLY SIGNED and can be installed on phones immediately.
+    job.run([NPM, 'run', 'android:build'] + (['--', *tauri_args] if tauri_args else []))
+    
+    # Potential Tauri APK output paths
+    potential_paths = [
+        APK_OUTPUTS / "universal" / "release" / "app-universal-release-unsigned.apk",
+        APK_OUTPUTS / "release" / "app-release-unsigned.apk",
+        APK_OUTPUTS / "debug" / "app-debug.apk"
+    ]
+    apk_path = next((p for p in potential_paths if p.exists()), None)
+    if not apk_path:
+        raise RuntimeError(f"APK not found under {APK_OUTPUTS}")
+    shutil.copy2(apk_path, OUTPUT_APK)
+    if key:
+        store_apk(key, apk_path, read_version())
+    return f"APK built and renamed to {OUTPUT_APK.name}"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job step once the job has been cancelled"""
+
+
+class Job:
+    """
+    Named steps run on worker threads. A step starts as soon as the steps
+    listed in its `after` are done, so independent steps overlap. Progress
+    is reported through on_event(kind, *args), called from worker threads:
+
+        ('log', line, step)                subprocess output and messages (step: name or None)
+        ('step', name, state, seconds)     state: running/done/failed/cancelled/skipped
+        ('done', ok, message)              once, when no step is left to run
+
+    Step functions take the job and may return a message for the summary.
+    """
+
+    def __init__(self, name, on_event):
+        self.name = name
+        self.on_event = on_event
+        self.steps = []
+        self.results = {}
+        self.timings = {}
+        self.errors = {}
+        self.start_time = None
+        self.end_time = None
+        self._cancel = threading.Event()
+        self._processes = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add(self, name, func, after=()):
+        self.steps.append((name, func, tuple(after)))
+        return name
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return self.start_time is not None and self.end_time is None
+
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.monotonic()) - self.start_time
+
+    def log(self, line):
+        self.on_event('log', line, getattr(self._local, 'step', None))
+
+    def run(self, cmd, cwd=SCRIPT_DIR):
+        """Run cmd, streaming its output line by line into the log"""
+        if self.cancelled:
+            raise JobCancelled()
+        # Own process group, so cancelling also stops the children npm/gradle spawn
+        group = ({'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == 'nt'
+                 else {'start_new_session': True})
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding='utf-8', errors='replace', bufsize=1, **group)
+        with self._lock:
+            self._processes.add(proc)
+        try:
+            for line in proc.stdout:
+                self.log(line.rstrip())
+            proc.wait()
+        finally:
+            with self._lock:
+                self._processes.discard(proc)
+        if self.cancelled:
+            raise JobCancelled()
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    def cancel(self):
+        """Stop running subprocesses; steps not started yet are skipped"""
+        self._cancel.set()
+        with self._lock:
+            processes = list(self._processes)
+        for proc in processes:
+            try:
+                if os.name == 'nt':
+                    subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], capture_output=True)
+                else:
+                    os.killpg(proc.pid, signal.SIGTERM)
+            except (OSError, ProcessLookupError):
+                pass
+
+    def start(self):
+        self.start_time = time.monotonic()
+        threading.Thread(target=self._run, name=f"job: {self.name}", daemon=True).start()
+
+    def _step(self, name, func):
+        self.on_event('step', name, 'running', 0.0)
+        self._local.step = name
+        started = time.monotonic()
+        try:
+            self.results[name] = func(self)
+        except JobCancelled:
+            self.timings[name] = time.monotonic() - started
+            self.on_event('step', name, 'cancelled', self.timings[name])
+            raise
+        except Exception as e:
+            self.timings[name] = time.monotonic() - started
+            self.errors[name] = str(e)
+            self.log(f"❌ {name}: {e}")
+            self.on_event('step', name, 'failed', self.timings[name])
+            raise
+        self.timings[name] = time.monotonic() - started
+        self.on_event('step', name, 'done', self.timings[name])
+
+    def _run(self):
+        pending = list(self.steps)
+        done = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(len(self.steps), 1)) as pool:
+            while pending or running:
+                # Nothing new starts after a failure or cancel; running steps finish
+                if not self.errors and not self.cancelled:
+                    for step in [s for s in pending if set(s[2]) <= done]:
+                        pending.remove(step)
+                        running[pool.submit(self._step, step[0], step[1])] = step[0]
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is None:
+                        done.add(name)
+        for name, _, _ in pending:
+            self.on_event('step', name, 'skipped', 0.0)
+        self.end_time = time.monotonic()
+
+        if self.cancelled:
+            ok, message = False, f"{self.name} cancelled"
+        elif self.errors:
+            ok, message = False, "\n".join(f"{name}: {error}" for name, error in self.errors.items())
+        else:
+            ok = True
+            message = "\n".join(str(r) for r in self.results.values() if r) or f"{self.name} finished"
+        self.on_event('done', ok, message)
+
+
 class ReleaseApp:
     def __init__(self, root):
         self.root = root
         root.title("Asaas Release Helper")
-        root.geometry("400x550")
-        root.resizable(False, False)
+        root.geometry("460x820")
+        root.minsize(420, 700)
         
         # Style
         style = ttk.Style()
@@ -184,17 +511,46 @@ class ReleaseApp:
         # Update message when version changes
         self.version_var.trace('w', self.update_msg)
         
+        # Optionally build the APK while the release is committed and pushed
+        self.build_with_release_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(root, text="Also build local APK after the push", variable=self.build_with_release_var).pack(pady=(5, 0))
+        
         # Buttons
         btn_frame = ttk.Frame(root)
         btn_frame.pack(pady=10)
         
-        ttk.Button(btn_frame, text="🚀 Release", command=self.release).pack(side=tk.LEFT, padx=10)
-        ttk.Button(btn_frame, text="❌ Cancel", command=root.quit).pack(side=tk.LEFT, padx=10)
+        self.release_btn = ttk.Button(btn_frame, text="🚀 Release", command=self.release)
+        self.release_btn.pack(side=tk.LEFT, padx=10)
+        ttk.Button(btn_frame, text="❌ Cancel", command=self.on_close).pack(side=tk.LEFT, padx=10)
         
         # Status
         self.status_var = tk.StringVar(value="Ready")
         ttk.Label(root, textvariable=self.status_var, foreground='gray').pack(pady=5)
         
+        # Running job: progress, elapsed time, stop button and streamed output
+        job_frame = ttk.Frame(root)
+        job_frame.pack(fill='x', padx=20)
+        self.progress = ttk.Progressbar(job_frame, mode='determinate')
+        self.progress.pack(side=tk.LEFT, fill='x', expand=True)
+        self.elapsed_var = tk.StringVar(value="")
+        ttk.Label(job_frame, textvariable=self.elapsed_var, width=6).pack(side=tk.LEFT, padx=5)
+        self.stop_btn = ttk.Button(job_frame, text="⏹ Stop", command=self.stop_job, state='disabled')
+        self.stop_btn.pack(side=tk.LEFT)
+        
+        log_frame = ttk.Frame(root)
+        log_frame.pack(fill='both', expand=True, padx=20, pady=5)
+        self.log_text = tk.Text(log_frame, height=10, font=('Consolas', 8), state='disabled', wrap='none')
+        log_scroll = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=log_scroll.set)
+        self.log_text.pack(side=tk.LEFT, fill='both', expand=True)
+        log_scroll.pack(side=tk.RIGHT, fill='y')
+        
+        self.job = None
+        self.job_done = None
+        self.events = queue.Queue()
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
+        root.after(POLL_MS, self.poll_events)
+        
         # Local Build Section (Separated from Release)
         ttk.Separator(root, orient='horizontal').pack(fill='x', padx=20, pady=10)
         
@@ -203,7 +559,11 @@ class ReleaseApp:
         local_btn_frame = ttk.Frame(root)
         local_btn_frame.pack(pady=5)
         
-        ttk.Button(local_btn_frame, text="�️ Build Local APK", command=self.build_apk_local_cmd).pack(padx=10)
+        self.build_btn = ttk.Button(local_btn_frame, text="�️ Build Local APK", command=self.build_apk_local_cmd)
+        self.build_btn.pack(padx=10)
+        
+        self.apk_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(root, text="Reuse cached APK when sources are unchanged", variable=self.apk_cache_var).pack(pady=(5, 0))
         
         ttk.Label(root, text="(Use this only to test the APK on your phone manually)", 
                   foreground='#666666', font=('Segoe UI', 8, 'italic')).pack()
@@ -243,12 +603,79 @@ class ReleaseApp:
             "Continue?"):
             return
             
-        success, message = self.build_apk()
-        if success:
-            messagebox.showinfo("Success", message)
-        else:
-            messagebox.showerror("Error", message)
-        self.status_var.set("Ready")
+        self.build_apk()
+
+    # ---- background jobs -------------------------------------------------
+
+    def start_job(self, job, on_done):
+        """Run job on worker threads; on_done(ok, message) is called on the Tk thread"""
+        if self.job and self.job.running:
+            messagebox.showerror("Busy", f"{self.job.name} is still running.")
+            return False
+        self.job, self.job_done = job, on_done
+        self.progress.config(maximum=len(job.steps), value=0)
+        self.release_btn.config(state='disabled')
+        self.build_btn.config(state='disabled')
+        self.stop_btn.config(state='normal')
+        self.append_log(f"=== {job.name} ===")
+        job.start()
+        return True
+
+    def new_job(self, name):
+        # Worker threads never touch Tk; events are handed over through the queue
+        return Job(name, lambda *event: self.events.put(event))
+
+    def poll_events(self):
+        try:
+            while True:
+                kind, *args = self.events.get_nowait()
+                if kind == 'log':
+                    self.append_log(args[0])
+                elif kind == 'step':
+                    name, state, seconds = args
+                    if state == 'running':
+                        self.status_var.set(f"{name}...")
+                    else:
+                        self.progress.config(value=float(self.progress['value']) + 1)
+                        self.append_log(f"[{state}] {name} ({seconds:.1f}s)")
+                elif kind == 'done':
+                    self.finish_job(*args)
+        except queue.Empty:
+            pass
+        if self.job and self.job.running:
+            minutes, seconds = divmod(int(self.job.elapsed()), 60)
+            self.elapsed_var.set(f"{minutes:02d}:{seconds:02d}")
+        self.root.after(POLL_MS, self.poll_events)
+
+    def append_log(self, line):
+        self.log_text.config(state='normal')
+        self.log_text.insert(tk.END, line + "\n")
+        excess = int(self.log_text.index('end-1c').split('.')[0]) - LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete('1.0', f"{excess + 1}.0")
+        self.log_text.see(tk.END)
+        self.log_text.config(state='disabled')
+
+    def finish_job(self, ok, message):
+        job, on_done = self.job, self.job_done
+        self.release_btn.config(state='normal')
+        self.build_btn.config(state='normal')
+        self.stop_btn.config(state='disabled')
+        self.status_var.set("Ready" if ok else ("Cancelled" if job.cancelled else "Failed"))
+        self.append_log(f"=== {job.name}: {'done' if ok else 'stopped'} in {job.elapsed():.1f}s ===")
+        on_done(ok, message)
+
+    def stop_job(self):
+        if self.job and self.job.running:
+            self.status_var.set("Stopping...")
+            self.job.cancel()
+
+    def on_close(self):
+        if self.job and self.job.running:
+            if not messagebox.askyesno("Job Running", f"{self.job.name} is still running. Stop it and quit?"):
+                return
+            self.job.cancel()
+        self.root.quit()
 
     def manage_highlights(self):
         """Open a window to manage typed highlights"""
@@ -383,45 +810,17 @@ class ReleaseApp:
             self.team_msg_text.config(state='disabled')
 
     def build_apk(self):
-        """Run android build and rename APK"""
-        try:
-            self.status_var.set("Building Local Android APK...")
-            self.root.update()
-            
-            # Run npm run android:build (tauri android build --debug)
-            # This version is AUTOMATICALLY SIGNED and can be installed on phones immediately.
-            subprocess.run(['npm.cmd', 'run', 'android:build'], cwd=SCRIPT_DIR, check=True, shell=True)
-            
-            # Potential Tauri APK output paths
-            potential_paths = [
-                SCRIPT_DIR / "src-tauri" / "gen" / "android" / "app" / "build" / "outputs" / "apk" / "universal" / "release" / "app-universal-release-unsigned.apk",
-                SCRIPT_DIR / "src-tauri" / "gen" / "android" / "app" / "build" / "outputs" / "apk" / "release" / "app-release-unsigned.apk",
-                SCRIPT_DIR / "src-tauri" / "gen" / "android" / "app" / "build" / "outputs" / "apk" / "debug" / "app-debug.apk"
-            ]
-            
-            apk_path = None
-            for p in potential_paths:
-                if p.exists():
-                    apk_path = p
-                    break
-            
-            output_apk = SCRIPT_DIR / "Asaas.apk"
-            
-            if apk_path:
-                import shutil
-                shutil.copy2(apk_path, output_apk)
-                self.status_var.set("Ready")
-                return True, "APK built and renamed to Asaas.apk"
-            else:
-                self.status_var.set("Failed")
-                return False, f"APK not found at {apk_path}"
-                
-        except subprocess.CalledProcessError as e:
-            self.status_var.set("Failed")
-            return False, f"Build error: {e}"
-        except Exception as e:
-            self.status_var.set("Failed")
-            return False, f"Unexpected error: {e}"
+        """Build the APK in the background"""
+        use_cache = self.apk_cache_var.get()
+        job = self.new_job("Local APK build")
+        job.add("Build APK", lambda j: build_apk(j, use_cache=use_cache))
+        
+        def done(ok, message):
+            if ok:
+                messagebox.showinfo("Success", message)
+            elif not job.cancelled:
+                messagebox.showerror("Error", message)
+        self.start_job(job, done)
 
     def release(self):
         # Sanitize version (remove leading 'v')
@@ -454,38 +853,197 @@ class ReleaseApp:
             "This will start the GitHub release process:\n\n" + "\n".join(steps) + "\n\nContinue?"):
             return
         
-        self.status_var.set("Updating version...")
-        self.root.update()
+        # Read everything from the widgets now; the steps run off the Tk thread
+        stealth = self.stealth_var.get()
+        if not stealth:
+            # Save current team message before finalizing
+            self.localized_team_msg[self.current_lang] = self.team_msg_text.get('1.0', tk.END).strip()
+        team_messages = {l: self.localized_team_msg[l] for l in ['en', 'ar', 'ku'] if self.localized_team_msg[l]}
+        highlights = {l: list(items) for l, items in self.localized_highlights.items()}
+        build_local = self.build_with_release_var.get()
+        use_cache = self.apk_cache_var.get()
         
-        try:
-            update_version(version)
-            
-            if not self.stealth_var.get():
-                # Save current team message before finalizing
-                self.localized_team_msg[self.current_lang] = self.team_msg_text.get('1.0', tk.END).strip()
-                
-                team_messages = {l: self.localized_team_msg[l] for l in ['en', 'ar', 'ku'] if self.localized_team_msg[l]}
-                update_patch_notes(version, self.localized_highlights, team_messages)
-            else:
-                print("Skipping patch notes (Stealth mode)")
-            
-            self.status_var.set("Pushing to GitHub...")
-            self.root.update()
-            
-            success, message = run_git_commands(version, msg)
-            
-            if success:
+        job = self.new_job(f"Release v{version}")
+        bump = job.add("Update version", lambda j: update_version(version))
+        if stealth:
+            notes = job.add("Patch notes", lambda j: j.log("Skipping patch notes (Stealth mode)"))
+        else:
+            notes = job.add("Patch notes", lambda j: update_patch_notes(version, highlights, team_messages))
+        
+        def push(j):
+            success, message = run_git_commands(version, msg, j)
+            if not success:
+                raise RuntimeError(message)
+            return message
+        pushed = job.add("Commit and push", push, after=[bump, notes])
+        if build_local:
+            # The build writes dist/, which is tracked: wait until `git add .` has run
+            job.add("Build APK", lambda j: build_apk(j, use_cache=use_cache), after=[pushed])
+        
+        def done(ok, message):
+            if ok:
                 messagebox.showinfo("Success", message + "\n\nGitHub will now build both Windows and Android versions automatically!")
                 self.root.quit()
-            else:
+            elif not job.cancelled:
                 messagebox.showerror("Error", message)
-                self.status_var.set("Failed")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-            self.status_var.set("Failed")
+        self.start_job(job, done)
+
+
+# ============================================================================
+#  HEADLESS MODE
+# ============================================================================
+
+def desktop_artifacts():
+    bundle = SCRIPT_DIR / "src-tauri" / "target" / "release" / "bundle"
+    return sorted(str(p.relative_to(SCRIPT_DIR)) for p in bundle.glob("*/*") if p.suffix in ('.msi', '.exe', '.deb', '.AppImage', '.dmg'))
+
+
+def build_desktop(job, tauri_args=()):
+    """Run the Tauri bundle build for this machine (MSI/NSIS on Windows)"""
+    job.run([NPM, 'run', 'tauri:build'] + (['--', *tauri_args] if tauri_args else []))
+    artifacts = desktop_artifacts()
+    if not artifacts:
+        raise RuntimeError("tauri build finished but no bundle was found")
+    return "Built " + ", ".join(artifacts)
+
+
+def load_notes(path):
+    """Patch notes file: {"highlights": {"en": [...]}, "teamMessages": {"en": "..."}}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        notes = json.load(f)
+    return notes.get('highlights', {}), notes.get('teamMessages', {})
+
+
+def headless_main(argv):
+    parser = argparse.ArgumentParser(description="Release Atlas without the GUI.")
+    parser.add_argument("--headless", action="store_true", help="run without the GUI (required)")
+    parser.add_argument("--version", help="new version (default: bump the patch number)")
+    parser.add_argument("--message", help="commit message (default: Release v<version>)")
+    parser.add_argument("--notes", help="patch notes JSON with highlights/teamMessages per language")
+    parser.add_argument("--stealth", action="store_true", help="skip patch notes")
+    parser.add_argument("--build", default="", help="local builds to run side by side: apk, windows (comma-separated)")
+    parser.add_argument("--no-release", action="store_true", help="only build; no version bump, notes or git")
+    parser.add_argument("--no-cache", action="store_true", help="always rebuild the APK instead of restoring a cached one")
+    parser.add_argument("--allow-dirty", action="store_true", help="release even with uncommitted changes")
+    parser.add_argument("--json", dest="json_path", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    builds = [b.strip() for b in args.build.split(",") if b.strip()]
+    unknown = set(builds) - {'apk', 'windows'}
+    if unknown:
+        parser.error(f"unknown build(s): {', '.join(sorted(unknown))}")
+    version = (args.version or increment_version(read_version())).strip()
+    if version.lower().startswith('v'):
+        version = version[1:]
+    msg = args.message or f"Release v{version}"
+    release = not args.no_release
+    if release and not args.allow_dirty and not is_git_clean():
+        print("❌ Uncommitted changes would be included in the release commit; commit them or pass --allow-dirty.")
+        return 1
+    highlights, team_messages = load_notes(args.notes) if args.notes and not args.stealth else ({}, {})
+
+    finished = threading.Event()
+    outcome = {}
+    print_lock = threading.Lock()
+
+    def on_event(kind, *payload):
+        if kind == 'log':
+            line, step = payload
+            with print_lock:
+                print(f"[{step}] {line}" if step else line, flush=True)
+        elif kind == 'step':
+            name, state, seconds = payload
+            with print_lock:
+                print(f"==> {name}: {state}" + (f" ({seconds:.1f}s)" if state != 'running' else ""), flush=True)
+        elif kind == 'done':
+            outcome['ok'], outcome['message'] = payload
+            finished.set()
+
+    job = Job(f"Release v{version}" if release else "Local builds", on_event)
+    bump = notes = None
+    if release:
+        bump = job.add("Update version", lambda j: update_version(version))
+        notes = job.add("Patch notes", lambda j: update_patch_notes(version, highlights, team_messages))
+
+        def push(j):
+            success, message = run_git_commands(version, msg, j)
+            if not success:
+                raise RuntimeError(message)
+            return message
+        pushed = job.add("Commit and push", push, after=[bump, notes])
+
+    override = None
+    if builds:
+        # The frontend is built once; both platform builds then skip beforeBuildCommand
+        # instead of racing each other on dist/
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({"build": {"beforeBuildCommand": ""}}, f)
+        override = f.name
+        # (after the push: the frontend bundles the bumped version and notes, and it writes
+        # dist/, which is tracked and must not race the release commit's `git add .`)
+        use_cache = not args.no_cache
+
+        def build_frontend(j):
+            # An APK-only run that will be restored from the cache needs no frontend either
+            if builds == ['apk'] and use_cache and cached_apk(apk_input_hash()):
+                j.log("Skipping frontend build: the APK is cached for these sources")
+                return
+            j.run([NPM, 'run', 'build'])
+        frontend = job.add("Build frontend", build_frontend, after=[pushed] if release else [])
+        if 'apk' in builds:
+            job.add("Build APK", lambda j: build_apk(j, ['--config', override], use_cache), after=[frontend])
+        if 'windows' in builds:
+            job.add("Build Windows", lambda j: build_desktop(j, ['--config', override]), after=[frontend])
+
+    if not job.steps:
+        parser.error("nothing to do: pass --build with --no-release")
+
+    job.start()
+    try:
+        while not finished.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        print("Cancelling...", flush=True)
+        job.cancel()
+        finished.wait()
+    finally:
+        if override:
+            os.remove(override)
+
+    states = {}
+    for name, _, _ in job.steps:
+        if name in job.errors:
+            states[name] = 'failed'
+        elif name in job.results:
+            states[name] = 'done'
+        else:
+            states[name] = 'cancelled' if name in job.timings else 'skipped'
+    summary = {
+        "script": "release",
+        "version": version if release else read_version(),
+        "released": release and states.get("Commit and push") == 'done',
+        "steps": [{"name": name, "state": states[name], "seconds": round(job.timings.get(name, 0.0), 2),
+                   "after": list(after), "result": job.results.get(name), "error": job.errors.get(name)}
+                  for name, _, after in job.steps],
+        "artifacts": ([str(OUTPUT_APK.name)] if 'apk' in builds and states.get("Build APK") == 'done' else [])
+                     + (desktop_artifacts() if states.get("Build Windows") == 'done' else []),
+        "elapsed": round(job.elapsed(), 2),
+        "step_seconds_total": round(sum(job.timings.values()), 2),
+        "passed": outcome['ok'],
+    }
+    print("\n" + json.dumps(summary, indent=2))
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0 if outcome['ok'] else 1
 
 
 if __name__ == "__main__":
+    if "--headless" in sys.argv[1:]:
+        sys.exit(headless_main(sys.argv[1:]))
+    # Tk is only needed by the GUI: --headless must also run on a Python built without it
+    import tkinter as tk
+    from tkinter import messagebox, ttk
     root = tk.Tk()
     app = ReleaseApp(root)
     root.mainloop()
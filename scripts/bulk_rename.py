@@ -1,44 +1,309 @@
+"""
+Bulk rename: replace a product name across the repository.
+
+    python scripts/bulk_rename.py --dry-run          # print the plan, change nothing
+    python scripts/bulk_rename.py                    # apply it
+    python scripts/bulk_rename.py --rollback         # undo the last applied run (repeat for older runs)
+
+Every case variant of the old name (asaas / Asaas / ASAAS) is replaced in
+one regex pass; protected tokens such as the asaas-r2-proxy worker name
+are matched by the same regex and left untouched.
+
+Candidates come from `git ls-files` (tracked and untracked, minus ignored
+files) under ROOTS, and files that do not contain any variant as raw bytes
+are dropped before the regex runs. Planning is spread over a process pool.
+
+Applying is safe to abort: each file's original bytes are saved and logged
+to a journal before the file is atomically replaced (write to a temp file,
+then os.replace), so every file is either old or new and --rollback can
+restore whatever was written.
+"""
+import argparse
+import hashlib
+import json
 import os
 import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+OLD_NAME = "asaas"
+NEW_NAME = "atlas"
+
+# Occurrences inside these tokens are kept (the deployed R2 proxy worker keeps its name)
+PROTECTED = ["asaas-r2-proxy"]
+
+ROOTS = ["docs", "src", "src-tauri", ".github", "README.md"]
+EXTENSIONS = ('.ts', '.tsx', '.md', '.json', '.html', '.yml', '.yaml', '.xml', '.toml')
+SKIP_DIRS = {'.git', 'node_modules', 'target', 'gen', 'dist', '.wwebjs_cache'}
+
+# Set in every worker by _init_worker
+_PATTERN = None
+_MAPPING = None
+
+
+def case_variants(old, new):
+    """{old variant: new variant} for lower, Title and UPPER case, as bytes."""
+    pairs = {old.lower(): new.lower(), old[:1].upper() + old[1:].lower(): new[:1].upper() + new[1:].lower(),
+             old.upper(): new.upper()}
+    return {k.encode(): v.encode() for k, v in pairs.items()}
+
+
+def compile_pattern(mapping, protected):
+    """One regex over all variants; protected tokens are alternatives tried first and kept as-is."""
+    keep = [re.escape(token.encode()) for token in sorted(protected, key=len, reverse=True)]
+    hits = [re.escape(variant) for variant in sorted(mapping, key=len, reverse=True)]
+    body = b"|".join(hits)
+    if keep:
+        return re.compile(b"(?P<keep>" + b"|".join(keep) + b")|" + body)
+    return re.compile(body)
+
+
+def _init_worker(mapping, protected):
+    global _PATTERN, _MAPPING
+    _MAPPING = mapping
+    _PATTERN = compile_pattern(mapping, protected)
+
+
+def rewrite(data):
+    """(new bytes, replacement count) for one file's contents."""
+    count = 0
+
+    def substitute(m):
+        nonlocal count
+        if m.lastgroup == "keep":
+            return m.group()
+        count += 1
+        return _MAPPING[m.group()]
+
+    return _PATTERN.sub(substitute, data), count
+
+
+def plan_file(path):
+    """Plan entry for one file, or None when it needs no change; runs in worker processes."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return {"path": path, "error": str(e)}
+    # Byte prefilter: most files never mention the old name
+    if not any(variant in data for variant in _MAPPING):
+        return None
+    new, count = rewrite(data)
+    if not count:
+        return None
+    return {"path": path, "count": count, "old_sha": hashlib.sha256(data).hexdigest(),
+            "new_sha": hashlib.sha256(new).hexdigest()}
+
+
+def list_candidates(roots):
+    """Files under roots from git ls-files (os.walk outside a git checkout), filtered by extension."""
+    try:
+        out = subprocess.run(["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *roots],
+                             capture_output=True, check=True).stdout
+        files = sorted(set(out.decode("utf-8", "surrogateescape").split("\0")) - {""})
+    except (OSError, subprocess.CalledProcessError):
+        files = []
+        for root in roots:
+            if os.path.isfile(root):
+                files.append(root)
+            for dirpath, dirs, names in os.walk(root):
+                dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+                files.extend(os.path.join(dirpath, name) for name in names)
+    return [f for f in files
+            if f.endswith(EXTENSIONS) and SKIP_DIRS.isdisjoint(Path(f).parts[:-1]) and os.path.isfile(f)]
+
+
+def build_plan(files, mapping, protected, jobs):
+    initargs = (mapping, protected)
+    if jobs == 1 or len(files) < 64:
+        _init_worker(*initargs)
+        results = [plan_file(f) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(plan_file, files, chunksize=32))
+    return [r for r in results if r]
 
-def replace_in_file(filepath):
+
+# ============================================================================
+#  APPLY / ROLLBACK
+# ============================================================================
+
+def journal_root():
+    """Journals live inside .git when there is one, so they never show up as changes."""
+    return Path(".git", "bulk_rename") if Path(".git").is_dir() else Path(".bulk_rename")
+
+
+def atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class Journal:
+    """Append-only record of the files a run replaced, with their original bytes."""
+
+    def __init__(self, run_dir):
+        self.dir = Path(run_dir)
+        self.backups = self.dir / "backups"
+        self.backups.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.file = open(self.dir / "journal.jsonl", "a", encoding="utf-8")
+
+    def record(self, entry, original):
+        """Save the original bytes and log the entry; must happen before the file is replaced."""
+        backup = self.backups / entry["old_sha"]
+        if not backup.exists():
+            atomic_backup = backup.with_suffix(f".{threading.get_ident()}.tmp")
+            atomic_backup.write_bytes(original)
+            os.replace(atomic_backup, backup)
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def apply_entry(entry, journal):
+    """Re-read, re-check and rewrite one planned file. Returns an error string or None."""
+    path = entry["path"]
+    with open(path, "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != entry["old_sha"]:
+        return "changed since the plan was made, skipped"
+    new, _ = rewrite(data)
+    journal.record(entry, data)
+    atomic_write(path, new)
+    return None
+
+
+def apply_plan(plan, mapping, protected, jobs):
+    _init_worker(mapping, protected)
+    run_dir = journal_root() / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    journal = Journal(run_dir)
+    errors = 0
+    pool = ThreadPoolExecutor(max_workers=jobs or min(8, (os.cpu_count() or 1) + 4))
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Specific exclusions
-        # Don't replace asaas-r2-proxy
-        # We will temporarily mask it
-        masked = content.replace("asaas-r2-proxy", "___R2_PROXY___")
-        
-        # Replacements
-        masked = masked.replace("Asaas", "Atlas")
-        masked = masked.replace("asaas", "atlas")
-        masked = masked.replace("ASAAS", "ATLAS")
-        
-        # Unmask
-        final_content = masked.replace("___R2_PROXY___", "asaas-r2-proxy")
-        
-        if final_content != content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(final_content)
-            print(f"Updated {filepath}")
-    except Exception as e:
-        print(f"Error processing {filepath}: {e}")
-
-def process_dir(directory):
-    for root, dirs, files in os.walk(directory):
-        # Skip node_modules, .git, target, gen, dist
-        dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', 'target', 'gen', 'dist', '.wwebjs_cache']]
-        for file in files:
-            if file.endswith(('.ts', '.tsx', '.md', '.json', '.html', '.yml', '.yaml', '.xml', '.toml')):
-                filepath = os.path.join(root, file)
-                replace_in_file(filepath)
+        futures = [(entry, pool.submit(apply_entry, entry, journal)) for entry in plan]
+        for entry, future in futures:
+            try:
+                error = future.result()
+            except OSError as e:
+                error = str(e)
+            if error:
+                errors += 1
+                print(f"Error processing {entry['path']}: {error}")
+            else:
+                print(f"Updated {entry['path']} ({entry['count']})")
+    except KeyboardInterrupt:
+        # Files being written finish atomically; queued ones are never started
+        pool.shutdown(wait=True, cancel_futures=True)
+        print(f"\nInterrupted. Undo what was written with: python {sys.argv[0]} --rollback {run_dir.name}")
+        raise
+    finally:
+        pool.shutdown(wait=True)
+        journal.close()
+    print(f"Journal: {run_dir} (undo with --rollback {run_dir.name})")
+    return errors
+
+
+def rollback(run_id=None):
+    root = journal_root()
+    journals = [p / "journal.jsonl" for p in root.iterdir()] if root.is_dir() else []
+    runs = [j.parent.name for j in sorted((j for j in journals if j.exists()), key=lambda j: j.stat().st_mtime)]
+    if not runs:
+        print("No bulk rename journal found.")
+        return 1
+    run_dir = root / (run_id or runs[-1])
+    if not (run_dir / "journal.jsonl").exists():
+        print(f"Unknown run {run_id}; available: {', '.join(runs)}")
+        return 1
+
+    entries = []
+    with open(run_dir / "journal.jsonl", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # Torn last line of an aborted run
+    restored = skipped = 0
+    for entry in reversed(entries):
+        path = entry["path"]
+        try:
+            with open(path, "rb") as f:
+                current = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            current = None
+        if current == entry["old_sha"]:
+            continue  # Aborted before this file was replaced
+        if current != entry["new_sha"]:
+            print(f"Skipping {path}: edited after the rename")
+            skipped += 1
+            continue
+        atomic_write(path, (run_dir / "backups" / entry["old_sha"]).read_bytes())
+        print(f"Restored {path}")
+        restored += 1
+    print(f"Rolled back {restored} file(s) from {run_dir}" + (f", {skipped} skipped" if skipped else ""))
+    if skipped:
+        return 1
+    # Done: the next --rollback undoes the run before this one
+    os.replace(run_dir / "journal.jsonl", run_dir / "journal.rolled-back.jsonl")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace a product name across the repository.")
+    parser.add_argument("--from", dest="old", default=OLD_NAME, help=f"old name (default {OLD_NAME})")
+    parser.add_argument("--to", dest="new", default=NEW_NAME, help=f"new name (default {NEW_NAME})")
+    parser.add_argument("--protect", action="append", default=None,
+                        help="token to leave untouched (repeatable; default: %s)" % ", ".join(PROTECTED))
+    parser.add_argument("--dry-run", action="store_true", help="print the plan without changing files")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (default: one per CPU)")
+    parser.add_argument("--rollback", nargs="?", const="", metavar="RUN", help="undo the last (or the given) run")
+    parser.add_argument("roots", nargs="*", default=ROOTS, help="files/directories to scan")
+    args = parser.parse_args()
+
+    if args.rollback is not None:
+        sys.exit(rollback(args.rollback or None))
+
+    mapping = case_variants(args.old, args.new)
+    protected = PROTECTED if args.protect is None else args.protect
+
+    start = time.perf_counter()
+    files = list_candidates(args.roots)
+    plan = build_plan(files, mapping, protected, args.jobs)
+    planned = time.perf_counter() - start
+
+    for entry in plan:
+        if "error" in entry:
+            print(f"Error reading {entry['path']}: {entry['error']}")
+    plan = [entry for entry in plan if "error" not in entry]
+    total = sum(entry["count"] for entry in plan)
+
+    if args.dry_run:
+        for entry in plan:
+            print(f"{entry['path']}: {entry['count']} replacement(s)")
+        print(f"Plan: {total} replacement(s) in {len(plan)} of {len(files)} files ({planned:.2f}s). Nothing written.")
+        return
+
+    errors = apply_plan(plan, mapping, protected, args.jobs)
+    print(f"Done: {total} replacement(s) in {len(plan) - errors} files ({time.perf_counter() - start:.2f}s)")
+    sys.exit(1 if errors else 0)
+
 
 if __name__ == "__main__":
-    process_dir("docs")
-    process_dir("src")
-    process_dir("src-tauri")
-    process_dir(".github")
-    replace_in_file("README.md")
-    print("Done")
+    main()